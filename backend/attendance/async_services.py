@@ -0,0 +1,90 @@
+"""
+Async variants of the AttendanceService read paths, backed by Motor.
+Used by the async views served from the ASGI application.
+"""
+from hrms.mongodb_async import async_mongodb
+from employees.async_services import AsyncEmployeeService
+from . import schema
+from .services import ATTENDANCE_FORMAT, EMPLOYEE_ATTENDANCE_FORMAT, AttendanceService
+
+
+class AsyncAttendanceService:
+    """Async service class for Attendance reads using Motor."""
+
+    COLLECTION_NAME = AttendanceService.COLLECTION_NAME
+
+    @staticmethod
+    async def get_all(date_filter=None):
+        """Get all attendance records, optionally filtered by date."""
+        collection = async_mongodb.get_collection(AsyncAttendanceService.COLLECTION_NAME)
+        
+        query = {}
+        if date_filter:
+            query['date'] = schema.date_equals(date_filter)
+        
+        cursor = collection.find(query, ATTENDANCE_FORMAT.projection).sort('date', -1).batch_size(AttendanceService.STREAM_BATCH_SIZE)
+        return [ATTENDANCE_FORMAT(record) async for record in cursor]
+
+    @staticmethod
+    async def iter_all(date_filter=None):
+        """Async iterator over formatted attendance records, read lazily in batches."""
+        collection = async_mongodb.get_collection(AsyncAttendanceService.COLLECTION_NAME)
+        
+        query = {}
+        if date_filter:
+            query['date'] = schema.date_equals(date_filter)
+        
+        cursor = collection.find(query, ATTENDANCE_FORMAT.projection).sort('date', -1).batch_size(AttendanceService.STREAM_BATCH_SIZE)
+        async for record in cursor:
+            yield ATTENDANCE_FORMAT(record)
+
+    @staticmethod
+    async def get_by_employee(employee_id, date_from=None, date_to=None):
+        """Get attendance records for a specific employee, optionally within a date range."""
+        collection = async_mongodb.get_collection(AsyncAttendanceService.COLLECTION_NAME)
+        
+        # Verify employee exists
+        employee = await AsyncEmployeeService.get_by_employee_id(employee_id)
+        if not employee:
+            raise ValueError(f"Employee with ID '{employee_id}' not found")
+        
+        employee_summary = {
+            'id': employee['id'],
+            'employee_id': employee['employee_id'],
+            'full_name': employee['full_name'],
+            'email': employee['email'],
+            'department': employee['department']
+        }
+        query = AttendanceService.employee_query(employee_id, date_from, date_to)
+        cursor = collection.find(query, EMPLOYEE_ATTENDANCE_FORMAT.projection).sort('date', -1)
+        formatted_records = [EMPLOYEE_ATTENDANCE_FORMAT(record, employee=employee_summary) async for record in cursor]
+        
+        return {
+            'employee_id': employee['employee_id'],
+            'full_name': employee['full_name'],
+            'count': len(formatted_records),
+            'attendance': formatted_records
+        }
+
+    @staticmethod
+    async def get_summary(employee_id, date_from=None, date_to=None):
+        """Present/absent totals and per-month breakdown of an employee's attendance."""
+        collection = async_mongodb.get_collection(AsyncAttendanceService.COLLECTION_NAME)
+        
+        employee = await AsyncEmployeeService.get_by_employee_id(employee_id)
+        if not employee:
+            raise ValueError(f"Employee with ID '{employee_id}' not found")
+        
+        query = AttendanceService.employee_query(employee_id, date_from, date_to)
+        rows = [row async for row in collection.aggregate(AttendanceService.summary_pipeline(query))]
+        return AttendanceService.build_summary(employee, rows, date_from, date_to)
+
+    @staticmethod
+    async def status_counts(date):
+        """Count attendance records per status for a date with one $group on the server."""
+        collection = async_mongodb.get_collection(AsyncAttendanceService.COLLECTION_NAME)
+        pipeline = [
+            {'$match': {'date': schema.date_equals(date)}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}},
+        ]
+        return {row['_id']: row['count'] async for row in collection.aggregate(pipeline)}
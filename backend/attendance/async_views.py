@@ -0,0 +1,64 @@
+"""
+Async attendance views served by the ASGI application (see hrms/urls_async.py).
+"""
+from datetime import date
+from hrms.async_http import async_csrf_exempt, json_response
+from hrms.conditional import conditional_get
+from hrms.streaming import streaming_json_response
+from employees.async_services import AsyncEmployeeService
+from .async_services import AsyncAttendanceService
+from .views import dashboard_payload, date_range_params, is_stream_request, is_summary_request
+
+
+@async_csrf_exempt
+@conditional_get('employees', 'attendance')
+async def get_employee_attendance(request, employee_id):
+    """GET /api/attendance/{employee_id}/ (async, optional ?from=&to= and ?summary=true)"""
+    if request.method != 'GET':
+        return json_response({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    try:
+        date_from, date_to = date_range_params(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+    try:
+        if is_summary_request(request.GET):
+            result = await AsyncAttendanceService.get_summary(employee_id, date_from, date_to)
+        else:
+            result = await AsyncAttendanceService.get_by_employee(employee_id, date_from, date_to)
+        return json_response(result)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=404)
+    except Exception as e:
+        return json_response({"error": f"Failed to retrieve attendance: {str(e)}"}, status=500)
+
+
+@async_csrf_exempt
+@conditional_get('attendance', cache=True)
+async def list_all_attendance(request):
+    """
+    GET /api/attendance/all/ (async, optional ?date=YYYY-MM-DD and ?stream=true)
+    """
+    if request.method != 'GET':
+        return json_response({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    try:
+        if is_stream_request(request.GET):
+            return streaming_json_response(AsyncAttendanceService.iter_all(request.GET.get('date', None)))
+        attendance_records = await AsyncAttendanceService.get_all(request.GET.get('date', None))
+        return json_response(attendance_records)
+    except Exception as e:
+        return json_response({"error": f"Failed to retrieve attendance: {str(e)}"}, status=500)
+
+
+@async_csrf_exempt
+@conditional_get('employees', 'attendance', daily=True, cache=True)
+async def dashboard_stats(request):
+    """GET /api/dashboard/ (async)"""
+    if request.method != 'GET':
+        return json_response({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    try:
+        today = date.today().isoformat()
+        total_employees = await AsyncEmployeeService.count()
+        counts = await AsyncAttendanceService.status_counts(today)
+        return json_response(dashboard_payload(total_employees, counts))
+    except Exception as e:
+        return json_response({"error": f"Failed to retrieve dashboard statistics: {str(e)}"}, status=500)
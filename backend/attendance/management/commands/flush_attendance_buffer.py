@@ -0,0 +1,31 @@
+"""
+Write the attendance write-behind journal (ATTENDANCE_WRITE_BEHIND) to
+MongoDB now, e.g. before a host is retired or after the flag was turned
+off with records still waiting. Workers flush on their own; running this
+alongside them is safe.
+    python manage.py flush_attendance_buffer --retry-failed
+"""
+from django.core.management.base import BaseCommand, CommandError
+from attendance.services import attendance_buffer
+
+
+class Command(BaseCommand):
+    help = "Flush buffered attendance records to MongoDB and report what is left."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Move records that exhausted their attempts back to pending first")
+
+    def handle(self, *args, **options):
+        try:
+            if options['retry_failed']:
+                self.stdout.write(f"{attendance_buffer.retry_failed()} failed records queued again")
+            flushed = attendance_buffer.drain()
+            stats = attendance_buffer.stats()
+        except Exception as e:
+            raise CommandError(f"Flush stopped (re-run to continue): {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Flushed {flushed} records from {attendance_buffer.path}; "
+            f"{stats['pending']} pending, {stats['failed']} failed."
+        ))
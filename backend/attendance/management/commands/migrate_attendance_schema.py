@@ -0,0 +1,57 @@
+"""
+Migrate attendance documents to native BSON dates (schema version 2).
+
+Safe to run against a live cluster and to interrupt; re-running resumes:
+    python manage.py migrate_attendance_schema --batch-size 500 --pause 0.2
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from attendance.schema_migration import DEFAULT_BATCH_SIZE, migrate
+
+
+class Command(BaseCommand):
+    help = "Convert attendance dates to native BSON dates in resumable, throttled batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Documents per bulk_write")
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between batches")
+        parser.add_argument('--restart', action='store_true', help="Ignore the saved position and start over")
+        parser.add_argument('--report', help="Write the full JSON report to this path")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        def progress(report, total):
+            self.stdout.write(
+                f"{report.scanned}/{total} scanned, {report.migrated} migrated, "
+                f"{report.conflicts} conflicts, {report.invalid} invalid"
+            )
+
+        try:
+            report = migrate(
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                restart=options['restart'],
+                on_progress=progress,
+            )
+        except Exception as e:
+            raise CommandError(f"Migration stopped (re-run to resume): {str(e)}")
+
+        if options['report']:
+            with open(options['report'], 'w') as out:
+                json.dump(report, out, indent=2)
+
+        for problem in report['problems'][:20]:
+            self.stderr.write(f"{problem['id']}: {problem['problem']} ({problem['error']})")
+        if len(report['problems']) > 20:
+            self.stderr.write("... more problems omitted, use --report for the full list")
+
+        if report['conflicts'] or report['invalid']:
+            self.stdout.write(self.style.WARNING(
+                f"Migrated {report['migrated']} documents; resolve the documents listed above and re-run with --restart."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Migrated {report['migrated']} documents. Set ATTENDANCE_LEGACY_DATES=False once every instance runs this version."
+            ))
@@ -0,0 +1,136 @@
+"""
+Department x date attendance reports aggregated in MongoDB.
+
+Reports over closed periods (ending before today) are stored in the
+attendance_reports collection and served from there. Each stored report
+carries the 'attendance_history' version it was computed at; writes that
+touch past dates (backfills, deletes) bump that version, so stale reports
+are recomputed rather than served.
+"""
+from datetime import date, datetime, timedelta
+import logging
+from pymongo import ASCENDING
+from hrms.mongodb import mongodb
+from hrms import versions
+from . import schema
+from .services import AttendanceService
+
+logger = logging.getLogger(__name__)
+
+
+class AttendanceReportService:
+    """Service class for aggregated attendance reports."""
+
+    COLLECTION_NAME = 'attendance_reports'
+
+    # Longest range a single report may cover
+    MAX_REPORT_DAYS = 366
+
+    # Stored reports not refreshed for this long are removed by MongoDB
+    CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+    INDEXES = [
+        {'keys': [('created_at', ASCENDING)], 'name': 'created_at_ttl', 'expireAfterSeconds': CACHE_TTL_SECONDS},
+    ]
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the TTL index that expires old stored reports."""
+        collection = mongodb.get_collection(AttendanceReportService.COLLECTION_NAME)
+        for index in AttendanceReportService.INDEXES:
+            options = {key: value for key, value in index.items() if key != 'keys'}
+            collection.create_index(index['keys'], **options)
+        return [index['name'] for index in AttendanceReportService.INDEXES]
+
+    @staticmethod
+    def validate_range(date_from, date_to):
+        """Require both bounds and cap the span at MAX_REPORT_DAYS."""
+        if not date_from or not date_to:
+            raise ValueError("'from' and 'to' are required")
+        span = date.fromisoformat(date_to) - date.fromisoformat(date_from)
+        if span >= timedelta(days=AttendanceReportService.MAX_REPORT_DAYS):
+            raise ValueError(f"Reports can cover at most {AttendanceReportService.MAX_REPORT_DAYS} days")
+
+    @staticmethod
+    def department_matrix(date_from, date_to, department=None):
+        """
+        Present/absent counts per department per date between date_from and
+        date_to (inclusive), optionally for a single department.
+        """
+        AttendanceReportService.validate_range(date_from, date_to)
+        
+        if date_to >= date.today().isoformat():
+            return AttendanceReportService._compute(date_from, date_to, department)
+        
+        key = f"department_matrix:{date_from}:{date_to}:{department or ''}"
+        collection = mongodb.get_collection(AttendanceReportService.COLLECTION_NAME)
+        version = versions.get_version(AttendanceService.HISTORY_VERSION)
+        
+        stored = collection.find_one({'_id': key, 'version': version}, {'report': 1})
+        if stored:
+            return stored['report']
+        
+        report = AttendanceReportService._compute(date_from, date_to, department)
+        try:
+            collection.replace_one(
+                {'_id': key},
+                {'version': version, 'report': report, 'created_at': datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning("Could not store attendance report %s: %s", key, e)
+        return report
+
+    @staticmethod
+    def matrix_pipeline(date_from, date_to, department=None):
+        """One $group producing a count per (department, date, status) cell."""
+        match = schema.date_range_filter(date_from, date_to)
+        if department:
+            match['employee_department'] = department
+        return [
+            {'$match': match},
+            {'$group': {
+                '_id': {'department': '$employee_department', 'date': '$date', 'status': '$status'},
+                'count': {'$sum': 1},
+            }},
+        ]
+
+    @staticmethod
+    def build_matrix(rows, date_from, date_to, department=None):
+        """Fold matrix_pipeline output into per-department rows of per-date counts."""
+        departments = {}
+        dates = set()
+        for row in rows:
+            cell_key = row['_id']
+            day = schema.to_api_date(cell_key['date'])
+            dates.add(day)
+            entry = departments.setdefault(cell_key['department'], {'present': 0, 'absent': 0, 'total': 0, 'days': {}})
+            cell = entry['days'].setdefault(day, {'present': 0, 'absent': 0})
+            status_key = cell_key['status'].lower()
+            if status_key in cell:
+                cell[status_key] += row['count']
+                entry[status_key] += row['count']
+            entry['total'] += row['count']
+        
+        return {
+            'from': date_from,
+            'to': date_to,
+            'department': department,
+            'dates': sorted(dates),
+            'departments': [
+                {
+                    'department': name,
+                    'present': entry['present'],
+                    'absent': entry['absent'],
+                    'total': entry['total'],
+                    'days': [{'date': day, **entry['days'][day]} for day in sorted(entry['days'])],
+                }
+                for name, entry in sorted(departments.items(), key=lambda item: str(item[0]))
+            ],
+        }
+
+    @staticmethod
+    def _compute(date_from, date_to, department=None):
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        rows = collection.aggregate(AttendanceReportService.matrix_pipeline(date_from, date_to, department))
+        return AttendanceReportService.build_matrix(rows, date_from, date_to, department)
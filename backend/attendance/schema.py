@@ -0,0 +1,100 @@
+"""
+Storage schema of attendance documents.
+
+Version 1 (implicit, no schema_version field) stored `date` as an ISO
+'YYYY-MM-DD' string and `created_at` as either a datetime or a string.
+Version 2 stores `date` as a native BSON date (midnight UTC) and
+`created_at` always as a BSON date, so ranges and time bucketing run on
+the server.
+
+Until `python manage.py migrate_attendance_schema` has converted every
+document, settings.ATTENDANCE_LEGACY_DATES keeps queries matching both
+representations (sorting by date meanwhile lists native dates before
+legacy strings); turn it off afterwards to query native dates only.
+The API keeps exposing dates as 'YYYY-MM-DD' strings.
+"""
+from datetime import date, datetime, timezone
+from django.conf import settings
+
+SCHEMA_VERSION = 2
+
+
+def to_storage_date(value):
+    """'YYYY-MM-DD', date or datetime -> naive UTC midnight datetime (a BSON date)."""
+    if isinstance(value, date):  # includes datetime
+        return datetime(value.year, value.month, value.day)
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def to_api_date(value):
+    """Stored date (native or legacy string) -> 'YYYY-MM-DD'."""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+def to_storage_datetime(value):
+    """Legacy created_at (datetime or ISO string) -> naive UTC datetime."""
+    if not isinstance(value, str):
+        return value
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def legacy_reads():
+    """Whether queries must still match version 1 (string) dates."""
+    return settings.ATTENDANCE_LEGACY_DATES
+
+
+def date_equals(day):
+    """Query value for `date` equal to the 'YYYY-MM-DD' string day."""
+    try:
+        native = to_storage_date(day)
+    except ValueError:
+        # Not a date: matches nothing, as it always has
+        return day
+    if legacy_reads():
+        return {'$in': [native, day]}
+    return native
+
+
+def date_range_filter(date_from=None, date_to=None):
+    """
+    Query conditions (to merge into a filter) for dates between date_from and
+    date_to, inclusive; either bound may be None. Returns {} without bounds.
+    """
+    native = {}
+    legacy = {}
+    if date_from:
+        native['$gte'] = to_storage_date(date_from)
+        legacy['$gte'] = date_from
+    if date_to:
+        native['$lte'] = to_storage_date(date_to)
+        legacy['$lte'] = date_to
+    if not native:
+        return {}
+    if legacy_reads():
+        # Range operators only match values of the same BSON type
+        return {'$or': [{'date': native}, {'date': legacy}]}
+    return {'date': native}
+
+
+def month_expression():
+    """
+    Aggregation expression to group by month: 'YYYY-MM' for native dates.
+    With legacy reads on it is the raw `date`, so mixed types group by day
+    and callers take the month from to_api_date(value)[:7].
+    """
+    if legacy_reads():
+        return '$date'
+    return {'$dateToString': {'format': '%Y-%m', 'date': '$date'}}
+
+
+def upgrade(doc):
+    """Return the $set that brings a document to SCHEMA_VERSION."""
+    fields = {'date': to_storage_date(doc['date']), 'schema_version': SCHEMA_VERSION}
+    if 'created_at' in doc:
+        fields['created_at'] = to_storage_datetime(doc['created_at'])
+    return fields
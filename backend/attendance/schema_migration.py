@@ -0,0 +1,130 @@
+"""
+Resumable, throttled migration of attendance documents to the current
+storage schema (see schema.py).
+
+Documents are walked in _id order in fixed-size batches; each batch is
+rewritten with one unordered bulk_write and the last _id reached is saved
+in the schema_migrations collection, so an interrupted run resumes where
+it stopped. Updates are conditional on schema_version, so re-running over
+already migrated documents is harmless and concurrent writers are safe.
+"""
+from datetime import datetime
+import logging
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from hrms.mongodb import mongodb
+from . import schema
+from .services import AttendanceService
+
+logger = logging.getLogger(__name__)
+
+STATE_COLLECTION_NAME = 'schema_migrations'
+STATE_ID = f'attendance_v{schema.SCHEMA_VERSION}'
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Problem documents kept in the report; further ones are only counted
+MAX_REPORTED_PROBLEMS = 1000
+
+COUNTERS = ('scanned', 'migrated', 'current', 'conflicts', 'invalid')
+
+
+class MigrationReport:
+    """Running totals of a migration, persisted between runs."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        for name in COUNTERS:
+            setattr(self, name, state.get(name, 0))
+        self.last_id = state.get('last_id')
+        self.problems = []
+
+    def add_problem(self, doc_id, kind, error):
+        setattr(self, kind, getattr(self, kind) + 1)
+        if len(self.problems) < MAX_REPORTED_PROBLEMS:
+            self.problems.append({'id': str(doc_id), 'problem': kind, 'error': error})
+
+    def as_dict(self):
+        report = {name: getattr(self, name) for name in COUNTERS}
+        report['last_id'] = str(self.last_id) if self.last_id else None
+        report['problems'] = self.problems
+        return report
+
+
+def _migrate_batch(collection, batch, report):
+    requests = []
+    request_ids = []
+    for doc in batch:
+        if doc.get('schema_version') == schema.SCHEMA_VERSION:
+            report.current += 1
+            continue
+        try:
+            fields = schema.upgrade(doc)
+        except (KeyError, TypeError, ValueError) as e:
+            report.add_problem(doc['_id'], 'invalid', str(e))
+            continue
+        requests.append(UpdateOne(
+            {'_id': doc['_id'], 'schema_version': {'$ne': schema.SCHEMA_VERSION}},
+            {'$set': fields},
+        ))
+        request_ids.append(doc['_id'])
+    
+    if not requests:
+        return
+    try:
+        result = collection.bulk_write(requests, ordered=False)
+        report.migrated += result.modified_count
+    except BulkWriteError as e:
+        report.migrated += e.details.get('nModified', 0)
+        for error in e.details.get('writeErrors', []):
+            if error.get('code') != 11000:
+                raise
+            # A native-dated record for the same employee and day already exists
+            report.add_problem(request_ids[error['index']], 'conflicts', error.get('errmsg', 'duplicate key'))
+
+
+def migrate(batch_size=DEFAULT_BATCH_SIZE, pause=0.0, restart=False, on_progress=None):
+    """
+    Bring every attendance document to schema.SCHEMA_VERSION.
+
+    pause: seconds to sleep between batches to limit load on a live cluster.
+    restart: ignore the saved position and counters and start from the beginning.
+    on_progress: optional callback(report, total) after each batch.
+    Returns the report as a dict.
+    """
+    collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+    states = mongodb.get_collection(STATE_COLLECTION_NAME)
+    
+    state = None if restart else states.find_one({'_id': STATE_ID})
+    report = MigrationReport(state)
+    total = collection.estimated_document_count()
+    projection = {'date': 1, 'created_at': 1, 'schema_version': 1}
+    
+    while True:
+        query = {'_id': {'$gt': report.last_id}} if report.last_id else {}
+        batch = list(collection.find(query, projection).sort('_id', 1).limit(batch_size))
+        if not batch:
+            break
+        
+        _migrate_batch(collection, batch, report)
+        report.scanned += len(batch)
+        report.last_id = batch[-1]['_id']
+        
+        states.update_one(
+            {'_id': STATE_ID},
+            {'$set': {
+                **{name: getattr(report, name) for name in COUNTERS},
+                'last_id': report.last_id,
+                'updated_at': datetime.utcnow(),
+            }},
+            upsert=True,
+        )
+        if on_progress:
+            on_progress(report, total)
+        if pause:
+            time.sleep(pause)
+    
+    states.update_one({'_id': STATE_ID}, {'$set': {'completed_at': datetime.utcnow()}}, upsert=True)
+    logger.info("Attendance schema migration finished: %s migrated, %s conflicts, %s invalid", report.migrated, report.conflicts, report.invalid)
+    return report.as_dict()
@@ -2,10 +2,45 @@
 Attendance service using MongoDB directly via pymongo.
 Replaces Django ORM for MongoDB operations.
 """
-from datetime import datetime
+from datetime import date, datetime
+import logging
 from bson import ObjectId
+from django.conf import settings
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from hrms.formatting import DATE, Context, DocumentFormatter, Field, Nested
 from hrms.mongodb import mongodb
-from employees.services import EmployeeService
+from hrms.write_behind import WriteBehindBuffer
+from hrms import versions
+from employees.services import EmployeeService, employee_directory
+from . import schema
+
+logger = logging.getLogger(__name__)
+
+# API shape of an attendance record, employee details from the denormalized copy.
+# datetime and ObjectId values are serialized by hrms.renderers.
+ATTENDANCE_FORMAT = DocumentFormatter([
+    Field('id', '_id'),
+    Nested('employee', [
+        Field('id', 'employee_id'),
+        Field('employee_id'),
+        Field('full_name', 'employee_name'),
+        Field('email', 'employee_email'),
+        Field('department', 'employee_department'),
+    ]),
+    Field('date', convert=DATE),
+    Field('status'),
+    Field('created_at'),
+])
+
+# Same shape for one employee's history; the caller supplies the employee dict
+EMPLOYEE_ATTENDANCE_FORMAT = DocumentFormatter([
+    Field('id', '_id'),
+    Context('employee'),
+    Field('date', convert=DATE),
+    Field('status'),
+    Field('created_at'),
+])
 
 
 class AttendanceService:
@@ -13,42 +48,85 @@ class AttendanceService:
     
     COLLECTION_NAME = 'attendance'
 
+    INDEXES = [
+        # One record per employee per date; also serves per-employee reads
+        {'keys': [('employee_id', ASCENDING), ('date', DESCENDING)], 'name': 'employee_id_date_unique', 'unique': True},
+        {'keys': [('date', DESCENDING)], 'name': 'date'},
+    ]
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the indexes the attendance queries rely on."""
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        for index in AttendanceService.INDEXES:
+            options = {key: value for key, value in index.items() if key != 'keys'}
+            collection.create_index(index['keys'], **options)
+        return [index['name'] for index in AttendanceService.INDEXES]
+
+    # Version stamp bumped only when records dated before today change;
+    # stored reports over closed periods are keyed on it (see reports.py)
+    HISTORY_VERSION = 'attendance_history'
+
+    @staticmethod
+    def _mark_changed(dates=(), history=False):
+        """
+        Bump the attendance version stamp so cached reads and ETags are refreshed,
+        and the history stamp as well if any of the affected dates is in the past
+        (or history is set).
+        """
+        names = [AttendanceService.COLLECTION_NAME]
+        today = date.today().isoformat()
+        if history or any(schema.to_api_date(day) < today for day in dates):
+            names.append(AttendanceService.HISTORY_VERSION)
+        for name in names:
+            try:
+                versions.bump_version(name)
+            except Exception as e:
+                logger.warning("Could not bump %s version: %s", name, e)
+
     @staticmethod
     def create(attendance_data):
-        """Create a new attendance record."""
+        """
+        Create a new attendance record. With ATTENDANCE_WRITE_BEHIND the
+        record is journaled and written to MongoDB by attendance_buffer.
+        """
         collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
         
         # Get employee by employee_id
-        employee = EmployeeService.get_by_employee_id(attendance_data['employee_id'])
+        employee = employee_directory.get(attendance_data['employee_id'])
         if not employee:
             raise ValueError(f"Employee with ID '{attendance_data['employee_id']}' not found")
         
-        # Convert date to string for MongoDB storage
+        # The API speaks 'YYYY-MM-DD'; MongoDB stores a native date
         date_str = attendance_data['date'].isoformat() if hasattr(attendance_data['date'], 'isoformat') else str(attendance_data['date'])
         
-        # Check for duplicate (same employee, same date)
-        existing = collection.find_one({
-            'employee_id': attendance_data['employee_id'],
-            'date': date_str
-        })
-        
-        if existing:
-            raise ValueError('Attendance record already exists for this employee on this date')
-        
         # Prepare document
         doc = {
             'employee_id': attendance_data['employee_id'],
             'employee_name': employee['full_name'],
             'employee_email': employee['email'],
             'employee_department': employee['department'],
-            'date': date_str,
+            'date': schema.to_storage_date(date_str),
             'status': attendance_data['status'],
-            'created_at': datetime.utcnow()
+            'created_at': datetime.utcnow(),
+            'schema_version': schema.SCHEMA_VERSION
         }
         
-        # Insert and return
-        result = collection.insert_one(doc)
-        doc['id'] = str(result.inserted_id)
+        # The unique index cannot see a not yet migrated string-dated duplicate.
+        # Never true with ATTENDANCE_WRITE_BEHIND, which requires the migration
+        if schema.legacy_reads() and collection.find_one({'employee_id': doc['employee_id'], 'date': date_str}, {'_id': 1}):
+            raise ValueError('Attendance record already exists for this employee on this date')
+        
+        # Insert and return; the (employee_id, date) unique index rejects duplicates,
+        # as does the buffer's journal for records it has not written yet
+        # (a buffered duplicate of a stored record is dropped at flush)
+        try:
+            if not attendance_buffer.append(AttendanceService.buffer_key_prefix(doc['employee_id']) + date_str, doc):
+                collection.insert_one(doc)
+                AttendanceService._mark_changed([date_str])
+        except DuplicateKeyError:
+            raise ValueError('Attendance record already exists for this employee on this date')
+        doc['id'] = str(doc['_id'])
         doc.pop('_id', None)
         doc['created_at'] = doc['created_at'].isoformat() + 'Z'
         
@@ -62,73 +140,150 @@ class AttendanceService:
                 'email': employee['email'],
                 'department': employee['department']
             },
-            'date': doc['date'],
+            'date': date_str,
             'status': doc['status'],
             'created_at': doc['created_at']
         }
         
         return response
 
+    # Documents pulled from MongoDB per round trip when streaming listings
+    STREAM_BATCH_SIZE = 1000
+
+    # Upper bound on items accepted by create_many in one call
+    MAX_BULK_ITEMS = 1000
+
+    # Per-item outcomes reported by create_many
+    RESULT_CREATED = 'created'
+    RESULT_DUPLICATE = 'duplicate'
+    RESULT_UNKNOWN_EMPLOYEE = 'unknown_employee'
+
+    @staticmethod
+    def create_many(items):
+        """
+        Create many attendance records in one round trip per collection.
+
+        Employees are resolved with a single $in query and documents are
+        written with an unordered insert_many, so one duplicate does not stop
+        the rest of the batch. Returns one result dict per input item, in order.
+        """
+        if len(items) > AttendanceService.MAX_BULK_ITEMS:
+            raise ValueError(f"At most {AttendanceService.MAX_BULK_ITEMS} records can be submitted at once")
+        
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        employees = employee_directory.get_many({item['employee_id'] for item in items})
+        
+        date_strs = [
+            item['date'].isoformat() if hasattr(item['date'], 'isoformat') else str(item['date'])
+            for item in items
+        ]
+        legacy_existing = set()
+        if schema.legacy_reads() and items:
+            # The unique index cannot see not yet migrated string-dated duplicates
+            legacy_existing = {
+                (doc['employee_id'], doc['date'])
+                for doc in collection.find(
+                    {'employee_id': {'$in': list(employees)}, 'date': {'$in': list(set(date_strs))}},
+                    {'_id': 0, 'employee_id': 1, 'date': 1}
+                )
+            }
+        
+        results = []
+        docs = []
+        doc_positions = []  # index into results for each doc in docs
+        now = datetime.utcnow()
+        for item, date_str in zip(items, date_strs):
+            result = {'employee_id': item['employee_id'], 'date': date_str}
+            results.append(result)
+            
+            employee = employees.get(item['employee_id'])
+            if not employee:
+                result['result'] = AttendanceService.RESULT_UNKNOWN_EMPLOYEE
+                continue
+            if (item['employee_id'], date_str) in legacy_existing:
+                result['result'] = AttendanceService.RESULT_DUPLICATE
+                continue
+            
+            doc_positions.append(len(results) - 1)
+            docs.append({
+                'employee_id': item['employee_id'],
+                'employee_name': employee['full_name'],
+                'employee_email': employee['email'],
+                'employee_department': employee['department'],
+                'date': schema.to_storage_date(date_str),
+                'status': item['status'],
+                'created_at': now,
+                'schema_version': schema.SCHEMA_VERSION
+            })
+        
+        failed = set()
+        if docs:
+            try:
+                collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get('writeErrors', []):
+                    if error.get('code') != 11000:
+                        raise
+                    failed.add(error['index'])
+        
+        if len(failed) < len(docs):
+            AttendanceService._mark_changed([doc['date'] for doc_index, doc in enumerate(docs) if doc_index not in failed])
+        
+        # insert_many assigns _id on each doc client-side
+        for doc_index, doc in enumerate(docs):
+            result = results[doc_positions[doc_index]]
+            if doc_index in failed:
+                result['result'] = AttendanceService.RESULT_DUPLICATE
+            else:
+                result['result'] = AttendanceService.RESULT_CREATED
+                result['id'] = str(doc['_id'])
+        
+        return results
+
     @staticmethod
     def get_all(date_filter=None):
         """Get all attendance records, optionally filtered by date."""
+        return list(AttendanceService.iter_all(date_filter))
+
+    @staticmethod
+    def iter_all(date_filter=None, batch_size=None):
+        """
+        Iterate over formatted attendance records, optionally filtered by date.
+        Documents are read lazily in batches so memory stays bounded.
+        """
         collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
         
         query = {}
         if date_filter:
-            query['date'] = date_filter
-        
-        records = list(collection.find(query).sort('date', -1))
-        
-        # Format records
-        formatted_records = []
-        for record in records:
-            formatted = {
-                'id': str(record['_id']),
-                'employee': {
-                    'id': record.get('employee_id'),
-                    'employee_id': record.get('employee_id'),
-                    'full_name': record.get('employee_name'),
-                    'email': record.get('employee_email'),
-                    'department': record.get('employee_department')
-                },
-                'date': record.get('date'),
-                'status': record.get('status'),
-                'created_at': record['created_at'].isoformat() + 'Z' if isinstance(record.get('created_at'), datetime) else record.get('created_at')
-            }
-            formatted_records.append(formatted)
+            query['date'] = schema.date_equals(date_filter)
         
-        return formatted_records
+        cursor = collection.find(query, ATTENDANCE_FORMAT.projection).sort('date', -1).batch_size(batch_size or AttendanceService.STREAM_BATCH_SIZE)
+        return ATTENDANCE_FORMAT.iter(cursor)
 
     @staticmethod
-    def get_by_employee(employee_id):
-        """Get all attendance records for a specific employee."""
+    def get_by_employee(employee_id, date_from=None, date_to=None):
+        """
+        Get attendance records for a specific employee, newest first,
+        optionally limited to dates between date_from and date_to (inclusive).
+        """
         collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
         
-        # Verify employee exists
+        # Read from MongoDB, not employee_directory: the ETag covers the
+        # employees collection, so the summary must be as fresh as it
         employee = EmployeeService.get_by_employee_id(employee_id)
         if not employee:
             raise ValueError(f"Employee with ID '{employee_id}' not found")
         
-        records = list(collection.find({'employee_id': employee_id}).sort('date', -1))
-        
-        # Format records
-        formatted_records = []
-        for record in records:
-            formatted = {
-                'id': str(record['_id']),
-                'employee': {
-                    'id': employee['id'],
-                    'employee_id': employee['employee_id'],
-                    'full_name': employee['full_name'],
-                    'email': employee['email'],
-                    'department': employee['department']
-                },
-                'date': record.get('date'),
-                'status': record.get('status'),
-                'created_at': record['created_at'].isoformat() + 'Z' if isinstance(record.get('created_at'), datetime) else record.get('created_at')
-            }
-            formatted_records.append(formatted)
+        employee_summary = {
+            'id': employee['id'],
+            'employee_id': employee['employee_id'],
+            'full_name': employee['full_name'],
+            'email': employee['email'],
+            'department': employee['department']
+        }
+        query = AttendanceService.employee_query(employee_id, date_from, date_to)
+        cursor = collection.find(query, EMPLOYEE_ATTENDANCE_FORMAT.projection).sort('date', -1)
+        formatted_records = EMPLOYEE_ATTENDANCE_FORMAT.many(cursor, employee=employee_summary)
         
         return {
             'employee_id': employee['employee_id'],
@@ -137,8 +292,204 @@ class AttendanceService:
             'attendance': formatted_records
         }
 
+    @staticmethod
+    def get_summary(employee_id, date_from=None, date_to=None):
+        """
+        Present/absent totals and per-month breakdown of an employee's
+        attendance, aggregated on the server instead of returning the rows.
+        """
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        
+        employee = EmployeeService.get_by_employee_id(employee_id)
+        if not employee:
+            raise ValueError(f"Employee with ID '{employee_id}' not found")
+        
+        query = AttendanceService.employee_query(employee_id, date_from, date_to)
+        rows = collection.aggregate(AttendanceService.summary_pipeline(query))
+        return AttendanceService.build_summary(employee, rows, date_from, date_to)
+
+    @staticmethod
+    def employee_query(employee_id, date_from=None, date_to=None):
+        """Filter on one employee and an optional date range; served by the (employee_id, date) index."""
+        query = {'employee_id': employee_id}
+        query.update(schema.date_range_filter(date_from, date_to))
+        return query
+
+    @staticmethod
+    def summary_pipeline(query):
+        """Aggregation counting records per (month, status) for the given filter."""
+        return [
+            {'$match': query},
+            {'$group': {
+                '_id': {'month': schema.month_expression(), 'status': '$status'},
+                'count': {'$sum': 1},
+            }},
+        ]
+
+    @staticmethod
+    def build_summary(employee, rows, date_from=None, date_to=None):
+        """Fold summary_pipeline output into totals and a newest-first monthly list."""
+        months = {}
+        for row in rows:
+            month = months.setdefault(schema.to_api_date(row['_id']['month'])[:7], {'present': 0, 'absent': 0, 'total': 0})
+            key = row['_id']['status'].lower()
+            if key in month:
+                month[key] += row['count']
+            month['total'] += row['count']
+        
+        return {
+            'employee_id': employee['employee_id'],
+            'full_name': employee['full_name'],
+            'from': date_from,
+            'to': date_to,
+            'total': sum(month['total'] for month in months.values()),
+            'present': sum(month['present'] for month in months.values()),
+            'absent': sum(month['absent'] for month in months.values()),
+            'months': [{'month': name, **months[name]} for name in sorted(months, reverse=True)],
+        }
+
+    # Employee fields copied onto each attendance record at write time,
+    # so reads never need a $lookup: employee field -> attendance field
+    EMPLOYEE_COPIES = {
+        'full_name': 'employee_name',
+        'email': 'employee_email',
+        'department': 'employee_department',
+    }
+
+    @staticmethod
+    def _stale_copies_query(employee):
+        copies = {target: employee[source] for source, target in AttendanceService.EMPLOYEE_COPIES.items()}
+        query = {
+            'employee_id': employee['employee_id'],
+            '$or': [{field: {'$ne': value}} for field, value in copies.items()],
+        }
+        return query, copies
+
+    @staticmethod
+    def count_stale_employee_copies(employee_id):
+        """Count an employee's attendance records whose copied fields are out of date."""
+        employee = EmployeeService.get_by_employee_id(employee_id)
+        if not employee:
+            return 0
+        query, _ = AttendanceService._stale_copies_query(employee)
+        return mongodb.get_collection(AttendanceService.COLLECTION_NAME).count_documents(query)
+
+    @staticmethod
+    def refresh_employee_copies(employee_id, batch_size=None):
+        """
+        Rewrite the copied employee fields on that employee's attendance from
+        the employee's current values: one update_many, or batch_size records
+        at a time. Only stale records are touched, and because the values are
+        read when the job runs, overlapping refreshes settle on the latest
+        update. Returns the number of records changed.
+        """
+        employee = EmployeeService.get_by_employee_id(employee_id)
+        if not employee:
+            return 0
+        
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        query, copies = AttendanceService._stale_copies_query(employee)
+        if batch_size is None:
+            updated = collection.update_many(query, {'$set': copies}).modified_count
+        else:
+            updated = 0
+            while True:
+                ids = [doc['_id'] for doc in collection.find(query, {'_id': 1}).limit(batch_size)]
+                if not ids:
+                    break
+                updated += collection.update_many({'_id': {'$in': ids}, **query}, {'$set': copies}).modified_count
+        
+        if updated:
+            # Department totals of past reports change too
+            AttendanceService._mark_changed(history=True)
+        return updated
+
+    ARCHIVE_COLLECTION_NAME = 'attendance_archive'
+
+    @staticmethod
+    def count_for_employees(employee_ids):
+        """Count attendance records belonging to the given employee_ids."""
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        return collection.count_documents({'employee_id': {'$in': list(employee_ids)}})
+
+    @staticmethod
+    def remove_for_employees(employee_ids, archive=False, batch_size=1000):
+        """
+        Delete (or move to attendance_archive) all attendance of the given
+        employee_ids, batch_size documents at a time so no single operation
+        holds locks or floods replication for long. Safe to re-run.
+        Returns the number of records removed.
+        """
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        archive_collection = mongodb.get_collection(AttendanceService.ARCHIVE_COLLECTION_NAME) if archive else None
+        query = {'employee_id': {'$in': list(employee_ids)}}
+        removed = 0
+        removed_dates = set()
+        while True:
+            batch = list(collection.find(query, None if archive else {'_id': 1, 'date': 1}).limit(batch_size))
+            if not batch:
+                break
+            if archive:
+                try:
+                    archive_collection.insert_many(batch, ordered=False)
+                except BulkWriteError as e:
+                    # Already archived by an earlier, interrupted run
+                    if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                        raise
+            result = collection.delete_many({'_id': {'$in': [doc['_id'] for doc in batch]}})
+            removed += result.deleted_count
+            removed_dates.update(doc['date'] for doc in batch)
+        if removed:
+            AttendanceService._mark_changed(removed_dates)
+        return removed
+
+    @staticmethod
+    def remove_orphaned(employee_ids, archive=False, batch_size=1000):
+        """
+        Second pass of an employee delete: drop this host's journaled records
+        and remove_for_employees() for those employee_ids that still do not
+        exist, catching attendance written after the first pass by workers
+        that had the employee cached. Returns the number of records removed.
+        """
+        existing = EmployeeService.get_many_by_employee_ids(employee_ids)
+        orphaned = [employee_id for employee_id in employee_ids if employee_id not in existing]
+        if not orphaned:
+            return 0
+        attendance_buffer.discard(AttendanceService.buffer_key_prefix(employee_id) for employee_id in orphaned)
+        return AttendanceService.remove_for_employees(orphaned, archive=archive, batch_size=batch_size)
+
+    @staticmethod
+    def buffer_key_prefix(employee_id):
+        """Start of the attendance_buffer keys of an employee's records."""
+        return f"{employee_id}|"
+
+    @staticmethod
+    def status_counts(date):
+        """Count attendance records per status for a date with one $group on the server."""
+        collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
+        pipeline = [
+            {'$match': {'date': schema.date_equals(date)}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}},
+        ]
+        return {row['_id']: row['count'] for row in collection.aggregate(pipeline)}
+
     @staticmethod
     def count_by_status(date, status):
         """Count attendance records by date and status."""
         collection = mongodb.get_collection(AttendanceService.COLLECTION_NAME)
-        return collection.count_documents({'date': date, 'status': status})
+        return collection.count_documents({'date': schema.date_equals(date), 'status': status})
+
+
+# Write-behind buffer behind AttendanceService.create (hrms.write_behind);
+# the version stamps are bumped when a batch reaches MongoDB
+attendance_buffer = WriteBehindBuffer(
+    'attendance',
+    AttendanceService.COLLECTION_NAME,
+    settings.ATTENDANCE_BUFFER_PATH,
+    on_written=lambda docs: AttendanceService._mark_changed([doc['date'] for doc in docs]),
+    enabled=settings.ATTENDANCE_WRITE_BEHIND,
+    max_pending=settings.ATTENDANCE_BUFFER_MAX_PENDING,
+    batch_size=settings.ATTENDANCE_BUFFER_BATCH_SIZE,
+    flush_interval=settings.ATTENDANCE_BUFFER_FLUSH_INTERVAL_MS / 1000,
+    max_attempts=settings.ATTENDANCE_BUFFER_MAX_ATTEMPTS,
+)
@@ -0,0 +1,175 @@
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from rest_framework.test import APIClient
+
+from hrms.testcases import MongoTestCase
+from hrms.write_behind import WriteBehindBuffer
+from employees.services import EmployeeService
+from .services import AttendanceService, attendance_buffer
+
+
+class WriteBehindBufferTests(MongoTestCase):
+    """The SQLite journal: claim, flush, duplicates and recovery."""
+
+    def setUp(self):
+        super().setUp()
+        AttendanceService.ensure_indexes()
+        directory = tempfile.mkdtemp(prefix='hrms-test-journal-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = f'{directory}/journal.sqlite3'
+        self.written = []
+        self.buffer = self.make_buffer()
+        self.collection = self.db[AttendanceService.COLLECTION_NAME]
+
+    def make_buffer(self, **options):
+        buffer = WriteBehindBuffer('test', AttendanceService.COLLECTION_NAME, self.path,
+                                   on_written=self.written.extend, **options)
+        # Flush by hand: no background thread
+        buffer.start = lambda: None
+        return buffer
+
+    def record(self, employee_id='E1', day=datetime(2026, 1, 5)):
+        return {'employee_id': employee_id, 'date': day, 'status': 'Present'}
+
+    def pending_rows(self):
+        return sqlite3.connect(self.path).execute('SELECT key, attempts, lease_until FROM pending').fetchall()
+
+    def test_flush_writes_journaled_records(self):
+        self.assertTrue(self.buffer.append('E1|2026-01-05', self.record()))
+        self.assertTrue(self.buffer.append('E2|2026-01-05', self.record('E2')))
+        self.assertEqual(self.collection.count_documents({}), 0)
+
+        self.assertEqual(self.buffer.flush(), 2)
+
+        self.assertEqual(self.collection.count_documents({}), 2)
+        self.assertEqual(sorted(doc['employee_id'] for doc in self.written), ['E1', 'E2'])
+        self.assertEqual(self.buffer.stats(), {'pending': 0, 'failed': 0})
+
+    def test_append_rejects_a_key_still_waiting(self):
+        self.buffer.append('E1|2026-01-05', self.record())
+        with self.assertRaises(DuplicateKeyError):
+            self.buffer.append('E1|2026-01-05', self.record())
+        self.assertEqual(self.buffer.stats()['pending'], 1)
+
+    def test_duplicate_of_stored_record_is_dropped_at_flush(self):
+        self.collection.insert_one(self.record())
+        self.assertTrue(self.buffer.append('E1|2026-01-05', self.record()))
+
+        self.assertEqual(self.buffer.flush(), 1)
+
+        self.assertEqual(self.collection.count_documents({}), 1)
+        self.assertEqual(self.written, [])
+        self.assertEqual(self.buffer.stats(), {'pending': 0, 'failed': 0})
+
+    def test_batch_stored_before_a_crash_counts_as_written(self):
+        record = self.record()
+        self.buffer.append('E1|2026-01-05', record)
+        # An earlier attempt wrote it and died before settling the journal
+        self.collection.insert_one(dict(record))
+
+        self.buffer.flush()
+
+        self.assertEqual([doc['_id'] for doc in self.written], [record['_id']])
+        self.assertEqual(self.collection.count_documents({}), 1)
+        self.assertEqual(self.buffer.stats()['pending'], 0)
+
+    def test_entries_leased_by_a_dead_flusher_are_recovered_after_the_lease(self):
+        self.buffer.append('E1|2026-01-05', self.record())
+        self.assertEqual(len(self.buffer._claim()), 1)  # claimed, then the process died
+
+        other = self.make_buffer()
+        self.assertEqual(other.flush(), 0)
+
+        with mock.patch('hrms.write_behind.time.time', return_value=time.time() + 3600):
+            self.assertEqual(other.flush(), 1)
+        self.assertEqual(self.collection.count_documents({}), 1)
+
+    def test_unreachable_mongodb_releases_the_batch_without_charging_an_attempt(self):
+        self.buffer.append('E1|2026-01-05', self.record())
+        with mock.patch('hrms.write_behind.mongodb.get_collection', side_effect=ValueError('unreachable')):
+            for _ in range(self.buffer.max_attempts + 1):
+                with self.assertRaises(ValueError):
+                    self.buffer.flush()
+
+        self.assertEqual(self.pending_rows(), [('E1|2026-01-05', 0, 0)])
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.collection.count_documents({}), 1)
+
+    def test_entries_failing_every_attempt_move_to_the_failed_table(self):
+        buffer = self.make_buffer(max_attempts=2)
+        buffer.append('E1|2026-01-05', self.record())
+        error = {'writeErrors': [{'index': 0, 'code': 121, 'errmsg': 'Document failed validation'}]}
+        with mock.patch('mongomock.collection.Collection.bulk_write', side_effect=BulkWriteError(error)):
+            buffer.flush()
+            self.assertEqual(buffer.stats(), {'pending': 1, 'failed': 0})
+            buffer.flush()
+        self.assertEqual(buffer.stats(), {'pending': 0, 'failed': 1})
+
+        self.assertEqual(buffer.retry_failed(), 1)
+        buffer.flush()
+        self.assertEqual(self.collection.count_documents({}), 1)
+
+    def test_discard_removes_waiting_entries_by_key_prefix(self):
+        self.buffer.append('E1|2026-01-05', self.record())
+        self.buffer.append('E1|2026-01-06', self.record(day=datetime(2026, 1, 6)))
+        self.buffer.append('E10|2026-01-05', self.record('E10'))
+
+        self.assertEqual(self.buffer.discard(['E1|']), 2)
+        self.assertEqual([row[0] for row in self.pending_rows()], ['E10|2026-01-05'])
+
+
+class BufferedCreateTests(MongoTestCase):
+    """POST /api/attendance/ with ATTENDANCE_WRITE_BEHIND."""
+
+    def setUp(self):
+        super().setUp()
+        EmployeeService.ensure_indexes()
+        AttendanceService.ensure_indexes()
+        directory = tempfile.mkdtemp(prefix='hrms-test-journal-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        for name, value in (('enabled', True), ('path', f'{directory}/journal.sqlite3'), ('start', lambda: None)):
+            patcher = mock.patch.object(attendance_buffer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        attendance_buffer._reset()
+        self.addCleanup(attendance_buffer._reset)
+        self.api = APIClient()
+        self.api.post('/api/employees/', {
+            'employee_id': 'E1', 'full_name': 'Ann Lee', 'email': 'ann@example.com', 'department': 'Ops',
+        }, format='json')
+
+    def post(self, status='Present'):
+        return self.api.post('/api/attendance/', {'employee_id': 'E1', 'date': '2026-01-05', 'status': status},
+                             format='json')
+
+    def test_record_is_accepted_then_written_at_flush(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.db.attendance.count_documents({}), 0)
+
+        attendance_buffer.drain()
+
+        stored = self.db.attendance.find_one()
+        self.assertEqual(str(stored['_id']), response.json()['attendance']['id'])
+        self.assertEqual(stored['employee_name'], 'Ann Lee')
+
+    def test_repeat_while_journaled_is_rejected(self):
+        self.post()
+        response = self.post('Absent')
+        self.assertEqual(response.status_code, 400)
+
+    def test_repeat_of_a_stored_record_is_accepted_and_dropped_at_flush(self):
+        self.post()
+        attendance_buffer.drain()
+
+        self.assertEqual(self.post('Absent').status_code, 202)
+        attendance_buffer.drain()
+
+        self.assertEqual(self.db.attendance.count_documents({}), 1)
+        self.assertEqual(self.db.attendance.find_one()['status'], 'Present')
@@ -4,5 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.create_attendance, name='create_attendance'),
     path('all/', views.list_all_attendance, name='list_all_attendance'),
+    path('bulk/', views.bulk_create_attendance, name='bulk_create_attendance'),
+    path('report/', views.attendance_report, name='attendance_report'),
     path('<str:employee_id>/', views.get_employee_attendance, name='get_employee_attendance'),
 ]
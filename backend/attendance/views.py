@@ -1,10 +1,14 @@
+from datetime import datetime
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
 from .serializers import AttendanceCreateSerializer
-from .services import AttendanceService
+from .services import AttendanceService, attendance_buffer
+from .reports import AttendanceReportService
+from hrms.streaming import streaming_json_response
+from hrms.conditional import conditional_get
 
 
 @csrf_exempt
@@ -20,6 +24,8 @@ def create_attendance(request):
         "date": "2026-02-04",
         "status": "Present"
     }
+    Returns 202 instead of 201 with ATTENDANCE_WRITE_BEHIND: the record is
+    stored and shows up in reads once the buffer has flushed it.
     """
     serializer = AttendanceCreateSerializer(data=request.data)
     
@@ -31,7 +37,7 @@ def create_attendance(request):
                     "message": "Attendance recorded successfully",
                     "attendance": attendance
                 },
-                status=status.HTTP_201_CREATED
+                status=status.HTTP_202_ACCEPTED if attendance_buffer.enabled else status.HTTP_201_CREATED
             )
         except ValueError as e:
             return Response(
@@ -51,16 +57,124 @@ def create_attendance(request):
 
 
 @csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def bulk_create_attendance(request):
+    """
+    Create many attendance records in one request.
+    
+    POST /api/attendance/bulk/
+    Body: {
+        "records": [
+            {"employee_id": "EMP001", "date": "2026-02-04", "status": "Present"},
+            ...
+        ]
+    }
+    Returns per-item results in input order, each with "result" set to
+    "created", "duplicate", "unknown_employee" or "invalid".
+    """
+    records = request.data.get('records') if isinstance(request.data, dict) else None
+    if not isinstance(records, list) or not records:
+        return Response(
+            {"error": "Body must contain a non-empty 'records' list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(records) > AttendanceService.MAX_BULK_ITEMS:
+        return Response(
+            {"error": f"At most {AttendanceService.MAX_BULK_ITEMS} records can be submitted at once"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    results = [None] * len(records)
+    valid_items = []
+    valid_positions = []
+    for position, record in enumerate(records):
+        serializer = AttendanceCreateSerializer(data=record)
+        if serializer.is_valid():
+            valid_items.append(serializer.validated_data)
+            valid_positions.append(position)
+        else:
+            results[position] = {"result": "invalid", "details": serializer.errors}
+    
+    try:
+        created = AttendanceService.create_many(valid_items) if valid_items else []
+    except Exception as e:
+        return Response(
+            {"error": f"Failed to create attendance records: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    for position, result in zip(valid_positions, created):
+        results[position] = result
+    
+    summary = {}
+    for result in results:
+        summary[result['result']] = summary.get(result['result'], 0) + 1
+    
+    return Response(
+        {
+            "message": "Bulk attendance processed",
+            "summary": summary,
+            "results": results
+        },
+        status=status.HTTP_200_OK
+    )
+
+
+def date_range_params(params):
+    """
+    Read the optional ?from=/?to= (YYYY-MM-DD) query parameters.
+    Raises ValueError for malformed or inverted ranges.
+    """
+    bounds = []
+    for name in ('from', 'to'):
+        value = params.get(name) or None
+        if value is not None:
+            try:
+                value = datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                raise ValueError(f"'{name}' must be a date in YYYY-MM-DD format")
+        bounds.append(value)
+    date_from, date_to = bounds
+    if date_from and date_to and date_from > date_to:
+        raise ValueError("'from' must not be after 'to'")
+    return date_from, date_to
+
+
+def is_summary_request(params):
+    """True when ?summary= asks for aggregated totals instead of records."""
+    return params.get('summary', '').lower() in ('1', 'true', 'yes')
+
+
+def is_stream_request(params):
+    """True when ?stream= asks for the list to be streamed."""
+    return params.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+@csrf_exempt
+@conditional_get('employees', 'attendance')
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Disable authentication for this endpoint
 def get_employee_attendance(request, employee_id):
     """
-    Get all attendance records for a specific employee.
+    Get attendance records for a specific employee.
     
     GET /api/attendance/{employee_id}/
+    GET /api/attendance/{employee_id}/?from=2026-01-01&to=2026-03-31 - Records in a date range
+    GET /api/attendance/{employee_id}/?summary=true - Present/absent totals and per-month counts
     """
     try:
-        result = AttendanceService.get_by_employee(employee_id)
+        date_from, date_to = date_range_params(request.query_params)
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        if is_summary_request(request.query_params):
+            result = AttendanceService.get_summary(employee_id, date_from, date_to)
+        else:
+            result = AttendanceService.get_by_employee(employee_id, date_from, date_to)
         return Response(result, status=status.HTTP_200_OK)
     except ValueError as e:
         return Response(
@@ -75,6 +189,7 @@ def get_employee_attendance(request, employee_id):
 
 
 @csrf_exempt
+@conditional_get('attendance', cache=True)
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Disable authentication for this endpoint
 def list_all_attendance(request):
@@ -84,11 +199,15 @@ def list_all_attendance(request):
     GET /api/attendance/all/
     Returns array of attendance records directly (not nested in object)
     Supports optional date filter via query parameter
+    Pass ?stream=true to stream the array with constant memory
     """
     try:
         # Get optional date filter from query params
         date_filter = request.query_params.get('date', None)
         
+        if is_stream_request(request.query_params):
+            return streaming_json_response(AttendanceService.iter_all(date_filter))
+        
         attendance_records = AttendanceService.get_all(date_filter)
         
         # Return array directly for frontend compatibility
@@ -101,6 +220,56 @@ def list_all_attendance(request):
 
 
 @csrf_exempt
+@conditional_get('attendance')
+@api_view(['GET'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def attendance_report(request):
+    """
+    Department x date matrix of present/absent counts.
+    
+    GET /api/attendance/report/?from=2026-01-01&to=2026-01-31[&department=Engineering]
+    Returns: {
+        "from", "to", "department", "dates": [...],
+        "departments": [{"department", "present", "absent", "total",
+                         "days": [{"date", "present", "absent"}, ...]}, ...]
+    }
+    """
+    try:
+        date_from, date_to = date_range_params(request.query_params)
+        AttendanceReportService.validate_range(date_from, date_to)
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        report = AttendanceReportService.department_matrix(
+            date_from, date_to, request.query_params.get('department') or None
+        )
+        return Response(report, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            {"error": f"Failed to build attendance report: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def dashboard_payload(total_employees, counts):
+    """Build the dashboard response from the employee total and per-status counts."""
+    present_today = counts.get('Present', 0)
+    absent_today = counts.get('Absent', 0)
+    return {
+        'total_employees': total_employees,
+        'present_today': present_today,
+        'absent_today': absent_today,
+        'unmarked_today': max(total_employees - present_today - absent_today, 0),
+        'attendance_rate': round(present_today * 100 / total_employees, 1) if total_employees else 0.0
+    }
+
+
+@csrf_exempt
+@conditional_get('employees', 'attendance', daily=True, cache=True)
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Disable authentication for this endpoint
 def dashboard_stats(request):
@@ -110,9 +279,14 @@ def dashboard_stats(request):
     GET /api/dashboard/
     Returns: {
         "total_employees": int,
-        "present_today": int
+        "present_today": int,
+        "absent_today": int,
+        "unmarked_today": int,
+        "attendance_rate": float  # percent of employees present today
     }
     
+    Counts come from a single $group aggregation, so the cost does not
+    grow with the number of records marked today.
     This is a pure GET endpoint - does not read request.data or request.body.
     """
     try:
@@ -125,14 +299,10 @@ def dashboard_stats(request):
         # Get total employee count
         total_employees = EmployeeService.count()
         
-        # Get today's attendance and count present
-        today_attendance = AttendanceService.get_all(date_filter=today)
-        present_today = sum(1 for record in today_attendance if record.get('status') == 'Present')
+        # Count today's attendance per status on the server
+        counts = AttendanceService.status_counts(today)
         
-        return Response({
-            'total_employees': total_employees,
-            'present_today': present_today
-        }, status=status.HTTP_200_OK)
+        return Response(dashboard_payload(total_employees, counts), status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response(
@@ -0,0 +1,110 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks talk to the cluster in MONGO_URI. Point MONGO_DB_NAME at a
+scratch database (e.g. hrms_bench) - scripts that write data drop what they
+create but should never run against production data.
+
+Set BENCH_MONGOMOCK=1 to run against an in-process mongomock database
+instead (useful for CPU-side comparisons; network latency is not modelled
+unless BENCH_MONGO_RTT_MS is set, which delays every collection call by
+that many milliseconds, without holding the GIL, like a network round trip).
+mongomock is not thread-safe, so its collection calls are serialized.
+"""
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """Make the backend importable and configure Django settings."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hrms.settings')
+    import django
+    django.setup()
+    if os.getenv('BENCH_MONGOMOCK') == '1':
+        _use_mongomock()
+
+
+def _use_mongomock():
+    """Point the shared MongoDB singleton at an in-memory mongomock client."""
+    import mongomock
+    from django.conf import settings
+    from hrms.mongodb import mongodb
+    client = mongomock.MongoClient()
+    mongodb._client = client
+    mongodb._db = client[settings.MONGO_DB_NAME]
+    _add_round_trip(float(os.getenv('BENCH_MONGO_RTT_MS', '0')) / 1000)
+
+
+# mongomock Collection methods that would each be one round trip to a server
+_ROUND_TRIP_METHODS = (
+    'insert_one', 'insert_many', 'bulk_write', 'update_one', 'update_many', 'delete_one', 'delete_many',
+    'find_one', 'find_one_and_update', 'count_documents', 'aggregate', 'find',
+)
+
+
+def _add_round_trip(seconds):
+    import threading
+    from mongomock.collection import Collection
+    lock = threading.RLock()
+    state = threading.local()
+
+    def delayed(method):
+        def call(*args, **kwargs):
+            # Only the outermost call is a round trip (bulk_write calls insert_one)
+            outermost = not getattr(state, 'depth', 0)
+            if seconds and outermost:
+                time.sleep(seconds)
+            with lock:
+                state.depth = getattr(state, 'depth', 0) + 1
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    state.depth -= 1
+        return call
+
+    for name in _ROUND_TRIP_METHODS:
+        setattr(Collection, name, delayed(getattr(Collection, name)))
+
+
+def time_calls(fn, iterations):
+    """Call fn repeatedly and return per-call latencies in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[index]
+
+
+def summarize(samples):
+    """Return mean/p50/p95/p99 of latency samples in milliseconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+    }
+
+
+def report(label, samples):
+    """Print a one-line latency summary."""
+    stats = summarize(samples)
+    print(
+        f"{label:<32} mean {stats['mean_ms']:8.3f} ms   "
+        f"p50 {stats['p50_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms"
+    )
+    return stats
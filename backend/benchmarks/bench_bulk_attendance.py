@@ -0,0 +1,77 @@
+"""
+Benchmark: marking attendance one record at a time vs. the bulk path.
+
+Seeds a scratch set of employees, marks one day of attendance for all of
+them through AttendanceService.create (one call per employee) and through
+AttendanceService.create_many (batches), then removes everything it wrote.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set):
+    python -m benchmarks.bench_bulk_attendance [employees] [batch_size]
+"""
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks._common import setup_django
+
+setup_django()
+
+from hrms.mongodb import mongodb  # noqa: E402
+from employees.services import EmployeeService  # noqa: E402
+from attendance.services import AttendanceService  # noqa: E402
+
+PREFIX = 'BENCH-BULK-'
+
+
+def seed_employees(count):
+    collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+    collection.insert_many([
+        {
+            'employee_id': f'{PREFIX}{i:06d}',
+            'full_name': f'Bench Employee {i}',
+            'email': f'bench.bulk.{i}@example.com',
+            'department': f'Dept {i % 10}',
+            'created_at': datetime.utcnow(),
+        }
+        for i in range(count)
+    ])
+    return [f'{PREFIX}{i:06d}' for i in range(count)]
+
+
+def cleanup():
+    mongodb.get_collection(EmployeeService.COLLECTION_NAME).delete_many({'employee_id': {'$regex': f'^{PREFIX}'}})
+    mongodb.get_collection(AttendanceService.COLLECTION_NAME).delete_many({'employee_id': {'$regex': f'^{PREFIX}'}})
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else AttendanceService.MAX_BULK_ITEMS
+    EmployeeService.ensure_indexes()
+    AttendanceService.ensure_indexes()
+    cleanup()
+    employee_ids = seed_employees(count)
+    try:
+        day_one = date.today() - timedelta(days=2)
+        start = time.perf_counter()
+        for employee_id in employee_ids:
+            AttendanceService.create({'employee_id': employee_id, 'date': day_one, 'status': 'Present'})
+        single = time.perf_counter() - start
+
+        day_two = day_one + timedelta(days=1)
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            AttendanceService.create_many([
+                {'employee_id': employee_id, 'date': day_two, 'status': 'Present'}
+                for employee_id in employee_ids[offset:offset + batch_size]
+            ])
+        bulk = time.perf_counter() - start
+
+        print(f"single-record path: {count / single:10.1f} records/s ({single:.2f} s)")
+        print(f"bulk path:          {count / bulk:10.1f} records/s ({bulk:.2f} s, batch {batch_size})")
+        print(f"speedup:            {single / bulk:10.1f}x")
+    finally:
+        cleanup()
+
+
+if __name__ == '__main__':
+    main()
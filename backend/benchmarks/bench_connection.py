@@ -0,0 +1,43 @@
+"""
+Benchmark: cost of the former per-call ping in MongoDB.get_db().
+
+Compares a read issued through get_collection() as it works now against the
+same read preceded by the admin ping that get_db() used to send on every call.
+
+Usage (from backend/, MONGO_URI set):
+    python -m benchmarks.bench_connection [iterations]
+"""
+import statistics
+import sys
+
+from benchmarks._common import setup_django, time_calls, report
+
+setup_django()
+
+from hrms.mongodb import mongodb  # noqa: E402
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    collection_name = 'employees'
+
+    def with_ping():
+        db = mongodb.get_db()
+        db.client.admin.command('ping')
+        db[collection_name].find_one({}, {'_id': 1})
+
+    def without_ping():
+        mongodb.get_collection(collection_name).find_one({}, {'_id': 1})
+
+    # Warm the pool so connection setup is not measured
+    time_calls(without_ping, 10)
+
+    legacy = time_calls(with_ping, iterations)
+    current = time_calls(without_ping, iterations)
+    report('ping + find_one (legacy)', legacy)
+    report('find_one (current)', current)
+    print(f"saved per request: {statistics.mean(legacy) - statistics.mean(current):.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
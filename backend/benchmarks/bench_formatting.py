@@ -0,0 +1,107 @@
+"""
+Microbenchmark: formatting MongoDB documents for the API.
+
+Compares the former per-call formatting loops (copied here verbatim in
+spirit) with the compiled DocumentFormatter on synthetic documents.
+No database is needed.
+
+Since the orjson renderer, the formats leave datetime/ObjectId values to
+the renderer; see bench_rendering for the end-to-end comparison.
+
+Usage (from backend/):
+    python -m benchmarks.bench_formatting [documents]
+"""
+import gc
+import sys
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from benchmarks._common import setup_django
+
+setup_django()
+
+from employees.services import EMPLOYEE_FORMAT  # noqa: E402
+from attendance.services import ATTENDANCE_FORMAT  # noqa: E402
+
+
+def legacy_employees(employees):
+    for emp in employees:
+        emp['id'] = str(emp['_id'])
+        emp.pop('_id', None)
+        if 'created_at' in emp:
+            emp['created_at'] = emp['created_at'].isoformat() + 'Z'
+    return employees
+
+
+def legacy_attendance(records):
+    formatted_records = []
+    for record in records:
+        formatted = {
+            'id': str(record['_id']),
+            'employee': {
+                'id': record.get('employee_id'),
+                'employee_id': record.get('employee_id'),
+                'full_name': record.get('employee_name'),
+                'email': record.get('employee_email'),
+                'department': record.get('employee_department')
+            },
+            'date': record.get('date'),
+            'status': record.get('status'),
+            'created_at': record['created_at'].isoformat() + 'Z' if isinstance(record.get('created_at'), datetime) else record.get('created_at')
+        }
+        formatted_records.append(formatted)
+    return formatted_records
+
+
+def employee_docs(count):
+    now = datetime.utcnow()
+    return [
+        {'_id': ObjectId(), 'employee_id': f'EMP{i:06d}', 'full_name': f'Employee {i}',
+         'email': f'employee{i}@example.com', 'department': 'Engineering', 'created_at': now}
+        for i in range(count)
+    ]
+
+
+def attendance_docs(count):
+    now = datetime.utcnow()
+    return [
+        {'_id': ObjectId(), 'employee_id': f'EMP{i:06d}', 'employee_name': f'Employee {i}',
+         'employee_email': f'employee{i}@example.com', 'employee_department': 'Engineering',
+         'date': '2026-02-04', 'status': 'Present', 'created_at': now}
+        for i in range(count)
+    ]
+
+
+def best_of(fn, make_docs, count, rounds=5):
+    best = None
+    for _ in range(rounds):
+        docs = make_docs(count)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(docs)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cases = [
+        ('employees', legacy_employees, EMPLOYEE_FORMAT.many, employee_docs),
+        ('attendance', legacy_attendance, ATTENDANCE_FORMAT.many, attendance_docs),
+    ]
+    for label, legacy, compiled, make_docs in cases:
+        before = best_of(legacy, make_docs, count)
+        after = best_of(compiled, make_docs, count)
+        print(f"{label:<11} {count} docs   legacy {before * 1000:8.1f} ms   "
+              f"formatter {after * 1000:8.1f} ms   ({before / after:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: what logging costs a request.
+
+1. Caller-side cost of one log record through a synchronous StreamHandler
+   with the text formatter (the previous setup) and through
+   hrms.log.QueueHandler with the JSON formatter (the current one), into an
+   in-memory stream and into a slow one (100 us per write, standing in for
+   a congested pipe or disk).
+2. Per-request cost of the configured LOGGING: employee GET and POST
+   requests through the full Django stack, alternating rounds with logging
+   on and with logging.disable(), reporting the best round of each, the
+   difference and the number of records written per request. Against
+   mongomock the latency difference is within run-to-run noise; records per
+   request times the per-record cost above is the steadier figure.
+
+Log output goes to stderr; redirect it so the terminal is not measured.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set, or
+BENCH_MONGOMOCK=1):
+    python -m benchmarks.bench_logging [requests] 2>/dev/null
+"""
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+from benchmarks._common import setup_django, time_calls
+
+setup_django()
+
+from rest_framework.test import APIClient  # noqa: E402
+from hrms.log import JsonFormatter, QueueHandler  # noqa: E402
+from hrms.mongodb import mongodb  # noqa: E402
+from employees.services import EmployeeService  # noqa: E402
+
+PREFIX = 'BENCH-LOG-'
+
+RECORDS = 20_000
+
+ROUNDS = 3
+
+
+class SlowStream(io.StringIO):
+    """A stream whose writes block for 100 us."""
+
+    def write(self, text):
+        time.sleep(0.0001)
+        return super().write(text)
+
+
+def record_cost(handler):
+    """Mean microseconds a caller spends per logger.info call through `handler`."""
+    logger = logging.getLogger('benchmarks.logging')
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        logger.info("Employee created successfully: %s", i)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    return elapsed / RECORDS * 1e6
+
+
+class RecordCounter(logging.Filter):
+    """Counts records that pass the configured handler's filters."""
+
+    count = 0
+
+    def filter(self, record):
+        self.count += 1
+        return True
+
+
+def cleanup():
+    mongodb.get_collection(EmployeeService.COLLECTION_NAME).delete_many({'employee_id': {'$regex': f'^{PREFIX}'}})
+
+
+def request_cost(label, call, iterations):
+    """Print best-of-ROUNDS mean latency of `call` with logging on and off, and the difference."""
+    counter = RecordCounter()
+    handler = logging._handlers['console']  # the LOGGING handler every logger writes to
+    handler.addFilter(counter)
+    logged, silent = [], []
+    for _ in range(ROUNDS):
+        cleanup()
+        logged.append(statistics.mean(time_calls(call, iterations)))
+        cleanup()
+        logging.disable(logging.CRITICAL)
+        try:
+            silent.append(statistics.mean(time_calls(call, iterations)))
+        finally:
+            logging.disable(logging.NOTSET)
+    handler.removeFilter(counter)
+    on, off = min(logged), min(silent)
+    print(f"  {label:<30} logging on {on:7.3f} ms   off {off:7.3f} ms   cost {(on - off) * 1000:7.1f} us   "
+          f"{counter.count / (ROUNDS * iterations):.2f} records")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    EmployeeService.ensure_indexes()
+
+    print(f"Per record (caller side, {RECORDS} records):")
+    for sink in (io.StringIO, SlowStream):
+        sync = logging.StreamHandler(sink())
+        sync.setFormatter(logging.Formatter('{levelname} {asctime} {module} {message}', style='{'))
+        queued = QueueHandler(queue_size=0, stream=sink())
+        queued.setFormatter(JsonFormatter())
+        print(f"  {sink.__name__:<10} StreamHandler + text {record_cost(sync):8.2f} us   "
+              f"QueueHandler + JSON {record_cost(queued):8.2f} us")
+
+    api = APIClient()
+    counter = iter(range(10 ** 9))
+
+    def create():
+        n = next(counter)
+        api.post('/api/employees/', {
+            'employee_id': f'{PREFIX}{os.getpid()}-{n}',
+            'full_name': f'Log Bench {n}',
+            'email': f'log.bench.{os.getpid()}.{n}@example.com',
+            'department': 'Benchmarks',
+        }, format='json')
+
+    def page():
+        api.get('/api/employees/?limit=50')
+
+    print(f"Per request ({iterations} requests per round):")
+    try:
+        time_calls(page, max(iterations // 10, 1))
+        request_cost('GET /api/employees/?limit=50', page, iterations)
+        request_cost('POST /api/employees/', create, iterations)
+    finally:
+        cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: rendering large list payloads, stdlib JSON vs orjson.
+
+"before" is the former path: datetime/ObjectId formatted by hand in the
+service, then DRF's JSONRenderer. "after" is the current path: raw values
+from the DocumentFormatter rendered by ORJSONRenderer. Both produce the
+same bytes; the script checks that before timing. No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rendering [documents]
+"""
+import sys
+
+from benchmarks._common import setup_django
+
+setup_django()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from hrms.renderers import ORJSONRenderer  # noqa: E402
+from employees.services import EMPLOYEE_FORMAT  # noqa: E402
+from attendance.services import ATTENDANCE_FORMAT  # noqa: E402
+from benchmarks.bench_formatting import (  # noqa: E402
+    attendance_docs, best_of, employee_docs, legacy_attendance, legacy_employees,
+)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    stdlib = JSONRenderer()
+    fast = ORJSONRenderer()
+    cases = [
+        ('employees', legacy_employees, EMPLOYEE_FORMAT.many, employee_docs),
+        ('attendance', legacy_attendance, ATTENDANCE_FORMAT.many, attendance_docs),
+    ]
+    for label, legacy, current, make_docs in cases:
+        docs = make_docs(1000)
+        sample = [dict(doc) for doc in docs]
+        assert stdlib.render(legacy(docs)) == fast.render(current(sample)), f"{label}: output differs"
+
+        before = best_of(lambda d: stdlib.render(legacy(d)), make_docs, count)
+        after = best_of(lambda d: fast.render(current(d)), make_docs, count)
+        print(f"{label:<11} {count} docs   JSONRenderer {before * 1000:8.1f} ms   "
+              f"ORJSONRenderer {after * 1000:8.1f} ms   ({before / after:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
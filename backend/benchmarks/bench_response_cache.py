@@ -0,0 +1,105 @@
+"""
+Benchmark: read endpoints with and without the shared response cache.
+
+Seeds a small data set, then requests each cached endpoint through the full
+Django stack with the test client:
+- uncached: RESPONSE_CACHE_ENABLED=False, every request queries MongoDB and
+  renders the payload
+- cached: the "responses" cache on the locmem and file backends, and on
+  Redis when a URL is given. Reads are interleaved with a write (a version
+  bump, as every write path does) every WRITE_EVERY requests, so the hit
+  ratio printed next to the latency reflects invalidation, not just a warm
+  cache
+
+The hit ratio is read from hrms_response_cache_requests_total, the counter
+/metrics exposes in production.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set, or
+BENCH_MONGOMOCK=1):
+    python -m benchmarks.bench_response_cache [requests] [redis_url]
+"""
+import shutil
+import sys
+import tempfile
+
+from benchmarks._common import setup_django, summarize, time_calls
+
+setup_django()
+
+from django.test import Client, override_settings  # noqa: E402
+from hrms import response_cache, versions  # noqa: E402
+from hrms.metrics import RESPONSE_CACHE_REQUESTS  # noqa: E402
+from benchmarks import seed  # noqa: E402
+
+WRITE_EVERY = 50
+
+# (path, view behind it, collection a write to it bumps)
+ENDPOINTS = [
+    ('/api/employees/', 'employees.views.employee_list_create', 'employees'),
+    ('/api/employees/?limit=50', 'employees.views.employee_list_create', 'employees'),
+    ('/api/attendance/all/', 'attendance.views.list_all_attendance', 'attendance'),
+    ('/api/dashboard/', 'attendance.views.dashboard_stats', 'attendance'),
+]
+
+
+def backends(redis_url):
+    file_dir = tempfile.mkdtemp(prefix='hrms-bench-cache-')
+    found = [
+        ('locmem', 'django.core.cache.backends.locmem.LocMemCache', 'bench-responses'),
+        ('file', 'django.core.cache.backends.filebased.FileBasedCache', file_dir),
+    ]
+    if redis_url:
+        found.append(('redis', 'django.core.cache.backends.redis.RedisCache', redis_url))
+    return found, file_dir
+
+
+def counted(view):
+    return [RESPONSE_CACHE_REQUESTS.labels(view, result)._value.get() for result in ('hit', 'miss')]
+
+
+def run(client, path, collection, iterations):
+    """Latency samples for `iterations` GETs of path, bumping collection every WRITE_EVERY."""
+    calls = iter(range(10 ** 9))
+
+    def request():
+        if next(calls) % WRITE_EVERY == WRITE_EVERY - 1:
+            versions.bump_version(collection)
+        response = client.get(path)
+        assert response.status_code == 200, response.status_code
+
+    time_calls(request, max(iterations // 10, 1))  # warm up
+    return summarize(time_calls(request, iterations))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    redis_url = sys.argv[2] if len(sys.argv) > 2 else None
+    client = Client()
+
+    seed.cleanup()
+    seed.seed(employees=1000, days=7)
+    cases, file_dir = backends(redis_url)
+    try:
+        print(f"{iterations} requests per case, a write every {WRITE_EVERY}:")
+        for path, view, collection in ENDPOINTS:
+            with override_settings(RESPONSE_CACHE_ENABLED=False):
+                stats = run(client, path, collection, iterations)
+            print(f"  {path:<26} {'uncached':<8} p50 {stats['p50_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms")
+            for label, backend, location in cases:
+                caches = {
+                    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                    response_cache.CACHE_ALIAS: {'BACKEND': backend, 'LOCATION': location},
+                }
+                with override_settings(RESPONSE_CACHE_ENABLED=True, CACHES=caches):
+                    hits, misses = counted(view)
+                    stats = run(client, path, collection, iterations)
+                    hits, misses = [after - before for after, before in zip(counted(view), (hits, misses))]
+                print(f"  {path:<26} {label:<8} p50 {stats['p50_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms   "
+                      f"hit ratio {hits / max(hits + misses, 1):.1%}")
+    finally:
+        seed.cleanup()
+        shutil.rmtree(file_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: the default settings profile against the API-only one
+(HRMS_API_ONLY=True).
+
+Settings are per process, so each profile runs in its own subprocesses:
+- import time: a fresh interpreter loading the WSGI application and the
+  URLconf (a worker's cold start up to its first request)
+- request latency: requests through the full Django stack (middleware
+  included) with the test client; /api/health/live/ touches no database
+  and isolates the framework overhead. Profiles alternate for ROUNDS
+  rounds and the best round per path is reported, since a single round is
+  easily skewed by other load on the machine
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set, or
+BENCH_MONGOMOCK=1):
+    python -m benchmarks.bench_settings_profile [requests] [import_runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks._common import BACKEND_DIR, summarize
+
+PROFILES = [('default', 'False'), ('api-only', 'True')]
+
+ROUNDS = 3
+
+PATHS = [
+    '/api/health/live/',
+    '/api/employees/?limit=50',
+    '/api/dashboard/',
+]
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import hrms.wsgi; "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def worker(iterations):
+    """Time requests in this process (runs in a subprocess) and print JSON."""
+    from benchmarks._common import setup_django, time_calls
+    setup_django()
+    from django.test import Client
+
+    client = Client()
+    results = {}
+    for path in PATHS:
+        time_calls(lambda: client.get(path), max(iterations // 10, 1))  # warm up
+        results[path] = summarize(time_calls(lambda: client.get(path), iterations))
+    print(json.dumps(results))
+
+
+def profile_env(flag):
+    return dict(os.environ, HRMS_API_ONLY=flag, DJANGO_SETTINGS_MODULE='hrms.settings',
+                ALLOWED_HOSTS='testserver,localhost')
+
+
+def run_child(args, flag):
+    completed = subprocess.run([sys.executable] + args, cwd=BACKEND_DIR, env=profile_env(flag),
+                               check=True, capture_output=True, text=True)
+    return completed.stdout.strip().splitlines()[-1]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        worker(int(sys.argv[2]))
+        return
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    import_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"Import time (WSGI app + URLconf, {import_runs} runs):")
+    for label, flag in PROFILES:
+        samples = [float(run_child(['-c', IMPORT_SNIPPET], flag)) * 1000 for _ in range(import_runs)]
+        print(f"  {label:<10} mean {statistics.mean(samples):8.1f} ms   min {min(samples):8.1f} ms")
+
+    print(f"Request latency ({iterations} requests per path, best of {ROUNDS} rounds):")
+    best = {label: {} for label, _ in PROFILES}
+    for _ in range(ROUNDS):
+        for label, flag in PROFILES:
+            output = run_child(['-m', 'benchmarks.bench_settings_profile', '--worker', str(iterations)], flag)
+            for path, stats in json.loads(output).items():
+                if path not in best[label] or stats['p50_ms'] < best[label][path]['p50_ms']:
+                    best[label][path] = stats
+    for path in PATHS:
+        line = f"  {path:<28}"
+        for label, _ in PROFILES:
+            stats = best[label][path]
+            line += f" {label} p50 {stats['p50_ms']:7.3f} ms p95 {stats['p95_ms']:7.3f} ms  "
+        print(line.rstrip())
+
+
+if __name__ == '__main__':
+    main()
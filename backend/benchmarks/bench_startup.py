@@ -0,0 +1,52 @@
+"""
+Benchmark: process cold-start time.
+
+Times, in fresh interpreter processes, loading the WSGI application (what
+every worker does at boot) and a management command that imports the
+services. Each runs against MONGO_URI as configured and against an
+unreachable cluster, where anything that talks to MongoDB during startup
+waits for server selection to time out.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks._common import BACKEND_DIR
+
+# TEST-NET-1 address: connections hang until the driver gives up
+UNREACHABLE_URI = 'mongodb://192.0.2.1:27017/?directConnection=true'
+
+CASES = [
+    # Django imports the URLconf (and with it every view and service) on the first request
+    ('WSGI worker boot + URLconf', [sys.executable, '-c',
+                                    'import hrms.wsgi; from django.urls import get_resolver; get_resolver().url_patterns']),
+    ('manage.py check', [sys.executable, 'manage.py', 'check']),
+    ('manage.py import_employees --help', [sys.executable, 'manage.py', 'import_employees', '--help']),
+]
+
+
+def run(command, env):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clusters = [('configured', os.environ.get('MONGO_URI', '')), ('unreachable', UNREACHABLE_URI)]
+    for label, command in CASES:
+        for cluster, uri in clusters:
+            env = dict(os.environ, MONGO_URI=uri, DJANGO_SETTINGS_MODULE='hrms.settings')
+            samples = [run(command, env) for _ in range(runs)]
+            print(f"{label:<36} {cluster:<12} mean {statistics.mean(samples) * 1000:8.0f} ms   "
+                  f"min {min(samples) * 1000:8.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
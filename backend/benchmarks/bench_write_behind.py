@@ -0,0 +1,123 @@
+"""
+Benchmark: a clock-in burst against POST /api/attendance/, written directly
+to MongoDB and through the write-behind buffer (ATTENDANCE_WRITE_BEHIND).
+
+`count` employees each record attendance once, from `concurrency` threads
+through the full Django stack. For each mode it prints request latency,
+requests/second, the time until every record is in MongoDB and the number
+of MongoDB writes that took (one insert per record directly, one bulk_write
+per flushed batch with the buffer). The journal is a scratch file in the
+temp directory. The seeded records have native dates, so the run sets
+ATTENDANCE_LEGACY_DATES=False, which the buffer requires.
+
+Against mongomock there is no network round trip to save, so the direct
+path is flattered; run against a real cluster for representative numbers.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set, or
+BENCH_MONGOMOCK=1):
+    python -m benchmarks.bench_write_behind [count] [concurrency]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from benchmarks._common import report, setup_django
+
+os.environ.setdefault('ATTENDANCE_LEGACY_DATES', 'False')
+setup_django()
+
+from rest_framework.test import APIClient  # noqa: E402
+from hrms.mongodb import mongodb  # noqa: E402
+from employees.services import EmployeeService  # noqa: E402
+from attendance.services import AttendanceService, attendance_buffer  # noqa: E402
+
+PREFIX = 'BENCH-WB-'
+
+
+def seed_employees(count):
+    mongodb.get_collection(EmployeeService.COLLECTION_NAME).insert_many([
+        {
+            'employee_id': f'{PREFIX}{i:06d}',
+            'full_name': f'Bench Employee {i}',
+            'email': f'bench.wb.{i}@example.com',
+            'department': f'Dept {i % 10}',
+            'created_at': datetime.utcnow(),
+        }
+        for i in range(count)
+    ])
+    return [f'{PREFIX}{i:06d}' for i in range(count)]
+
+
+def cleanup():
+    query = {'employee_id': {'$regex': f'^{PREFIX}'}}
+    mongodb.get_collection(EmployeeService.COLLECTION_NAME).delete_many(query)
+    mongodb.get_collection(AttendanceService.COLLECTION_NAME).delete_many(query)
+
+
+def stored(day):
+    return mongodb.get_collection(AttendanceService.COLLECTION_NAME).count_documents(
+        {'employee_id': {'$regex': f'^{PREFIX}'}, 'date': datetime(day.year, day.month, day.day)}
+    )
+
+
+def burst(employee_ids, day, concurrency):
+    """POST one record per employee from `concurrency` threads; returns (latencies ms, seconds)."""
+    chunks = [employee_ids[i::concurrency] for i in range(concurrency)]
+
+    def post_all(chunk):
+        api = APIClient()
+        samples = []
+        for employee_id in chunk:
+            start = time.perf_counter()
+            response = api.post('/api/attendance/', {
+                'employee_id': employee_id, 'date': day.isoformat(), 'status': 'Present',
+            }, format='json')
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code in (201, 202), response.content
+        return samples
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = [sample for chunk in pool.map(post_all, chunks) for sample in chunk]
+    return samples, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    EmployeeService.ensure_indexes()
+    AttendanceService.ensure_indexes()
+    cleanup()
+    employee_ids = seed_employees(count)
+
+    # Count the bulk writes the flusher makes
+    flushes = []
+    flush = attendance_buffer.flush
+    attendance_buffer.flush = lambda: flushes.append(flush()) or flushes[-1]
+    attendance_buffer.path = os.path.join(tempfile.mkdtemp(prefix='hrms-bench-wb-'), 'journal.sqlite3')
+    attendance_buffer.max_pending = max(attendance_buffer.max_pending, count)
+    try:
+        for offset, (label, enabled) in enumerate([('direct', False), ('write-behind', True)]):
+            day = date.today() - timedelta(days=offset + 1)
+            attendance_buffer.enabled = enabled
+            flushes.clear()
+            start = time.perf_counter()
+            samples, elapsed = burst(employee_ids, day, concurrency)
+            while stored(day) < count:
+                time.sleep(0.01)
+            settled = time.perf_counter() - start
+            attendance_buffer.stop()
+            writes = sum(1 for claimed in flushes if claimed) if enabled else count
+            print(f"[{label}] {count} requests in {elapsed:.2f} s -> {count / elapsed:.1f} req/s, "
+                  f"all in MongoDB after {settled:.2f} s, {writes} MongoDB writes")
+            report(f"{label} latency", samples)
+    finally:
+        attendance_buffer.stop()
+        cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Load test: requests/second and latency per worker, WSGI vs ASGI.
+
+Fires `requests` GETs at `concurrency` in flight against one or more
+running servers and prints throughput and latency percentiles for each.
+Start one single-worker server per stack first, e.g.:
+
+    gunicorn hrms.wsgi:application --workers 1 --threads 4 --bind 127.0.0.1:8001
+    uvicorn hrms.asgi:application --workers 1 --port 8002
+
+    python -m benchmarks.load_concurrency /api/employees/?limit=50 \
+        --target wsgi=http://127.0.0.1:8001 --target asgi=http://127.0.0.1:8002 \
+        --concurrency 64 --requests 2000
+"""
+import argparse
+import http.client
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmarks._common import report
+
+
+def _worker(base_url, path, count, samples, errors):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+            continue
+        samples.append((time.perf_counter() - start) * 1000)
+    conn.close()
+
+
+def run(label, base_url, path, concurrency, total):
+    samples = []
+    errors = []
+    per_worker = max(total // concurrency, 1)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(_worker, base_url, path, per_worker, samples, errors)
+    elapsed = time.perf_counter() - start
+    print(f"[{label}] {len(samples)} ok, {len(errors)} errors in {elapsed:.2f} s -> {len(samples) / elapsed:.1f} req/s")
+    if samples:
+        report(f"{label} latency", samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help="Request path, e.g. /api/employees/")
+    parser.add_argument('--target', action='append', required=True, help="label=http://host:port")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    for target in args.target:
+        label, _, base_url = target.partition('=')
+        run(label, base_url, args.path, args.concurrency, args.requests)
+
+
+if __name__ == '__main__':
+    main()
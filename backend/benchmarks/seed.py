@@ -0,0 +1,137 @@
+"""
+Synthetic data for benchmarks.
+
+Seeds `employees` employees spread over `departments` departments and one
+attendance record per employee per day for the last `days` days (ending
+today, so the dashboard has data). Documents use the current storage
+schema and are written in unordered insert_many batches generated on the
+fly, so memory stays flat even for tens of millions of attendance rows.
+All seeded employee_ids start with PREFIX; cleanup() removes them again.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set):
+    python -m benchmarks.seed --employees 100000 --days 365
+    python -m benchmarks.seed --cleanup
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks._common import setup_django
+
+setup_django()
+
+from hrms.mongodb import mongodb  # noqa: E402
+from employees.services import EmployeeService  # noqa: E402
+from attendance.services import AttendanceService  # noqa: E402
+from employees import search  # noqa: E402
+from attendance import schema  # noqa: E402
+
+PREFIX = 'BENCH-'
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def employee_id(index):
+    return f'{PREFIX}{index:07d}'
+
+
+def department(index, departments):
+    return f'Dept {index % departments:03d}'
+
+
+def _employee_docs(employees, departments):
+    now = datetime.utcnow()
+    for index in range(employees):
+        employee = {
+            'employee_id': employee_id(index),
+            'full_name': f'Bench Employee {index}',
+            'email': f'bench.{index}@example.com',
+            'department': department(index, departments),
+            # Distinct timestamps keep the (created_at, _id) page order stable
+            'created_at': now - timedelta(milliseconds=index),
+        }
+        employee.update(search.search_fields(employee))
+        yield employee
+
+
+def _attendance_docs(employees, days, departments, rng):
+    today = date.today()
+    now = datetime.utcnow()
+    for offset in range(days):
+        day = schema.to_storage_date(today - timedelta(days=offset))
+        for index in range(employees):
+            yield {
+                'employee_id': employee_id(index),
+                'employee_name': f'Bench Employee {index}',
+                'employee_email': f'bench.{index}@example.com',
+                'employee_department': department(index, departments),
+                'date': day,
+                'status': 'Present' if rng.random() < 0.9 else 'Absent',
+                'created_at': now,
+                'schema_version': schema.SCHEMA_VERSION,
+            }
+
+
+def _insert_batches(collection, docs, batch_size, label, total):
+    batch = []
+    written = 0
+    start = time.perf_counter()
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            written += len(batch)
+            batch = []
+            if written % (batch_size * 10) == 0:
+                print(f"  {label}: {written}/{total} ({written / (time.perf_counter() - start):.0f} docs/s)")
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        written += len(batch)
+    return written
+
+
+def seed(employees=1000, days=30, departments=10, batch_size=DEFAULT_BATCH_SIZE, random_seed=42):
+    """Create indexes and insert the synthetic data set. Returns its size."""
+    EmployeeService.ensure_indexes()
+    AttendanceService.ensure_indexes()
+    rng = random.Random(random_seed)
+
+    start = time.perf_counter()
+    _insert_batches(
+        mongodb.get_collection(EmployeeService.COLLECTION_NAME),
+        _employee_docs(employees, departments), batch_size, 'employees', employees,
+    )
+    _insert_batches(
+        mongodb.get_collection(AttendanceService.COLLECTION_NAME),
+        _attendance_docs(employees, days, departments, rng), batch_size, 'attendance', employees * days,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Seeded {employees} employees and {employees * days} attendance records in {elapsed:.1f} s")
+    return {'employees': employees, 'attendance': employees * days, 'days': days, 'departments': departments}
+
+
+def cleanup():
+    """Remove every seeded employee and attendance record (and anything written for them)."""
+    query = {'employee_id': {'$regex': f'^{PREFIX}'}}
+    mongodb.get_collection(EmployeeService.COLLECTION_NAME).delete_many(query)
+    mongodb.get_collection(AttendanceService.COLLECTION_NAME).delete_many(query)
+    mongodb.get_collection(AttendanceService.ARCHIVE_COLLECTION_NAME).delete_many(query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30, help="Attendance days per employee")
+    parser.add_argument('--departments', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--cleanup', action='store_true', help="Only remove previously seeded data")
+    args = parser.parse_args()
+
+    cleanup()
+    if not args.cleanup:
+        seed(args.employees, args.days, args.departments, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
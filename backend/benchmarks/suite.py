@@ -0,0 +1,348 @@
+"""
+Benchmark suite: latency percentiles and throughput for every API view and
+every EmployeeService / AttendanceService method, on a synthetic data set.
+
+Views are driven through the full Django stack (middleware, conditional
+GET, rendering) with the test client; services are called directly. Write
+cases use employees created for the purpose, so the seeded data set stays
+the same for every read. Results are saved as JSON and can be compared
+with an earlier run to spot regressions between commits.
+
+Usage (from backend/, MONGO_URI and a scratch MONGO_DB_NAME set, or
+BENCH_MONGOMOCK=1 for an in-process stand-in):
+    python -m benchmarks.suite --employees 10000 --days 90 --output before.json
+    python -m benchmarks.suite --skip-seed --output after.json --compare before.json
+    python -m benchmarks.suite --only 'attendance\\.' --iterations 200
+
+Cases whose cost grows with the whole data set (full listings) are marked
+heavy and run a tenth of the iterations.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+from benchmarks._common import BACKEND_DIR, setup_django, summarize
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from hrms.mongodb import mongodb  # noqa: E402
+from employees.services import EmployeeService  # noqa: E402
+from attendance.services import AttendanceService  # noqa: E402
+from attendance.reports import AttendanceReportService  # noqa: E402
+from benchmarks import seed  # noqa: E402
+
+WRITE_PREFIX = f'{seed.PREFIX}W-'
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 5
+
+# Default ratio of new/old p50 reported as a regression by --compare
+DEFAULT_THRESHOLD = 1.10
+
+
+class Case:
+    """One benchmark: `call` is timed; `prepare(n)` runs untimed before it."""
+
+    def __init__(self, name, call, heavy=False, prepare=None):
+        self.name = name
+        self.call = call
+        self.heavy = heavy
+        self.prepare = prepare
+
+
+class Writes:
+    """
+    Unique values for write cases, employees that attendance is written for,
+    and pools of employees to delete. Everything uses WRITE_PREFIX ids so the
+    seeded data set is never modified.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+        self._days = itertools.count()
+        self.pool = []
+        self.writers = []
+
+    def name(self):
+        return f'Write Employee {next(self._counter)}'
+
+    def employee(self):
+        n = next(self._counter)
+        return {
+            'employee_id': f'{WRITE_PREFIX}{n:07d}',
+            'full_name': f'Write Employee {n}',
+            'email': f'bench.write.{n}@example.com',
+            'department': 'Dept W',
+        }
+
+    def day(self):
+        # Far in the past so writes never collide with the seeded days
+        return date(1990, 1, 1) + timedelta(days=next(self._days))
+
+    def insert_employees(self, count):
+        """Insert `count` employees directly (untimed); returns [{'id', 'employee_id'}]."""
+        employees = [self.employee() for _ in range(count)]
+        for employee in employees:
+            employee['created_at'] = datetime.utcnow()
+        result = mongodb.get_collection(EmployeeService.COLLECTION_NAME).insert_many(employees)
+        return [
+            {'id': str(object_id), 'employee_id': employee['employee_id']}
+            for object_id, employee in zip(result.inserted_ids, employees)
+        ]
+
+    def fill_pool(self, count):
+        """Create `count` employees for delete cases."""
+        self.pool = self.insert_employees(count)
+
+    def add_writers(self, count, days):
+        """Create employees to write attendance for; the first gets `days` days of history."""
+        self.writers = self.insert_employees(count)
+        AttendanceService.create_many([
+            {'employee_id': self.writers[0]['employee_id'], 'date': date.today() - timedelta(days=offset), 'status': 'Present'}
+            for offset in range(min(days, AttendanceService.MAX_BULK_ITEMS))
+        ])
+
+    def attendance(self, count):
+        """`count` new attendance items for the writer employees."""
+        return [
+            {'employee_id': self.writers[i % len(self.writers)]['employee_id'], 'date': self.day(), 'status': 'Present'}
+            for i in range(count)
+        ]
+
+    def take(self, count=1):
+        taken, self.pool = self.pool[:count], self.pool[count:]
+        return taken
+
+
+def build_cases(dataset):
+    """Return the list of cases for a data set of dataset['employees'] employees."""
+    client = APIClient(SERVER_NAME='localhost')
+    writes = Writes()
+    writes.add_writers(100, dataset['days'])
+    writer = writes.writers[0]
+    today = date.today()
+    last_month = (today - timedelta(days=30)).isoformat()
+    closed_to = (today - timedelta(days=1)).isoformat()
+    closed_from = (today - timedelta(days=31)).isoformat()
+    sample_ids = [seed.employee_id(i) for i in range(0, dataset['employees'], max(dataset['employees'] // 100, 1))][:100]
+    employee_id = sample_ids[len(sample_ids) // 2]
+    employee_oid = EmployeeService.get_by_employee_id(employee_id)['id']
+    cursor = EmployeeService.get_page(50)['next']
+
+    def get(path):
+        return lambda: client.get(path)
+
+    def csv_upload():
+        rows = ['employee_id,full_name,email,department']
+        for _ in range(100):
+            e = writes.employee()
+            rows.append(f"{e['employee_id']},{e['full_name']},{e['email']},{e['department']}")
+        upload = SimpleUploadedFile('bench.csv', '\n'.join(rows).encode())
+        return client.post('/api/employees/import/', {'file': upload}, format='multipart')
+
+    def serialized(items):
+        return [{**item, 'date': item['date'].isoformat()} for item in items]
+
+    def pool(count):
+        return lambda n: writes.fill_pool(n * count)
+
+    return [
+        # employees/views.py
+        Case('view.employee_list_create.GET', get('/api/employees/'), heavy=True),
+        Case('view.employee_list_create.GET.page', get('/api/employees/?limit=50')),
+        Case('view.employee_list_create.GET.next_page', get(f'/api/employees/?limit=50&after={cursor}')),
+        # Narrow (a name), broad (a whole department) and identifier-prefix searches
+        Case('view.employee_search.name', get(f"/api/employees/search/?{urlencode({'q': 'bench employee 42'})}")),
+        Case('view.employee_search.department',
+             get(f"/api/employees/search/?{urlencode({'q': seed.department(1, dataset['departments'])})}")),
+        Case('view.employee_search.employee_id', get(f"/api/employees/search/?{urlencode({'q': employee_id[:-2]})}")),
+        Case('view.employee_list_create.POST', lambda: client.post('/api/employees/', writes.employee(), format='json')),
+        Case('view.import_employees_view.100_rows', csv_upload),
+        Case('view.employee_detail.PATCH',
+             lambda: client.patch(f"/api/employees/{writer['id']}/", {'full_name': writes.name()}, format='json')),
+        Case('view.employee_detail.DELETE',
+             lambda: client.delete(f"/api/employees/{writes.take()[0]['id']}/"), prepare=pool(1)),
+        Case('view.bulk_delete_employees.10',
+             lambda: client.post('/api/employees/bulk-delete/', {'ids': [e['id'] for e in writes.take(10)]}, format='json'),
+             prepare=pool(10)),
+        # attendance/views.py
+        Case('view.create_attendance',
+             lambda: client.post('/api/attendance/', serialized(writes.attendance(1))[0], format='json')),
+        Case('view.bulk_create_attendance.100',
+             lambda: client.post('/api/attendance/bulk/', {'records': serialized(writes.attendance(100))}, format='json')),
+        Case('view.get_employee_attendance', get(f'/api/attendance/{employee_id}/')),
+        Case('view.get_employee_attendance.range', get(f'/api/attendance/{employee_id}/?from={last_month}&to={today.isoformat()}')),
+        Case('view.get_employee_attendance.summary', get(f'/api/attendance/{employee_id}/?summary=true')),
+        Case('view.list_all_attendance.date', get(f'/api/attendance/all/?date={today.isoformat()}')),
+        Case('view.list_all_attendance.date.stream',
+             lambda: b''.join(client.get(f'/api/attendance/all/?date={today.isoformat()}&stream=true').streaming_content)),
+        Case('view.list_all_attendance', get('/api/attendance/all/'), heavy=True),
+        Case('view.attendance_report.open', get(f'/api/attendance/report/?from={last_month}&to={today.isoformat()}')),
+        Case('view.attendance_report.closed', get(f'/api/attendance/report/?from={closed_from}&to={closed_to}')),
+        Case('view.dashboard_stats', get('/api/dashboard/')),
+        # EmployeeService
+        Case('EmployeeService.get_all', EmployeeService.get_all, heavy=True),
+        Case('EmployeeService.get_page', lambda: EmployeeService.get_page(50)),
+        Case('EmployeeService.search', lambda: EmployeeService.search(employee_id, 50)),
+        Case('EmployeeService.get_by_id', lambda: EmployeeService.get_by_id(employee_oid)),
+        Case('EmployeeService.get_by_employee_id', lambda: EmployeeService.get_by_employee_id(employee_id)),
+        Case('EmployeeService.get_many_by_employee_ids.100', lambda: EmployeeService.get_many_by_employee_ids(sample_ids)),
+        Case('EmployeeService.count', EmployeeService.count),
+        Case('EmployeeService.create', lambda: EmployeeService.create(writes.employee())),
+        Case('EmployeeService.bulk_create.100', lambda: EmployeeService.bulk_create([writes.employee() for _ in range(100)])),
+        Case('EmployeeService.update', lambda: EmployeeService.update(writer['id'], {'full_name': writes.name()})),
+        Case('EmployeeService.delete', lambda: EmployeeService.delete(writes.take()[0]['id']), prepare=pool(1)),
+        Case('EmployeeService.delete_many.10',
+             lambda: EmployeeService.delete_many([e['id'] for e in writes.take(10)]), prepare=pool(10)),
+        # AttendanceService
+        Case('AttendanceService.create', lambda: AttendanceService.create(writes.attendance(1)[0])),
+        Case('AttendanceService.create_many.100', lambda: AttendanceService.create_many(writes.attendance(100))),
+        Case('AttendanceService.get_all.date', lambda: AttendanceService.get_all(today.isoformat())),
+        Case('AttendanceService.iter_all.date', lambda: sum(1 for _ in AttendanceService.iter_all(today.isoformat()))),
+        Case('AttendanceService.get_by_employee', lambda: AttendanceService.get_by_employee(employee_id)),
+        Case('AttendanceService.get_summary', lambda: AttendanceService.get_summary(employee_id)),
+        Case('AttendanceService.status_counts', lambda: AttendanceService.status_counts(today.isoformat())),
+        Case('AttendanceService.count_by_status', lambda: AttendanceService.count_by_status(today.isoformat(), 'Present')),
+        Case('AttendanceService.count_for_employees.100', lambda: AttendanceService.count_for_employees(sample_ids)),
+        Case('AttendanceService.refresh_employee_copies', lambda: AttendanceService.refresh_employee_copies(writer['employee_id'])),
+        Case('AttendanceService.remove_for_employees',
+             lambda: AttendanceService.remove_for_employees([e['employee_id'] for e in writes.take()]), prepare=pool(1)),
+        Case('AttendanceReportService.department_matrix',
+             lambda: AttendanceReportService.department_matrix(last_month, today.isoformat())),
+    ]
+
+
+def run_case(case, iterations, warmup):
+    """Warm up, then time `iterations` calls; returns the summary with throughput."""
+    if case.heavy:
+        iterations = max(iterations // 10, 3)
+        warmup = min(warmup, 1)
+    if case.prepare:
+        case.prepare(iterations + warmup)
+    for _ in range(warmup):
+        case.call()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        case.call()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+    stats = summarize(samples)
+    stats['ops_per_s'] = iterations / elapsed if elapsed else 0.0
+    return stats
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline_path, threshold):
+    """Print p50 changes against a previous results file; returns the regressed case names."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline['meta']['revision']} ({baseline_path}), p50:")
+    if baseline['meta']['dataset'] != results['meta']['dataset'] or baseline['meta']['backend'] != results['meta']['backend']:
+        print("(note: the data set or backend differs from the baseline run)")
+    regressions = []
+    for name, stats in results['cases'].items():
+        old = baseline['cases'].get(name)
+        if not old:
+            continue
+        ratio = stats['p50_ms'] / old['p50_ms'] if old['p50_ms'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<50} {old['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms  ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30, help="Attendance days per employee")
+    parser.add_argument('--departments', type=int, default=10)
+    parser.add_argument('--skip-seed', action='store_true', help="Reuse data left by an earlier --keep run")
+    parser.add_argument('--keep', action='store_true', help="Leave the seeded data in place afterwards")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--only', help="Regular expression selecting case names")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<revision>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare p50 latencies with")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="p50 ratio reported as a regression")
+    args = parser.parse_args()
+
+    if args.skip_seed:
+        seeded = mongodb.get_collection(EmployeeService.COLLECTION_NAME).count_documents(
+            {'employee_id': {'$regex': f'^{seed.PREFIX}\\d'}}
+        )
+        dataset = {'employees': seeded, 'days': args.days, 'departments': args.departments}
+        print(f"Reusing {seeded} seeded employees (--days/--departments should match the seeding run)")
+        if not seeded:
+            sys.exit("No seeded data found; run without --skip-seed (or python -m benchmarks.seed --employees N) first")
+    else:
+        seed.cleanup()
+        dataset = seed.seed(args.employees, args.days, args.departments)
+
+    revision = git_revision()
+    results = {
+        'meta': {
+            'revision': revision,
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'python': platform.python_version(),
+            'backend': 'mongomock' if os.getenv('BENCH_MONGOMOCK') == '1' else settings.MONGO_DB_NAME,
+            'dataset': dataset,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'cases': {},
+    }
+
+    try:
+        for case in build_cases(dataset):
+            if args.only and not re.search(args.only, case.name):
+                continue
+            stats = run_case(case, args.iterations, args.warmup)
+            results['cases'][case.name] = stats
+            print(
+                f"{case.name:<50} p50 {stats['p50_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms   "
+                f"p99 {stats['p99_ms']:9.3f} ms   {stats['ops_per_s']:9.1f} ops/s"
+            )
+    finally:
+        if args.keep:
+            # Drop only what the write cases added
+            query = {'employee_id': {'$regex': f'^{WRITE_PREFIX}'}}
+            mongodb.get_collection(EmployeeService.COLLECTION_NAME).delete_many(query)
+            mongodb.get_collection(AttendanceService.COLLECTION_NAME).delete_many(query)
+        else:
+            seed.cleanup()
+
+    output = args.output or os.path.join(BACKEND_DIR, 'benchmarks', 'results', f'{revision}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Async variants of the EmployeeService read paths, backed by Motor.
+Used by the async views served from the ASGI application.
+"""
+import logging
+from hrms.mongodb_async import async_mongodb
+from hrms.pagination import encode_cursor, keyset_filter
+from .services import EMPLOYEE_FORMAT, EmployeeService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEmployeeService:
+    """Async service class for Employee reads using Motor."""
+
+    COLLECTION_NAME = EmployeeService.COLLECTION_NAME
+
+    @staticmethod
+    async def get_all():
+        """Get all employees."""
+        try:
+            collection = async_mongodb.get_collection(AsyncEmployeeService.COLLECTION_NAME)
+            cursor = collection.find({}, EMPLOYEE_FORMAT.projection).sort(EmployeeService.LIST_SORT)
+            employees = [EMPLOYEE_FORMAT(emp) async for emp in cursor]
+            logger.debug("Retrieved %s employees", len(employees))
+            return employees
+        except Exception as e:
+            logger.exception("Error retrieving employees: %s", e)
+            raise Exception(f"Database query error: {str(e)}")
+
+    @staticmethod
+    async def get_page(limit, after=None):
+        """Get one page of employees, newest first, using keyset pagination."""
+        query = keyset_filter(after) if after else {}
+
+        try:
+            collection = async_mongodb.get_collection(AsyncEmployeeService.COLLECTION_NAME)
+            employees = await collection.find(query, EMPLOYEE_FORMAT.projection).sort(EmployeeService.LIST_SORT).limit(limit + 1).to_list(length=limit + 1)
+        except Exception as e:
+            logger.exception("Error retrieving employee page: %s", e)
+            raise Exception(f"Database query error: {str(e)}")
+
+        next_cursor = None
+        if len(employees) > limit:
+            employees = employees[:limit]
+            last = employees[-1]
+            next_cursor = encode_cursor(last['created_at'], last['_id'])
+
+        return {'results': EMPLOYEE_FORMAT.many(employees), 'next': next_cursor}
+
+    @staticmethod
+    async def get_by_employee_id(employee_id):
+        """Get employee by employee_id field."""
+        collection = async_mongodb.get_collection(AsyncEmployeeService.COLLECTION_NAME)
+        employee = await collection.find_one({'employee_id': employee_id}, EMPLOYEE_FORMAT.projection)
+        return EMPLOYEE_FORMAT(employee) if employee else None
+
+    @staticmethod
+    async def count():
+        """Get total count of employees."""
+        collection = async_mongodb.get_collection(AsyncEmployeeService.COLLECTION_NAME)
+        return await collection.estimated_document_count()
@@ -0,0 +1,45 @@
+"""
+Async employee views served by the ASGI application (see hrms/urls_async.py).
+Non-GET methods are delegated to the synchronous DRF views.
+"""
+import logging
+from asgiref.sync import sync_to_async
+from hrms.async_http import async_csrf_exempt, json_response
+from hrms.conditional import conditional_get
+from hrms.pagination import parse_limit
+from . import views
+from .async_services import AsyncEmployeeService
+
+logger = logging.getLogger(__name__)
+
+_employee_list_create = sync_to_async(views.employee_list_create)
+
+
+@async_csrf_exempt
+@conditional_get('employees', cache=True)
+async def employee_list_create(request):
+    """
+    GET /api/employees/ - Get all employees (async)
+    GET /api/employees/?limit=50&after=<cursor> - Get one page of employees (async)
+    POST /api/employees/ - Create a new employee (sync view)
+    """
+    if request.method != 'GET':
+        return await _employee_list_create(request)
+
+    if 'limit' in request.GET or 'after' in request.GET:
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            page = await AsyncEmployeeService.get_page(limit, after=request.GET.get('after') or None)
+            return json_response(page)
+        except ValueError as e:
+            return json_response({"error": str(e)}, status=400)
+        except Exception as e:
+            logger.exception("GET /api/employees/ - Failed to fetch employee page: %s", e)
+            return json_response({"error": f"Failed to fetch employees: {str(e)}"}, status=500)
+
+    try:
+        employees = await AsyncEmployeeService.get_all()
+        return json_response(employees)
+    except Exception as e:
+        logger.exception("GET /api/employees/ - Failed to fetch employees: %s", e)
+        return json_response({"error": f"Failed to fetch employees: {str(e)}"}, status=500)
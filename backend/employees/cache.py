@@ -0,0 +1,185 @@
+"""
+In-process cache of employee records keyed by employee_id.
+
+Attendance writes and reads only need an employee's name, email and
+department, so they look employees up here instead of querying MongoDB
+every time. Entries are bounded by an LRU size and a TTL. Hits, misses and
+the number of entries are exported at /metrics (hrms_employee_cache_*).
+
+With EMPLOYEE_CACHE_CONSISTENCY = "version" the cache also follows a
+version stamp in MongoDB (see hrms.versions): every invalidation bumps it,
+and each process drops its entries when it sees a newer version, so other
+workers stop serving a changed employee within
+EMPLOYEE_CACHE_VERSION_CHECK_SECONDS. With "local" only the process that
+made the change is invalidated and other workers rely on the TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from hrms import versions
+from hrms.metrics import EMPLOYEE_CACHE_ENTRIES, EMPLOYEE_CACHE_REQUESTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_LOCAL = 'local'
+CONSISTENCY_VERSION = 'version'
+
+# Version stamp shared by all processes caching employees
+VERSION_NAME = 'employee_directory'
+
+
+class EmployeeDirectoryCache:
+    """Thread-safe LRU + TTL cache of employee dicts keyed by employee_id."""
+
+    def __init__(self, loader, bulk_loader, max_size, ttl_seconds,
+                 consistency=CONSISTENCY_LOCAL, version_check_seconds=5):
+        self._loader = loader
+        self._bulk_loader = bulk_loader
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.consistency = consistency
+        self.version_check_seconds = version_check_seconds
+        self._entries = OrderedDict()  # employee_id -> (expires_at, employee)
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @property
+    def staleness_seconds(self):
+        """How long another process may keep serving an employee after it changed."""
+        if not self.enabled:
+            return 0
+        if self.consistency == CONSISTENCY_VERSION:
+            return min(self.version_check_seconds, self.ttl_seconds)
+        return self.ttl_seconds
+
+    def get(self, employee_id):
+        """Return the employee for employee_id, loading it on a miss (None if unknown)."""
+        if not self.enabled:
+            return self._loader(employee_id)
+
+        self._sync_version()
+        employee = self._lookup(employee_id)
+        if employee is not None:
+            return employee
+
+        employee = self._loader(employee_id)
+        if employee is not None:
+            self._store(employee_id, employee)
+        return employee
+
+    def get_many(self, employee_ids):
+        """Return {employee_id: employee} for the known ids, loading misses in one query."""
+        if not self.enabled:
+            return self._bulk_loader(employee_ids)
+
+        self._sync_version()
+        found = {}
+        missing = []
+        for employee_id in employee_ids:
+            employee = self._lookup(employee_id)
+            if employee is not None:
+                found[employee_id] = employee
+            else:
+                missing.append(employee_id)
+
+        if missing:
+            loaded = self._bulk_loader(missing)
+            for employee_id, employee in loaded.items():
+                self._store(employee_id, employee)
+            found.update(loaded)
+        return found
+
+    def invalidate(self, employee_id):
+        """Drop one employee here and, in version mode, in every other process."""
+        with self._lock:
+            self._entries.pop(employee_id, None)
+            EMPLOYEE_CACHE_ENTRIES.set(len(self._entries))
+        if self.consistency == CONSISTENCY_VERSION:
+            try:
+                version = versions.bump_version(VERSION_NAME)
+            except Exception as e:
+                logger.warning("Could not bump employee cache version: %s", e)
+                return
+            if self._version is None or version != self._version + 1:
+                # Another process bumped it since this one last looked, and
+                # the employee it changed may be cached here
+                self.clear()
+            self._version = version
+
+    def clear(self):
+        """Drop every cached employee in this process."""
+        with self._lock:
+            self._entries.clear()
+            EMPLOYEE_CACHE_ENTRIES.set(0)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _lookup(self, employee_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(employee_id)
+                self.hits += 1
+                EMPLOYEE_CACHE_REQUESTS.labels('hit').inc()
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[employee_id]
+            self.misses += 1
+        EMPLOYEE_CACHE_REQUESTS.labels('miss').inc()
+        return None
+
+    def _store(self, employee_id, employee):
+        with self._lock:
+            self._entries[employee_id] = (time.monotonic() + self.ttl_seconds, dict(employee))
+            self._entries.move_to_end(employee_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            EMPLOYEE_CACHE_ENTRIES.set(len(self._entries))
+
+    def _sync_version(self):
+        """In version mode, drop all entries when another process bumped the stamp."""
+        if self.consistency != CONSISTENCY_VERSION:
+            return
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_seconds:
+            return
+        self._version_checked_at = now
+        try:
+            current = versions.get_version(VERSION_NAME)
+        except Exception as e:
+            logger.warning("Could not read employee cache version: %s", e)
+            return
+        if self._version is not None and current != self._version:
+            self.clear()
+        self._version = current
+
+
+def build_cache(loader, bulk_loader):
+    """Create the employee directory cache from settings."""
+    return EmployeeDirectoryCache(
+        loader,
+        bulk_loader,
+        max_size=settings.EMPLOYEE_CACHE_SIZE,
+        ttl_seconds=settings.EMPLOYEE_CACHE_TTL_SECONDS,
+        consistency=settings.EMPLOYEE_CACHE_CONSISTENCY,
+        version_check_seconds=settings.EMPLOYEE_CACHE_VERSION_CHECK_SECONDS,
+    )
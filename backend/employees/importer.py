@@ -0,0 +1,138 @@
+"""
+Streaming bulk import of employees from CSV or NDJSON.
+
+Input is read row by row and processed in fixed-size chunks: every chunk
+is validated with EmployeeSerializer, pre-checked for duplicates with one
+$in query and written with one unordered insert_many. Memory use depends
+on the chunk size and the error cap, not on the size of the file.
+"""
+import csv
+import io
+import json
+import logging
+from .serializers import EmployeeSerializer
+from .services import EmployeeService
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Row-level errors kept in the report; further errors are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename):
+    """Guess the import format from a file name, defaulting to CSV."""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')):
+        return FORMAT_NDJSON
+    return FORMAT_CSV
+
+
+def iter_rows(binary_stream, fmt):
+    """
+    Yield (row_number, row) pairs from a binary stream.
+    Rows that cannot be parsed are yielded as (row_number, ValueError).
+    """
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    if fmt == FORMAT_CSV:
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, row
+    elif fmt == FORMAT_NDJSON:
+        row_number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, ValueError(f"Invalid JSON: {str(e)}")
+                continue
+            if not isinstance(row, dict):
+                yield row_number, ValueError("Each line must be a JSON object")
+                continue
+            yield row_number, row
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+
+class ImportReport:
+    """Accumulates import totals and a capped list of row-level errors."""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            employee_id = row.get('employee_id') if isinstance(row, dict) else None
+            self.errors.append({'row': row_number, 'employee_id': employee_id, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'total_rows': self.total_rows,
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def _flush(chunk, report):
+    """Validate and insert one chunk of (row_number, row) pairs."""
+    valid = []
+    valid_rows = []
+    rejected = []
+    for row_number, row in chunk:
+        serializer = EmployeeSerializer(data=row)
+        if serializer.is_valid():
+            valid.append(dict(serializer.validated_data))
+            valid_rows.append((row_number, row))
+        else:
+            rejected.append((row_number, row, serializer.errors))
+
+    created, errors = EmployeeService.bulk_create(valid)
+    report.created += created
+    for position, message in errors:
+        row_number, row = valid_rows[position]
+        rejected.append((row_number, row, {'non_field_errors': [message]}))
+
+    rejected.sort(key=lambda item: item[0])
+    for row_number, row, row_errors in rejected:
+        report.add_error(row_number, row, row_errors)
+
+
+def import_employees(binary_stream, fmt, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None):
+    """
+    Import employees from a CSV/NDJSON binary stream.
+    Returns the report dict; on_progress(report) is called after each chunk.
+    """
+    report = ImportReport()
+    chunk = []
+    for row_number, row in iter_rows(binary_stream, fmt):
+        report.total_rows += 1
+        if isinstance(row, ValueError):
+            report.add_error(row_number, None, {'non_field_errors': [str(row)]})
+            continue
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            _flush(chunk, report)
+            chunk = []
+            if on_progress:
+                on_progress(report)
+    if chunk:
+        _flush(chunk, report)
+        if on_progress:
+            on_progress(report)
+
+    logger.info("Employee import finished: %s created, %s failed of %s rows", report.created, report.failed, report.total_rows)
+    return report.as_dict()
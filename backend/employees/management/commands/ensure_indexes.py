@@ -0,0 +1,26 @@
+"""
+Create the MongoDB indexes used by the employee and attendance services
+and the background job store.
+
+Run once per deploy (it is idempotent):
+    python manage.py ensure_indexes
+"""
+from django.core.management.base import BaseCommand, CommandError
+from hrms import background
+from employees.services import EmployeeService
+from attendance.services import AttendanceService
+from attendance.reports import AttendanceReportService
+
+
+class Command(BaseCommand):
+    help = "Create MongoDB indexes for the employees, attendance, attendance_reports and background_jobs collections."
+
+    def handle(self, *args, **options):
+        for service in (EmployeeService, AttendanceService, AttendanceReportService, background):
+            try:
+                names = service.ensure_indexes()
+            except Exception as e:
+                raise CommandError(f"Failed to create indexes on '{service.COLLECTION_NAME}': {str(e)}")
+            for name in names:
+                self.stdout.write(f"{service.COLLECTION_NAME}: {name}")
+        self.stdout.write(self.style.SUCCESS("Indexes are up to date."))
@@ -0,0 +1,45 @@
+"""
+Bulk import employees from a CSV or NDJSON file.
+
+    python manage.py import_employees staff.csv
+    python manage.py import_employees staff.ndjson --chunk-size 2000 --report report.json
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from employees.importer import DEFAULT_CHUNK_SIZE, FORMATS, detect_format, import_employees
+
+
+class Command(BaseCommand):
+    help = "Stream-import employees from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV (with header row) or NDJSON file")
+        parser.add_argument('--type', choices=FORMATS, help="Input format (default: from file extension)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per insert batch")
+        parser.add_argument('--report', help="Write the full JSON report to this path")
+
+    def handle(self, *args, **options):
+        fmt = options['type'] or detect_format(options['path'])
+
+        def progress(report):
+            self.stdout.write(f"{report.total_rows} rows read, {report.created} created, {report.failed} failed")
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = import_employees(stream, fmt, chunk_size=options['chunk_size'], on_progress=progress)
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {str(e)}")
+        except Exception as e:
+            raise CommandError(f"Import failed: {str(e)}")
+
+        if options['report']:
+            with open(options['report'], 'w') as out:
+                json.dump(report, out, indent=2)
+
+        for error in report['errors'][:20]:
+            self.stderr.write(f"row {error['row']} ({error['employee_id']}): {error['errors']}")
+        if report['errors_truncated'] or len(report['errors']) > 20:
+            self.stderr.write("... more errors omitted, use --report for the full list")
+
+        style = self.style.SUCCESS if not report['failed'] else self.style.WARNING
+        self.stdout.write(style(f"Imported {report['created']} of {report['total_rows']} rows ({report['failed']} failed)."))
@@ -0,0 +1,31 @@
+"""
+Store search terms on existing employees (needed once for employees created
+before search existed, and after SEARCH_VERSION changes).
+
+Safe to run against a live cluster and to interrupt; re-running continues:
+    python manage.py index_employee_search --batch-size 1000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from employees.services import EmployeeService
+
+
+class Command(BaseCommand):
+    help = "Store normalized search terms on employees that do not have current ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Employees per bulk_write")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        def progress(updated, total):
+            self.stdout.write(f"{updated}/{total} employees indexed")
+
+        try:
+            EmployeeService.ensure_indexes()
+            updated = EmployeeService.index_search_terms(options['batch_size'], on_progress=progress)
+        except Exception as e:
+            raise CommandError(f"Indexing stopped (re-run to continue): {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Search terms stored on {updated} employees."))
@@ -0,0 +1,31 @@
+"""
+Run the background jobs that are due now (hrms/background.py), e.g. after
+a deploy that stopped every worker, or from cron where no worker polls.
+Workers pick these jobs up on their own; running this alongside them is
+safe.
+    python manage.py run_background_jobs --retry-failed
+"""
+from django.core.management.base import BaseCommand, CommandError
+from hrms import background
+
+
+class Command(BaseCommand):
+    help = "Run pending and abandoned background jobs and report what is left."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Queue jobs that exhausted their attempts again first")
+
+    def handle(self, *args, **options):
+        try:
+            if options['retry_failed']:
+                self.stdout.write(f"{background.retry_failed()} failed jobs queued again")
+            finished, failed = background.run_due()
+            stats = background.stats()
+        except Exception as e:
+            raise CommandError(f"Run stopped (re-run to continue): {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ran {finished + failed} jobs ({failed} failed); "
+            f"{stats['pending']} pending, {stats['running']} running, {stats['failed']} failed."
+        ))
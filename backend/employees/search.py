@@ -0,0 +1,75 @@
+"""
+Normalized search terms for employees.
+
+Every employee document carries `search_terms`: the case-folded,
+accent-stripped values of full_name, email, employee_id and department,
+whole and split into words. A multikey index on the field turns a prefix
+search into an index range scan: each word of the query must be the prefix
+of at least one term, so "ali eng" finds Alice in Engineering and
+"alice.s" finds alice.smith@example.com. Queries are split into words
+exactly like the stored values, so "o'brien" and "smith-jones" find the
+names they spell.
+
+SEARCH_VERSION is stored alongside the terms; bump it when terms() changes
+and run `python manage.py index_employee_search` to rebuild them.
+"""
+import re
+import unicodedata
+
+SEARCH_VERSION = 1
+
+SEARCHED_FIELDS = ('full_name', 'email', 'employee_id', 'department')
+
+# Bounds on what a single query may ask for
+MAX_QUERY_LENGTH = 100
+MAX_QUERY_WORDS = 5
+
+_WORD_SEPARATOR = re.compile(r'[^\w]+')
+
+
+def normalize(value):
+    """Case-fold and strip accents, so 'Zoë' and 'ZOE' compare equal."""
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold().strip()
+
+
+def words(value):
+    """The words of a normalized value, split at anything but letters and digits."""
+    return [word for word in _WORD_SEPARATOR.split(value) if word]
+
+
+def terms(employee):
+    """Search terms for an employee dict: each field whole, plus its words."""
+    found = set()
+    for field in SEARCHED_FIELDS:
+        value = normalize(employee.get(field) or '')
+        if not value:
+            continue
+        found.add(value)
+        found.update(words(value))
+    return sorted(found)
+
+
+def search_fields(employee):
+    """The fields to $set on an employee document so search finds it."""
+    return {'search_terms': terms(employee), 'search_version': SEARCH_VERSION}
+
+
+def query_filter(query):
+    """
+    MongoDB filter matching employees whose terms start with every word of
+    `query`. Raises ValueError for an empty or oversized query.
+    """
+    query = (query or '').strip()
+    if not query:
+        raise ValueError("q is required")
+    if len(query) > MAX_QUERY_LENGTH:
+        raise ValueError(f"q must be at most {MAX_QUERY_LENGTH} characters")
+    prefixes = list(dict.fromkeys(words(normalize(query))))
+    if not prefixes:
+        raise ValueError("q is required")
+    if len(prefixes) > MAX_QUERY_WORDS:
+        raise ValueError(f"q must have at most {MAX_QUERY_WORDS} words")
+    # Anchored, case-sensitive regexes on normalized terms use index bounds
+    conditions = [{'search_terms': {'$regex': f'^{re.escape(prefix)}'}} for prefix in prefixes]
+    return conditions[0] if len(conditions) == 1 else {'$and': conditions}
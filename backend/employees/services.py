@@ -5,22 +5,76 @@ Replaces Django ORM for MongoDB operations.
 from datetime import datetime
 import logging
 from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from hrms.formatting import DocumentFormatter, Field
 from hrms.mongodb import mongodb
+from hrms import background, versions
+from hrms.pagination import encode_cursor, keyset_filter
+from . import search
+from .cache import build_cache
 
 logger = logging.getLogger(__name__)
 
+# API shape of an employee; also defines the projection used by every reader.
+# datetime and ObjectId values are serialized by hrms.renderers.
+EMPLOYEE_FORMAT = DocumentFormatter([
+    Field('employee_id'),
+    Field('full_name'),
+    Field('email'),
+    Field('department'),
+    Field('created_at'),
+    Field('id', '_id'),
+])
+
+# Slack on top of the cache's staleness window before the second pass over an
+# updated or deleted employee's attendance: requests in flight when it ended,
+# and records waiting in the attendance write-behind journal, are written by then
+STALE_COPY_MARGIN_SECONDS = 30
+
 
 class EmployeeService:
     """Service class for Employee operations using MongoDB."""
     
     COLLECTION_NAME = 'employees'
 
+    # Upper bound on ids accepted by delete_many in one call (one round trip each)
+    MAX_BULK_DELETE = 1000
+
+    # Sort key for listings; the matching index keeps keyset pages O(limit)
+    LIST_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+    INDEXES = [
+        {'keys': [('employee_id', ASCENDING)], 'name': 'employee_id_unique', 'unique': True},
+        {'keys': [('email', ASCENDING)], 'name': 'email_unique', 'unique': True},
+        {'keys': LIST_SORT, 'name': 'created_at_id'},
+        # Multikey index over normalized name/email/id/department terms (employees/search.py)
+        {'keys': [('search_terms', ASCENDING)], 'name': 'search_terms'},
+    ]
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the indexes the employee queries rely on."""
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        for index in EmployeeService.INDEXES:
+            options = {key: value for key, value in index.items() if key != 'keys'}
+            collection.create_index(index['keys'], **options)
+        return [index['name'] for index in EmployeeService.INDEXES]
+
+    @staticmethod
+    def _mark_changed():
+        """Bump the employees version stamp so cached reads and ETags are refreshed."""
+        try:
+            versions.bump_version(EmployeeService.COLLECTION_NAME)
+        except Exception as e:
+            logger.warning("Could not bump %s version: %s", EmployeeService.COLLECTION_NAME, e)
+
     @staticmethod
     def create(employee_data):
         """Create a new employee."""
         try:
-            logger.info(f"Creating employee with data: {employee_data}")
-            
             # Validate required fields
             required_fields = ['employee_id', 'full_name', 'email', 'department']
             missing_fields = [field for field in required_fields if field not in employee_data or not employee_data.get(field)]
@@ -33,123 +87,419 @@ class EmployeeService:
             try:
                 collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
             except Exception as e:
-                logger.error(f"Failed to get MongoDB collection: {str(e)}")
+                logger.error("Failed to get MongoDB collection: %s", e)
                 raise Exception(f"Database connection error: {str(e)}")
             
-            # Check for duplicates
-            try:
-                existing = collection.find_one({'employee_id': employee_data['employee_id']})
-                if existing:
-                    logger.warning(f"Duplicate employee_id: {employee_data['employee_id']}")
-                    raise ValueError('Employee with this employee_id already exists')
-                
-                existing = collection.find_one({'email': employee_data['email']})
-                if existing:
-                    logger.warning(f"Duplicate email: {employee_data['email']}")
-                    raise ValueError('Employee with this email already exists')
-            except ValueError:
-                raise
-            except Exception as e:
-                logger.error(f"Error checking for duplicates: {str(e)}")
-                raise Exception(f"Database query error: {str(e)}")
-            
             # Add timestamp
             employee_data['created_at'] = datetime.utcnow()
             
-            # Insert and return
-            logger.info(f"Inserting employee into MongoDB: {employee_data['employee_id']}")
+            # Insert and return; uniqueness is enforced by the employee_id/email indexes
             try:
-                result = collection.insert_one(employee_data)
+                # Search terms are stored, not returned
+                result = collection.insert_one({**employee_data, **search.search_fields(employee_data)})
                 if not result.inserted_id:
                     raise Exception("Failed to insert employee - no ID returned")
                 
                 employee_data['id'] = str(result.inserted_id)
                 employee_data['_id'] = str(result.inserted_id)
+                # Keep the created_at format this response has always had (no 'Z')
+                employee_data['created_at'] = employee_data['created_at'].isoformat()
                 
-                logger.info(f"Employee created successfully with ID: {result.inserted_id}")
+                logger.debug("Inserted employee %s with ID %s", employee_data['employee_id'], result.inserted_id)
+                EmployeeService._mark_changed()
                 return employee_data
+            except DuplicateKeyError as e:
+                field = EmployeeService._duplicate_field(e)
+                logger.warning("Duplicate %s: %s", field, employee_data.get(field))
+                raise ValueError(f'Employee with this {field} already exists')
             except Exception as e:
-                logger.error(f"MongoDB insert failed: {str(e)}")
+                logger.error("MongoDB insert failed: %s", e)
                 raise Exception(f"Database insert error: {str(e)}")
                 
         except ValueError:
             # Re-raise ValueError as-is
             raise
         except Exception as e:
-            logger.exception(f"Error creating employee: {str(e)}")
+            logger.exception("Error creating employee: %s", e)
             raise Exception(f"Database error: {str(e)}")
 
+    @staticmethod
+    def bulk_create(employees):
+        """
+        Insert a chunk of validated employees with one unordered insert_many.
+
+        Existing employee_id/email values are pre-checked with a single $in
+        query and duplicates inside the chunk are rejected, so only new
+        employees are written. Returns (created_count, errors) where errors
+        is a list of (position, message) for rows that were not inserted.
+        """
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        errors = []
+
+        existing_ids = set()
+        existing_emails = set()
+        if employees:
+            existing = collection.find(
+                {'$or': [
+                    {'employee_id': {'$in': [emp['employee_id'] for emp in employees]}},
+                    {'email': {'$in': [emp['email'] for emp in employees]}},
+                ]},
+                {'employee_id': 1, 'email': 1, '_id': 0}
+            )
+            for emp in existing:
+                existing_ids.add(emp.get('employee_id'))
+                existing_emails.add(emp.get('email'))
+
+        docs = []
+        positions = []
+        now = datetime.utcnow()
+        for position, emp in enumerate(employees):
+            if emp['employee_id'] in existing_ids:
+                errors.append((position, 'Employee with this employee_id already exists'))
+                continue
+            if emp['email'] in existing_emails:
+                errors.append((position, 'Employee with this email already exists'))
+                continue
+            # Later rows in the same chunk collide with earlier ones
+            existing_ids.add(emp['employee_id'])
+            existing_emails.add(emp['email'])
+            docs.append({
+                'employee_id': emp['employee_id'],
+                'full_name': emp['full_name'],
+                'email': emp['email'],
+                'department': emp['department'],
+                'created_at': now,
+                **search.search_fields(emp),
+            })
+            positions.append(position)
+
+        created = len(docs)
+        if docs:
+            try:
+                collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # Rows inserted concurrently by another writer since the pre-check
+                for error in e.details.get('writeErrors', []):
+                    if error.get('code') != 11000:
+                        raise
+                    field = 'email' if 'email' in (error.get('keyPattern') or {}) else 'employee_id'
+                    errors.append((positions[error['index']], f'Employee with this {field} already exists'))
+                    created -= 1
+
+        if created:
+            EmployeeService._mark_changed()
+        errors.sort()
+        return created, errors
+
+    @staticmethod
+    def _duplicate_field(error):
+        """Return which unique field ('employee_id' or 'email') a DuplicateKeyError hit."""
+        key_pattern = (error.details or {}).get('keyPattern') or {}
+        if 'email' in key_pattern or 'email_unique' in str(error):
+            return 'email'
+        return 'employee_id'
+
     @staticmethod
     def get_all():
         """Get all employees."""
         try:
             collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
-            employees = list(collection.find().sort('created_at', -1))
-            
-            # Convert ObjectId to string and rename _id to id
-            for emp in employees:
-                emp['id'] = str(emp['_id'])
-                emp.pop('_id', None)
-                # Convert datetime to ISO string
-                if 'created_at' in emp:
-                    emp['created_at'] = emp['created_at'].isoformat() + 'Z'
+            cursor = collection.find({}, EMPLOYEE_FORMAT.projection).sort(EmployeeService.LIST_SORT)
+            employees = EMPLOYEE_FORMAT.many(cursor)
             
-            logger.info(f"Retrieved {len(employees)} employees")
+            logger.debug("Retrieved %s employees", len(employees))
             return employees
         except Exception as e:
-            logger.exception(f"Error retrieving employees: {str(e)}")
+            logger.exception("Error retrieving employees: %s", e)
             raise Exception(f"Database query error: {str(e)}")
 
+    @staticmethod
+    def get_page(limit, after=None):
+        """
+        Get one page of employees, newest first, using keyset pagination.
+        Returns the page and an opaque cursor for the next page (None at the end).
+        """
+        query = keyset_filter(after) if after else {}
+
+        try:
+            collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+            # Fetch one extra row to know whether another page exists
+            employees = list(collection.find(query, EMPLOYEE_FORMAT.projection).sort(EmployeeService.LIST_SORT).limit(limit + 1))
+        except Exception as e:
+            logger.exception("Error retrieving employee page: %s", e)
+            raise Exception(f"Database query error: {str(e)}")
+
+        return EmployeeService._page(employees, limit)
+
+    @staticmethod
+    def _page(employees, limit):
+        """Format up to `limit + 1` fetched rows as a page and the cursor for the next one."""
+        next_cursor = None
+        if len(employees) > limit:
+            employees = employees[:limit]
+            last = employees[-1]
+            next_cursor = encode_cursor(last['created_at'], last['_id'])
+
+        return {'results': EMPLOYEE_FORMAT.many(employees), 'next': next_cursor}
+
     @staticmethod
     def get_by_id(employee_id):
         """Get employee by MongoDB _id."""
         collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
         
         try:
-            employee = collection.find_one({'_id': ObjectId(employee_id)})
+            employee = collection.find_one({'_id': ObjectId(employee_id)}, EMPLOYEE_FORMAT.projection)
         except Exception as e:
-            logger.error(f"Error getting employee by ID {employee_id}: {str(e)}")
+            logger.error("Error getting employee by ID %s: %s", employee_id, e)
             return None
         
-        if employee:
-            employee['id'] = str(employee['_id'])
-            employee.pop('_id', None)
-            if 'created_at' in employee:
-                employee['created_at'] = employee['created_at'].isoformat() + 'Z'
-        
-        return employee
+        return EMPLOYEE_FORMAT(employee) if employee else None
 
     @staticmethod
     def get_by_employee_id(employee_id):
         """Get employee by employee_id field."""
         collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
-        employee = collection.find_one({'employee_id': employee_id})
+        employee = collection.find_one({'employee_id': employee_id}, EMPLOYEE_FORMAT.projection)
+        return EMPLOYEE_FORMAT(employee) if employee else None
+
+    @staticmethod
+    def get_many_by_employee_ids(employee_ids):
+        """Get employees for several employee_id values in one $in query, keyed by employee_id."""
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        cursor = collection.find({'employee_id': {'$in': list(employee_ids)}}, EMPLOYEE_FORMAT.projection)
+        return {employee['employee_id']: employee for employee in EMPLOYEE_FORMAT.iter(cursor)}
+
+    # Fields that may be changed after creation; employee_id is the key
+    # attendance records refer to and stays fixed
+    UPDATABLE_FIELDS = ('full_name', 'email', 'department')
+
+    @staticmethod
+    def update(employee_id, changes):
+        """
+        Update employee fields by MongoDB _id and refresh the copies of those
+        fields kept on the employee's attendance records.
+        Returns {'employee': {...}, 'attendance': {...}}, or None if not found.
+        """
+        unknown = set(changes) - set(EmployeeService.UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {', '.join(sorted(unknown))}")
+        if not changes:
+            raise ValueError("No fields to update")
+        
+        try:
+            object_id = ObjectId(employee_id)
+        except (InvalidId, TypeError):
+            return None
         
-        if employee:
-            employee['id'] = str(employee['_id'])
-            employee.pop('_id', None)
-            if 'created_at' in employee:
-                employee['created_at'] = employee['created_at'].isoformat() + 'Z'
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        try:
+            employee = collection.find_one_and_update(
+                {'_id': object_id},
+                {'$set': changes},
+                projection=EMPLOYEE_FORMAT.projection,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as e:
+            raise ValueError(f'Employee with this {EmployeeService._duplicate_field(e)} already exists')
+        if not employee:
+            return None
         
-        return employee
+        EmployeeService._refresh_search_terms(collection, employee)
+        employee = EMPLOYEE_FORMAT(employee)
+        employee_directory.invalidate(employee['employee_id'])
+        EmployeeService._mark_changed()
+        attendance = EmployeeService._propagate_to_attendance(employee['employee_id'])
+        return {'employee': employee, 'attendance': attendance}
 
     @staticmethod
-    def delete(employee_id):
-        """Delete employee by MongoDB _id."""
+    def _search_term_update(employee):
+        """
+        (filter, update) storing the search terms of an employee document,
+        applied only while the searched fields still hold the values the
+        terms were built from (a concurrent update writes its own, newer terms).
+        """
+        condition = {'_id': employee['_id']}
+        condition.update({field: employee.get(field) for field in search.SEARCHED_FIELDS})
+        return condition, {'$set': search.search_fields(employee)}
+
+    @staticmethod
+    def _refresh_search_terms(collection, employee):
+        collection.update_one(*EmployeeService._search_term_update(employee))
+
+    @staticmethod
+    def index_search_terms(batch_size=1000, on_progress=None):
+        """
+        Store search terms on employees written before search existed or
+        under an older SEARCH_VERSION, in _id order, one bulk_write per
+        batch. Safe on a live collection and to interrupt; re-running picks
+        up the remaining documents. Returns the number of documents updated.
+        """
         collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        projection = {field: 1 for field in search.SEARCHED_FIELDS}
+        query = {'search_version': {'$ne': search.SEARCH_VERSION}}
+        total = collection.count_documents(query)
+        updated = 0
+        last_id = None
+        while True:
+            batch_query = dict(query, _id={'$gt': last_id}) if last_id else query
+            batch = list(collection.find(batch_query, projection).sort('_id', ASCENDING).limit(batch_size))
+            if not batch:
+                break
+            result = collection.bulk_write(
+                [UpdateOne(*EmployeeService._search_term_update(doc)) for doc in batch], ordered=False
+            )
+            updated += result.modified_count
+            last_id = batch[-1]['_id']
+            if on_progress:
+                on_progress(updated, total)
+        return updated
+
+    @staticmethod
+    def search(query, limit, after=None):
+        """
+        Prefix search over full_name, email, employee_id and department
+        (case- and accent-insensitive), in listing order with keyset
+        pagination. Returns {'results': [...], 'next': cursor or None}.
+        """
+        filters = [search.query_filter(query)]
+        if after:
+            filters.append(keyset_filter(after))
         
         try:
-            employee = EmployeeService.get_by_id(employee_id)
-            if not employee:
-                return None
-            
-            collection.delete_one({'_id': ObjectId(employee_id)})
-            return employee
-        except:
+            collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+            # Fetch one extra row to know whether another page exists
+            employees = list(
+                collection.find({'$and': filters}, EMPLOYEE_FORMAT.projection)
+                .sort(EmployeeService.LIST_SORT)
+                .limit(limit + 1)
+            )
+        except Exception as e:
+            logger.exception("Error searching employees: %s", e)
+            raise Exception(f"Database query error: {str(e)}")
+        
+        return EmployeeService._page(employees, limit)
+
+    @staticmethod
+    def _propagate_to_attendance(employee_id):
+        """Refresh attendance copies of an employee, in the background for long histories."""
+        # Local import: attendance.services imports this module
+        from attendance.services import AttendanceService
+        
+        # Attendance recorded meanwhile copies the employee from workers'
+        # employee_directory, which may serve the old values for a while:
+        # refresh once more when every worker has seen the change
+        staleness = employee_directory.staleness_seconds
+        if staleness:
+            background.submit_later(
+                f"refresh late attendance copies of {employee_id}", staleness + STALE_COPY_MARGIN_SECONDS,
+                AttendanceService.refresh_employee_copies, employee_id, batch_size=settings.EMPLOYEE_CASCADE_BATCH_SIZE
+            )
+        
+        pending = AttendanceService.count_stale_employee_copies(employee_id)
+        if pending > settings.EMPLOYEE_CASCADE_BACKGROUND_THRESHOLD:
+            background.submit(
+                f"refresh attendance copies of {employee_id}",
+                AttendanceService.refresh_employee_copies, employee_id, batch_size=settings.EMPLOYEE_CASCADE_BATCH_SIZE
+            )
+            return {'records': pending, 'status': 'scheduled'}
+        
+        updated = AttendanceService.refresh_employee_copies(employee_id)
+        return {'records': updated, 'status': 'done'}
+
+    @staticmethod
+    def delete(employee_id):
+        """
+        Delete employee by MongoDB _id and cascade to their attendance.
+        Returns {'employee': {...}, 'attendance': {...}}, or None if not found.
+        """
+        try:
+            object_id = ObjectId(employee_id)
+        except (InvalidId, TypeError):
+            return None
+        
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        employee = collection.find_one_and_delete({'_id': object_id}, projection=EMPLOYEE_FORMAT.projection)
+        if not employee:
             return None
+        
+        employee = EMPLOYEE_FORMAT(employee)
+        employee_directory.invalidate(employee['employee_id'])
+        EmployeeService._mark_changed()
+        attendance = EmployeeService._cascade_attendance([employee['employee_id']])
+        return {'employee': employee, 'attendance': attendance}
+
+    @staticmethod
+    def delete_many(employee_ids):
+        """
+        Delete several employees by MongoDB _id and cascade to their attendance.
+        Returns {'deleted': [employees], 'not_found': [ids], 'attendance': {...}}.
+        """
+        if len(employee_ids) > EmployeeService.MAX_BULK_DELETE:
+            raise ValueError(f"At most {EmployeeService.MAX_BULK_DELETE} employees can be deleted at once")
+        collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
+        employees = []
+        not_found = []
+        for employee_id in dict.fromkeys(employee_ids):
+            try:
+                object_id = ObjectId(employee_id)
+            except (InvalidId, TypeError):
+                not_found.append(employee_id)
+                continue
+            # One atomic delete per id: only employees this call removed are
+            # reported and cascaded, even with concurrent deletes or inserts
+            employee = collection.find_one_and_delete({'_id': object_id}, projection=EMPLOYEE_FORMAT.projection)
+            if employee:
+                employees.append(employee)
+            else:
+                not_found.append(employee_id)
+        
+        deleted = EMPLOYEE_FORMAT.many(employees)
+        for employee in deleted:
+            employee_directory.invalidate(employee['employee_id'])
+        if deleted:
+            EmployeeService._mark_changed()
+        
+        attendance = EmployeeService._cascade_attendance([employee['employee_id'] for employee in deleted]) if deleted else None
+        return {'deleted': deleted, 'not_found': not_found, 'attendance': attendance}
+
+    @staticmethod
+    def _cascade_attendance(employee_ids):
+        """Remove or archive the attendance of deleted employees, in the background for long histories."""
+        # Local import: attendance.services imports this module
+        from attendance.services import AttendanceService, attendance_buffer
+        
+        archive = settings.EMPLOYEE_DELETE_CASCADE == 'archive'
+        batch_size = settings.EMPLOYEE_CASCADE_BATCH_SIZE
+        mode = 'archived' if archive else 'deleted'
+        
+        # Attendance can still arrive from workers that have the employees
+        # cached, requests in flight and write-behind journals: remove it
+        # once those have settled. Journaled records on this host go now
+        attendance_buffer.discard(AttendanceService.buffer_key_prefix(employee_id) for employee_id in employee_ids)
+        background.submit_later(
+            f"remove late attendance of {len(employee_ids)} deleted employee(s)",
+            employee_directory.staleness_seconds + STALE_COPY_MARGIN_SECONDS,
+            AttendanceService.remove_orphaned, list(employee_ids), archive=archive, batch_size=batch_size
+        )
+        
+        pending = AttendanceService.count_for_employees(employee_ids)
+        if pending > settings.EMPLOYEE_CASCADE_BACKGROUND_THRESHOLD:
+            background.submit(
+                f"cascade attendance for {len(employee_ids)} employee(s)",
+                AttendanceService.remove_for_employees, employee_ids, archive=archive, batch_size=batch_size
+            )
+            return {'mode': mode, 'records': pending, 'status': 'scheduled'}
+        
+        removed = AttendanceService.remove_for_employees(employee_ids, archive=archive, batch_size=batch_size)
+        return {'mode': mode, 'records': removed, 'status': 'done'}
 
     @staticmethod
     def count():
         """Get total count of employees."""
         collection = mongodb.get_collection(EmployeeService.COLLECTION_NAME)
-        return collection.count_documents({})
+        # Unfiltered count is read from collection metadata instead of scanning
+        return collection.estimated_document_count()
+
+
+# Cached employee_id -> employee lookups for hot attendance paths
+employee_directory = build_cache(EmployeeService.get_by_employee_id, EmployeeService.get_many_by_employee_ids)
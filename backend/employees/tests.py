@@ -0,0 +1,232 @@
+import base64
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+from bson import ObjectId
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+
+from hrms.pagination import decode_cursor, encode_cursor, keyset_filter
+from attendance.services import AttendanceService, attendance_buffer
+from hrms.testcases import MongoTestCase
+from . import search
+from .cache import EmployeeDirectoryCache
+from .services import EmployeeService, employee_directory
+
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        created_at, object_id = datetime(2026, 1, 5, 9, 30, 0, 123000), ObjectId()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, object_id)), (created_at, object_id))
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in [
+            '', 'not a cursor', '%%%', raw_cursor('{"a": 1}'), raw_cursor('5'), raw_cursor('[1, 2]'),
+            raw_cursor('["2026-01-05T09:30:00", "not-an-object-id"]'),
+            raw_cursor('["yesterday", "65a000000000000000000000"]'),
+            raw_cursor('["2026-01-05T09:30:00", "65a000000000000000000000", "extra"]'),
+            base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+        ]:
+            with self.subTest(cursor=cursor), self.assertRaisesMessage(ValueError, "Invalid pagination cursor"):
+                keyset_filter(cursor)
+
+
+class EmployeePageTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        start = datetime(2026, 1, 1)
+        # Two employees share a created_at: the _id breaks the tie
+        self.db.employees.insert_many([
+            {'_id': ObjectId(f'65a{i:021d}'), 'employee_id': f'E{i}', 'full_name': f'Name {i}',
+             'email': f'e{i}@example.com', 'department': 'Ops', 'created_at': start + timedelta(seconds=min(i, 3))}
+            for i in range(5)
+        ])
+        self.api = APIClient()
+
+    def test_pages_cover_every_employee_once_newest_first(self):
+        seen, after = [], None
+        while True:
+            params = {'limit': 2, **({'after': after} if after else {})}
+            page = self.api.get('/api/employees/', params).json()
+            seen.extend(employee['employee_id'] for employee in page['results'])
+            after = page['next']
+            if after is None:
+                break
+        self.assertEqual(seen, ['E4', 'E3', 'E2', 'E1', 'E0'])
+
+    def test_malformed_cursor_is_a_bad_request(self):
+        response = self.api.get('/api/employees/', {'after': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid pagination cursor'})
+
+    def test_page_service_matches_the_legacy_listing(self):
+        page = EmployeeService.get_page(10)
+        self.assertEqual(page['results'], EmployeeService.get_all())
+        self.assertIsNone(page['next'])
+
+
+
+class EmployeeDirectoryCacheTests(MongoTestCase):
+    """Version mode: every process learns of changes made by the others."""
+
+    def setUp(self):
+        super().setUp()
+        self.stored = {employee_id: {'employee_id': employee_id, 'full_name': 'Old'} for employee_id in ('E1', 'E2')}
+
+    def make_cache(self):
+        return EmployeeDirectoryCache(
+            lambda employee_id: dict(self.stored[employee_id]),
+            lambda employee_ids: {employee_id: dict(self.stored[employee_id]) for employee_id in employee_ids},
+            max_size=10, ttl_seconds=300, consistency='version', version_check_seconds=300,
+        )
+
+    def test_invalidate_drops_entries_changed_by_another_process(self):
+        first, second = self.make_cache(), self.make_cache()
+        second.get('E1')
+        second.get('E2')
+
+        self.stored['E1'] = {'employee_id': 'E1', 'full_name': 'New'}
+        first.invalidate('E1')
+        self.stored['E2'] = {'employee_id': 'E2', 'full_name': 'New'}
+        second.invalidate('E2')
+
+        self.assertEqual(second.get('E1')['full_name'], 'New')
+        self.assertEqual(second.get('E2')['full_name'], 'New')
+
+class SearchTermTests(SimpleTestCase):
+
+    NAMES = ["Seán O'Brien", 'Ann Smith-Jones', 'Zoë Ådahl', 'alice.smith@example.com', 'R&D/QA']
+
+    def test_every_query_word_is_a_prefix_of_a_stored_term(self):
+        for name in self.NAMES:
+            terms = search.terms({'full_name': name})
+            queries = [name, name.upper(), name.lower()] + name.split()
+            for query in queries:
+                prefixes = search.words(search.normalize(query))
+                with self.subTest(name=name, query=query):
+                    self.assertTrue(prefixes)
+                    for prefix in prefixes:
+                        self.assertTrue(any(term.startswith(prefix) for term in terms), (prefix, terms))
+
+    def test_query_filter_uses_the_stored_tokenizer(self):
+        self.assertEqual(search.query_filter("O'Brien"), {'$and': [
+            {'search_terms': {'$regex': '^o'}}, {'search_terms': {'$regex': '^brien'}},
+        ]})
+
+    def test_invalid_queries(self):
+        for query, message in [
+            ('', 'q is required'), ('  -- ', 'q is required'),
+            ('x' * (search.MAX_QUERY_LENGTH + 1), 'at most'), ('a b c d e f', 'at most'),
+        ]:
+            with self.subTest(query=query), self.assertRaisesMessage(ValueError, message):
+                search.query_filter(query)
+
+
+class EmployeeSearchTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        for i, (name, email, department) in enumerate([
+            ("Seán O'Brien", 'sean@example.com', 'Engineering'),
+            ('Ann Smith-Jones', 'ann@example.com', 'Finance'),
+            ('Alice Smith', 'alice.smith@example.com', 'Engineering'),
+        ]):
+            self.api.post('/api/employees/', {
+                'employee_id': f'E{i}', 'full_name': name, 'email': email, 'department': department,
+            }, format='json')
+
+    def search(self, query):
+        response = self.api.get('/api/employees/search/', {'q': query})
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(employee['full_name'] for employee in response.json()['results'])
+
+    def test_punctuated_names(self):
+        self.assertEqual(self.search("o'brien"), ["Seán O'Brien"])
+        self.assertEqual(self.search('SMITH-JONES'), ['Ann Smith-Jones'])
+        self.assertEqual(self.search('sean'), ["Seán O'Brien"])
+
+    def test_prefixes_across_fields(self):
+        self.assertEqual(self.search('ali eng'), ['Alice Smith'])
+        self.assertEqual(self.search('alice.s'), ['Alice Smith'])
+        self.assertEqual(self.search('smith'), ['Alice Smith', 'Ann Smith-Jones'])
+
+
+@mock.patch('hrms.background.submit_later')
+class EmployeeDeleteTests(MongoTestCase):
+    """Deletes cascade to attendance now and once more when stale copies have settled."""
+
+    def setUp(self):
+        super().setUp()
+        EmployeeService.ensure_indexes()
+        AttendanceService.ensure_indexes()
+        directory = tempfile.mkdtemp(prefix='hrms-test-journal-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        for name, value in (('enabled', True), ('path', f'{directory}/journal.sqlite3'), ('start', lambda: None)):
+            patcher = mock.patch.object(attendance_buffer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        attendance_buffer._reset()
+        self.addCleanup(attendance_buffer._reset)
+        self.api = APIClient()
+
+    def create(self, employee_id):
+        response = self.api.post('/api/employees/', {
+            'employee_id': employee_id, 'full_name': 'Ann Lee', 'email': f'{employee_id}@example.com',
+            'department': 'Ops',
+        }, format='json')
+        return response.json()['employee']['id']
+
+    def post_attendance(self, employee_id, date='2026-01-05'):
+        response = self.api.post('/api/attendance/', {'employee_id': employee_id, 'date': date, 'status': 'Present'},
+                                 format='json')
+        self.assertEqual(response.status_code, 202)
+
+    def test_delete_discards_journaled_attendance_and_schedules_a_second_pass(self, submit_later):
+        employee = self.create('E1')
+        self.create('E2')
+        self.post_attendance('E1', '2026-01-05')
+        attendance_buffer.drain()
+        self.post_attendance('E1', '2026-01-06')
+        self.post_attendance('E2')
+
+        response = self.api.delete(f'/api/employees/{employee}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['attendance'], {'mode': 'deleted', 'records': 1, 'status': 'done'})
+        self.assertEqual(attendance_buffer.stats()['pending'], 1)
+        attendance_buffer.drain()
+        self.assertEqual([doc['employee_id'] for doc in self.db.attendance.find()], ['E2'])
+
+        submit_later.assert_called_once()
+        _, delay, func, employee_ids = submit_later.call_args.args
+        self.assertEqual((func, employee_ids), (AttendanceService.remove_orphaned, ['E1']))
+        self.assertGreaterEqual(delay, employee_directory.staleness_seconds)
+
+    def test_second_pass_removes_late_attendance_of_employees_still_deleted(self, submit_later):
+        self.create('E1')
+        self.db.attendance.insert_many([
+            {'employee_id': employee_id, 'date': datetime(2026, 1, 5), 'status': 'Present'}
+            for employee_id in ('E1', 'E9')
+        ])
+
+        # E1 was created again meanwhile: its new attendance stays
+        self.assertEqual(AttendanceService.remove_orphaned(['E1', 'E9']), 1)
+        self.assertEqual([doc['employee_id'] for doc in self.db.attendance.find()], ['E1'])
+
+    def test_bulk_delete_is_capped(self, submit_later):
+        ids = [str(ObjectId()) for _ in range(EmployeeService.MAX_BULK_DELETE + 1)]
+        response = self.api.post('/api/employees/bulk-delete/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'At most 1000 employees can be deleted at once'})
+        with self.assertRaisesMessage(ValueError, 'At most 1000'):
+            EmployeeService.delete_many(ids)
+        submit_later.assert_not_called()
@@ -3,5 +3,8 @@ from . import views
 
 urlpatterns = [
     path('', views.employee_list_create, name='employee_list_create'),  # GET and POST
-    path('<str:employee_id>/', views.delete_employee, name='delete_employee'),  # MongoDB ObjectId is string
+    path('search/', views.employee_search, name='employee_search'),
+    path('import/', views.import_employees_view, name='import_employees'),
+    path('bulk-delete/', views.bulk_delete_employees, name='bulk_delete_employees'),
+    path('<str:employee_id>/', views.employee_detail, name='employee_detail'),  # PATCH and DELETE; MongoDB ObjectId is string
 ]
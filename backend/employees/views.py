@@ -1,16 +1,21 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
 from .serializers import EmployeeSerializer
 from .services import EmployeeService
+from .importer import FORMATS, detect_format, import_employees
+from hrms.conditional import conditional_get
+from hrms.pagination import parse_limit
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
+@conditional_get('employees', cache=True)
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])  # Disable authentication for this endpoint
 def employee_list_create(request):
@@ -18,27 +23,42 @@ def employee_list_create(request):
     Handle both GET and POST requests for employees.
     
     GET /api/employees/ - Get all employees
+    GET /api/employees/?limit=50&after=<cursor> - Get one page of employees
     POST /api/employees/ - Create a new employee
+
+    Without limit/after the full list is returned as a bare array (legacy clients).
+    Paginated responses are {"results": [...], "next": <cursor or null>}.
     """
+    if request.method == 'GET' and ('limit' in request.query_params or 'after' in request.query_params):
+        try:
+            limit = parse_limit(request.query_params.get('limit'))
+            page = EmployeeService.get_page(limit, after=request.query_params.get('after') or None)
+            return Response(page, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.exception("GET /api/employees/ - Failed to fetch employee page: %s", e)
+            return Response(
+                {"error": f"Failed to fetch employees: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     if request.method == 'GET':
         try:
-            logger.info("GET /api/employees/ - Fetching all employees")
             employees = EmployeeService.get_all()
-            logger.info(f"GET /api/employees/ - Retrieved {len(employees)} employees")
+            logger.debug("GET /api/employees/ - Retrieved %s employees", len(employees))
             return Response(employees, status=status.HTTP_200_OK)
         except Exception as e:
-            logger.exception(f"GET /api/employees/ - Failed to fetch employees: {str(e)}")
+            logger.exception("GET /api/employees/ - Failed to fetch employees: %s", e)
             return Response(
                 {"error": f"Failed to fetch employees: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
     elif request.method == 'POST':
-        # Log incoming request for debugging
-        logger.info(f"POST /api/employees/ - Received data: {request.data}")
-        logger.info(f"POST /api/employees/ - Content-Type: {request.content_type}")
-        logger.info(f"POST /api/employees/ - Origin: {request.META.get('HTTP_ORIGIN', 'Not set')}")
-        
         # Ensure we're getting JSON data
         if not request.data:
             logger.error("POST /api/employees/ - Empty request body")
@@ -47,17 +67,18 @@ def employee_list_create(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Log the data types and keys for debugging
-        logger.info(f"POST /api/employees/ - Data keys: {list(request.data.keys())}")
+        # Field names only: the payload itself carries personal data
+        logger.debug(
+            "POST /api/employees/ - Content-Type: %s, Origin: %s, keys: %s",
+            request.content_type, request.META.get('HTTP_ORIGIN', 'Not set'), list(request.data.keys()),
+        )
         
         serializer = EmployeeSerializer(data=request.data)
         
         if serializer.is_valid():
             try:
-                logger.info(f"POST /api/employees/ - Validation passed, creating employee")
-                logger.info(f"POST /api/employees/ - Validated data: {serializer.validated_data}")
                 employee = EmployeeService.create(serializer.validated_data)
-                logger.info(f"Employee created successfully: {employee.get('employee_id')}")
+                logger.info("Employee created successfully: %s", employee.get('employee_id'))
                 return Response(
                     {
                         "message": "Employee created successfully",
@@ -67,7 +88,7 @@ def employee_list_create(request):
                 )
             except ValueError as e:
                 error_message = str(e)
-                logger.error(f"ValueError creating employee: {error_message}")
+                logger.error("ValueError creating employee: %s", error_message)
                 if 'employee_id' in error_message.lower():
                     return Response(
                         {"error": "An employee with this employee ID already exists."},
@@ -89,14 +110,14 @@ def employee_list_create(request):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             except Exception as e:
-                logger.exception(f"Exception creating employee: {str(e)}")
+                logger.exception("Exception creating employee: %s", e)
                 return Response(
                     {"error": f"Failed to create employee: {str(e)}"},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
         
         # Log validation errors
-        logger.error(f"Validation errors: {serializer.errors}")
+        logger.error("Validation errors: %s", serializer.errors)
         return Response(
             {"error": "Validation failed", "details": serializer.errors},
             status=status.HTTP_400_BAD_REQUEST
@@ -104,18 +125,182 @@ def employee_list_create(request):
 
 
 @csrf_exempt
-@api_view(['DELETE'])
+@conditional_get('employees')
+@api_view(['GET'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def employee_search(request):
+    """
+    Search employees by name, email, employee ID or department.
+    
+    GET /api/employees/search/?q=<text>&limit=50&after=<cursor>
+    Every word of q must start one of those values (or a word in them),
+    ignoring case and accents. Results are paginated like the listing:
+    {"results": [...], "next": <cursor or null>}.
+    """
+    try:
+        limit = parse_limit(request.query_params.get('limit'))
+        page = EmployeeService.search(
+            request.query_params.get('q'), limit, after=request.query_params.get('after') or None
+        )
+        return Response(page, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.exception("GET /api/employees/search/ - Search failed: %s", e)
+        return Response(
+            {"error": f"Failed to search employees: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@csrf_exempt
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def import_employees_view(request):
+    """
+    Bulk import employees from an uploaded CSV or NDJSON file.
+    
+    POST /api/employees/import/ (multipart/form-data, field "file")
+    Optional ?type=csv|ndjson, otherwise detected from the file name.
+    CSV files need a header row: employee_id,full_name,email,department
+    Returns a row-level report of created and rejected rows.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response(
+            {"error": "Upload a CSV or NDJSON file in the 'file' field"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    fmt = request.query_params.get('type') or detect_format(upload.name)
+    if fmt not in FORMATS:
+        return Response(
+            {"error": f"Unsupported import type '{fmt}', expected one of: {', '.join(FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        report = import_employees(upload, fmt)
+    except UnicodeDecodeError:
+        return Response(
+            {"error": "File must be UTF-8 encoded"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.exception("POST /api/employees/import/ - Import failed: %s", e)
+        return Response(
+            {"error": f"Failed to import employees: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return Response(report, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def bulk_delete_employees(request):
+    """
+    Delete many employees (and their attendance) at once.
+    
+    POST /api/employees/bulk-delete/
+    Body: {"ids": ["<id>", ...]} (at most EmployeeService.MAX_BULK_DELETE)
+    """
+    ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        return Response(
+            {"error": "ids must be a non-empty list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(ids) > EmployeeService.MAX_BULK_DELETE:
+        return Response(
+            {"error": f"At most {EmployeeService.MAX_BULK_DELETE} employees can be deleted at once"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        result = EmployeeService.delete_many([str(employee_id) for employee_id in ids])
+        return Response(
+            {
+                "message": f"{len(result['deleted'])} employee(s) deleted",
+                **result
+            },
+            status=status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.error("Error bulk deleting employees: %s", e)
+        return Response(
+            {"error": f"Failed to delete employees: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@csrf_exempt
+@api_view(['PATCH', 'DELETE'])
 @permission_classes([AllowAny])  # Disable authentication for this endpoint
-def delete_employee(request, employee_id):
+def employee_detail(request, employee_id):
     """
-    Delete an employee by ID.
+    Update or delete an employee by ID.
     
-    DELETE /api/employees/{id}/
+    PATCH /api/employees/{id}/ - Update full_name, email and/or department
+    DELETE /api/employees/{id}/ - Delete an employee
+
+    An update is copied onto the employee's attendance records and a delete
+    removes (or archives) them; "attendance" in the response reports how
+    many records and whether that is done or still running in the background.
     """
+    if request.method == 'PATCH':
+        data = request.data if isinstance(request.data, dict) else {}
+        if 'employee_id' in data:
+            return Response(
+                {"error": "employee_id cannot be changed"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = EmployeeSerializer(data=data, partial=True)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Validation failed", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            result = EmployeeService.update(employee_id, dict(serializer.validated_data))
+            
+            if not result:
+                return Response(
+                    {"error": "Employee not found"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            return Response(
+                {
+                    "message": "Employee updated successfully",
+                    "employee": result['employee'],
+                    "attendance": result['attendance']
+                },
+                status=status.HTTP_200_OK
+            )
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.exception("Exception updating employee %s: %s", employee_id, e)
+            return Response(
+                {"error": f"Failed to update employee: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
     try:
-        employee = EmployeeService.delete(employee_id)
+        result = EmployeeService.delete(employee_id)
         
-        if not employee:
+        if not result:
             return Response(
                 {"error": "Employee not found"},
                 status=status.HTTP_404_NOT_FOUND
@@ -124,7 +309,8 @@ def delete_employee(request, employee_id):
         return Response(
             {
                 "message": "Employee deleted successfully",
-                "employee": employee
+                "employee": result['employee'],
+                "attendance": result['attendance']
             },
             status=status.HTTP_200_OK
         )
@@ -133,8 +319,3 @@ def delete_employee(request, employee_id):
             {"error": f"Failed to delete employee: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-    except Exception as e:
-        return Response(
-            {"error": f"Failed to delete employee: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
@@ -0,0 +1,30 @@
+"""
+Gunicorn server hooks, picked up automatically when gunicorn is started
+from backend/ (e.g. `gunicorn hrms.wsgi:application --bind 0.0.0.0:8000`).
+"""
+
+
+def post_worker_init(worker):
+    """
+    Connect each worker to MongoDB before it accepts requests (MONGO_WARM_UP)
+    and start its attendance flusher and background job poller, which also
+    pick up records a previous worker left in the journal
+    (ATTENDANCE_WRITE_BEHIND) and jobs it left unfinished.
+    """
+    from hrms import background
+    from hrms.mongodb import mongodb
+    from attendance.services import attendance_buffer
+    mongodb.warm_up()
+    attendance_buffer.start()
+    background.start()
+
+
+def worker_exit(server, worker):
+    """
+    Flush what the worker's attendance buffer still holds (the journal keeps
+    the rest) and stop polling for jobs (another worker resumes its own).
+    """
+    from hrms import background
+    from attendance.services import attendance_buffer
+    background.stop()
+    attendance_buffer.stop()
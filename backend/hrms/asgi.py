@@ -3,14 +3,63 @@ ASGI config for HRMS project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The ASGI app serves the hot read endpoints with async views (hrms.urls_async)
+and opens/closes the async MongoDB client, the attendance write-behind
+flusher and the background job poller on the ASGI lifespan events, e.g.:
+
+    uvicorn hrms.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
+import logging
 import os
 
+from asgiref.sync import sync_to_async
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hrms.settings')
+os.environ.setdefault('HRMS_ASYNC_VIEWS', 'True')
+
+django_application = get_asgi_application()
+
+from . import background  # noqa: E402  (needs settings)
+from .mongodb import mongodb  # noqa: E402
+from .mongodb_async import async_mongodb  # noqa: E402
+from attendance.services import attendance_buffer  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+async def lifespan(receive, send):
+    """Handle ASGI lifespan messages (Django 4.2 does not)."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                # Sync views (writes) use the pymongo client: warm it up alongside Motor
+                await asyncio.gather(
+                    async_mongodb.startup(),
+                    sync_to_async(mongodb.warm_up, thread_sensitive=False)(),
+                )
+                attendance_buffer.start()
+                background.start()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            async_mongodb.close()
+            background.stop()
+            await sync_to_async(attendance_buffer.stop, thread_sensitive=False)()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
 
-application = get_asgi_application()
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    await django_application(scope, receive, send)
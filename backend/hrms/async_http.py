@@ -0,0 +1,20 @@
+"""
+Helpers for the async (ASGI) views.
+"""
+from django.http import HttpResponse
+from .renderers import dumps
+
+
+def json_response(data, status=200):
+    """JSON response encoded like the DRF views (hrms.renderers)."""
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def async_csrf_exempt(view_func):
+    """
+    Mark an async view as CSRF exempt.
+    Django 4.2's csrf_exempt wraps views in a sync function, which would
+    hide the coroutine from the handler, so only the flag is set here.
+    """
+    view_func.csrf_exempt = True
+    return view_func
@@ -0,0 +1,290 @@
+"""
+Durable background jobs.
+
+Long-running maintenance work (e.g. cascading deletes for employees with
+years of history) is recorded in the background_jobs collection and run by
+a small thread pool, so the request can return immediately and the work
+survives a restart:
+
+- submit() stores the job (an importable function and its BSON-encodable
+  arguments) before handing it to this process's pool; submit_later() stores
+  it to run after a delay.
+- A worker claims a job with an atomic update and holds a lease on it, which
+  the poller renews while the job runs. Jobs left pending, or running under
+  a lease that expired because their process died, are claimed by the poller
+  of any process every BACKGROUND_JOB_POLL_SECONDS, or by
+  `python manage.py run_background_jobs`.
+- A job that raises is retried with a growing delay, up to
+  BACKGROUND_JOB_MAX_ATTEMPTS runs; after that it is kept as failed.
+
+Jobs must be idempotent: one interrupted mid-way runs again from the start.
+Finished jobs are removed by MongoDB after BACKGROUND_JOB_RETENTION_DAYS.
+"""
+import importlib
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from django.conf import settings
+from pymongo import ASCENDING, ReturnDocument
+from .mongodb import mongodb
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = 'background_jobs'
+
+INDEXES = [
+    {'keys': [('status', ASCENDING), ('run_at', ASCENDING)], 'name': 'status_run_at'},
+    {'keys': [('finished_at', ASCENDING)], 'name': 'finished_at_ttl',
+     'expireAfterSeconds': settings.BACKGROUND_JOB_RETENTION_DAYS * 24 * 3600},
+]
+
+# A running job whose lease was not renewed for this long is taken over by
+# another process; the poller renews leases every BACKGROUND_JOB_POLL_SECONDS
+LEASE_SECONDS = 60
+
+# Upper bound on the delay before a failed job runs again
+MAX_RETRY_DELAY_SECONDS = 600
+
+_lock = threading.Lock()
+_executor = None
+_poller = None
+_stopping = threading.Event()
+# Jobs dispatched to this process's pool and not finished yet
+_inflight = set()
+
+
+def _collection():
+    return mongodb.get_collection(COLLECTION_NAME)
+
+
+def _owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_JOB_WORKERS,
+                    thread_name_prefix='hrms-job',
+                )
+    return _executor
+
+
+def _after_fork():
+    # The parent's worker and poller threads do not exist in a forked child
+    global _executor, _poller
+    _executor = None
+    _poller = None
+    _stopping.clear()
+    _inflight.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def ensure_indexes():
+    """Create the index the poller claims by and the TTL index on finished jobs."""
+    collection = _collection()
+    for index in INDEXES:
+        options = {key: value for key, value in index.items() if key != 'keys'}
+        collection.create_index(index['keys'], **options)
+    return [index['name'] for index in INDEXES]
+
+
+def _task_path(func):
+    """'module:Qualified.name' of func; raises ValueError unless it can be imported back."""
+    path = f"{func.__module__}:{func.__qualname__}"
+    try:
+        resolved = _resolve(path)
+    except (ImportError, AttributeError):
+        resolved = None
+    if resolved is not func:
+        raise ValueError(f"Background job function {path} is not importable by name")
+    return path
+
+
+def _resolve(path):
+    module, _, qualname = path.partition(':')
+    target = importlib.import_module(module)
+    for name in qualname.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def submit(name, func, *args, **kwargs):
+    """Store a job for func(*args, **kwargs) and start it in the background. Returns its id."""
+    return _enqueue(name, func, args, kwargs, delay=0)
+
+
+def submit_later(name, delay, func, *args, **kwargs):
+    """Store a job for func(*args, **kwargs) to run in `delay` seconds. Returns its id."""
+    return _enqueue(name, func, args, kwargs, delay=delay)
+
+
+def _enqueue(name, func, args, kwargs, delay):
+    now = datetime.utcnow()
+    job_id = _collection().insert_one({
+        'name': name,
+        'task': _task_path(func),
+        'args': list(args),
+        'kwargs': kwargs,
+        'status': 'pending',
+        'attempts': 0,
+        'run_at': now + timedelta(seconds=delay),
+        'created_at': now,
+    }).inserted_id
+    start()
+    if not delay:
+        _dispatch(job_id)
+    return job_id
+
+
+def _dispatch(job_id=None):
+    """Claim and run a job (job_id, or the next one due) on this process's pool."""
+    def work():
+        try:
+            job = _claim(job_id)
+            if job is not None:
+                _execute(job)
+        except Exception as e:
+            logger.warning("Background job %s could not be claimed: %s", job_id or 'poll', e)
+        finally:
+            with _lock:
+                _inflight.discard(token)
+
+    token = object()
+    with _lock:
+        _inflight.add(token)
+    return _get_executor().submit(work)
+
+
+def _due_filter(now):
+    return {'$or': [
+        {'status': 'pending', 'run_at': {'$lte': now}},
+        {'status': 'running', 'lease_until': {'$lt': now}},
+    ]}
+
+
+def _claim(job_id=None):
+    """Lease a due job (pending, or abandoned by a dead process); returns it or None."""
+    now = datetime.utcnow()
+    query = _due_filter(now)
+    if job_id is not None:
+        query['_id'] = job_id
+    return _collection().find_one_and_update(
+        query,
+        {'$set': {'status': 'running', 'owner': _owner(), 'lease_until': now + timedelta(seconds=LEASE_SECONDS)},
+         '$inc': {'attempts': 1}},
+        sort=[('run_at', ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _execute(job):
+    """Run a claimed job and record how it ended; returns True if it finished."""
+    collection = _collection()
+    owned = {'_id': job['_id'], 'owner': job['owner']}
+    attempts = job['attempts']
+    try:
+        if attempts > settings.BACKGROUND_JOB_MAX_ATTEMPTS:
+            # Its process died every time it ran it
+            raise RuntimeError(f"abandoned {attempts - 1} times")
+        result = _resolve(job['task'])(*job['args'], **job['kwargs'])
+    except Exception as e:
+        now = datetime.utcnow()
+        if attempts >= settings.BACKGROUND_JOB_MAX_ATTEMPTS:
+            logger.exception("Background job %s failed for good after %d attempts: %s", job['name'], attempts, e)
+            update = {'status': 'failed', 'finished_at': now}
+        else:
+            delay = min(2 ** attempts * settings.BACKGROUND_JOB_POLL_SECONDS, MAX_RETRY_DELAY_SECONDS)
+            logger.exception("Background job %s failed, retrying in %d s: %s", job['name'], delay, e)
+            update = {'status': 'pending', 'run_at': now + timedelta(seconds=delay)}
+        collection.update_one(owned, {'$set': dict(update, error=str(e), lease_until=None)})
+        return False
+    collection.update_one(owned, {'$set': {
+        'status': 'done', 'result': result, 'finished_at': datetime.utcnow(), 'lease_until': None,
+    }})
+    logger.info("Background job %s finished: %s", job['name'], result)
+    return True
+
+
+def _renew_leases():
+    with _lock:
+        running = bool(_inflight)
+    if running:
+        _collection().update_many(
+            {'status': 'running', 'owner': _owner()},
+            {'$set': {'lease_until': datetime.utcnow() + timedelta(seconds=LEASE_SECONDS)}},
+        )
+
+
+def _poll():
+    while not _stopping.wait(settings.BACKGROUND_JOB_POLL_SECONDS):
+        try:
+            _renew_leases()
+            # Claim only what this process's pool can start now
+            with _lock:
+                free = settings.BACKGROUND_JOB_WORKERS - len(_inflight)
+            for _ in range(free):
+                if _collection().count_documents(_due_filter(datetime.utcnow()), limit=1) == 0:
+                    break
+                _dispatch()
+        except Exception as e:
+            logger.warning("Background job poll failed: %s", e)
+
+
+def start():
+    """Start this process's poller, which resumes stored jobs and renews leases."""
+    global _poller
+    if _poller is not None and _poller.is_alive():
+        return
+    with _lock:
+        if _poller is None or not _poller.is_alive():
+            _stopping.clear()
+            _poller = threading.Thread(target=_poll, name='hrms-job-poll', daemon=True)
+            _poller.start()
+
+
+def stop():
+    """Stop polling. Jobs still running keep their lease until it expires; then another process resumes them."""
+    _stopping.set()
+
+
+def run_due():
+    """Run every due job in this thread until none is left; returns (finished, failed) counts."""
+    finished = failed = 0
+    while True:
+        job = _claim()
+        if job is None:
+            return finished, failed
+        if _execute(job):
+            finished += 1
+        else:
+            failed += 1
+
+
+def retry_failed():
+    """Queue failed jobs again with a fresh attempt count; returns how many."""
+    return _collection().update_many(
+        {'status': 'failed'},
+        {'$set': {'status': 'pending', 'attempts': 0, 'run_at': datetime.utcnow()},
+         '$unset': {'finished_at': ''}},
+    ).modified_count
+
+
+def stats():
+    """Job counts by status."""
+    counts = {status: 0 for status in ('pending', 'running', 'failed')}
+    for row in _collection().aggregate([
+        {'$match': {'status': {'$in': list(counts)}}},
+        {'$group': {'_id': '$status', 'count': {'$sum': 1}}},
+    ]):
+        counts[row['_id']] = row['count']
+    return counts
@@ -0,0 +1,114 @@
+"""
+Conditional GET (ETag / Last-Modified) for read endpoints.
+
+Every write path bumps the version stamp of the collection it changed
+(hrms.versions). A read endpoint declares which collections its payload
+depends on; the ETag is derived from those versions and the request URL,
+so a matching If-None-Match is answered with 304 Not Modified after one
+small lookup, without querying or serializing the dataset. With cache=True
+the other requests are served from the shared response cache, keyed on the
+same inputs (hrms.response_cache).
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import date, timezone
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from . import response_cache, versions
+
+logger = logging.getLogger(__name__)
+
+# Last-Modified is only sent once the newest write is older than this, so a
+# second-resolution HTTP date can never hide a write made in the same second
+LAST_MODIFIED_SETTLE_SECONDS = 1
+
+
+def _validators(request, stamps, daily):
+    """Build (etag, last_modified timestamp or None) from collection versions."""
+    parts = [request.get_full_path()]
+    latest = None
+    for name in sorted(stamps):
+        version, updated_at = stamps[name]
+        parts.append(f"{name}:{version}")
+        if updated_at is not None:
+            timestamp = updated_at.replace(tzinfo=timezone.utc).timestamp()
+            latest = timestamp if latest is None else max(latest, timestamp)
+    if daily:
+        parts.append(date.today().isoformat())
+    etag = '"' + hashlib.sha1('|'.join(parts).encode()).hexdigest() + '"'
+
+    last_modified = None
+    if latest is not None and not daily and time.time() - latest > LAST_MODIFIED_SETTLE_SECONDS:
+        last_modified = math.ceil(latest)
+    return etag, last_modified
+
+
+def _finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Let browsers keep the body but revalidate on every use
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def conditional_get(*collections, daily=False, cache=False):
+    """
+    Decorate a view whose GET payload depends only on `collections`.
+    Set daily=True when the payload also depends on today's date, and
+    cache=True to serve repeated GETs from the response cache.
+    Works on both the DRF views and the async ASGI views.
+    """
+    def decorator(view_func):
+        view = response_cache.view_name(view_func)
+
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+                try:
+                    stamps = await versions.aget_versions(collections)
+                except Exception as e:
+                    logger.warning("Skipping conditional GET, version lookup failed: %s", e)
+                    return await view_func(request, *args, **kwargs)
+                etag, last_modified = _validators(request, stamps, daily)
+                not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if not_modified is not None:
+                    return _finish(not_modified, etag, last_modified)
+                if cache and response_cache.enabled():
+                    response = await response_cache.afetch(
+                        view, response_cache.cache_key(view, etag), lambda: view_func(request, *args, **kwargs)
+                    )
+                else:
+                    response = await view_func(request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            try:
+                stamps = versions.get_versions(collections)
+            except Exception as e:
+                logger.warning("Skipping conditional GET, version lookup failed: %s", e)
+                return view_func(request, *args, **kwargs)
+            etag, last_modified = _validators(request, stamps, daily)
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return _finish(not_modified, etag, last_modified)
+            if cache and response_cache.enabled():
+                response = response_cache.fetch(
+                    view, response_cache.cache_key(view, etag), lambda: view_func(request, *args, **kwargs)
+                )
+            else:
+                response = view_func(request, *args, **kwargs)
+            return _finish(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -0,0 +1,116 @@
+"""
+Shared MongoDB document -> API dict formatting.
+
+A DocumentFormatter is declared once per output shape. It derives the
+MongoDB projection from the fields it emits, so queries only fetch what
+the API returns, and compiles the conversion into a single function
+producing one dict literal, so formatting a record costs one call with no
+per-field loops or branches on the caller's side.
+"""
+from datetime import datetime
+
+# Converters applied to source values
+OBJECT_ID = 'object_id'  # ObjectId -> str
+DATETIME = 'datetime'    # datetime -> ISO 8601 string with 'Z'; other values pass through
+DATE = 'date'            # datetime -> 'YYYY-MM-DD'; other values pass through
+
+
+class Field:
+    """Output key `name` read from document field `source` (default: same name)."""
+
+    def __init__(self, name, source=None, convert=None):
+        self.name = name
+        self.source = source or name
+        self.convert = convert
+
+
+class Nested:
+    """Output key `name` holding a dict built from `fields` of the same document."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+
+class Context:
+    """Output key `name` whose value is passed by the caller as a keyword argument."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class DocumentFormatter:
+    """Compiled document -> dict transformer with its matching projection."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.projection = self._build_projection(fields)
+        self.context_names = [field.name for field in fields if isinstance(field, Context)]
+        self._format = self._compile(fields)
+
+    def __call__(self, doc, **context):
+        return self._format(doc, **context)
+
+    def many(self, docs, **context):
+        """Format an iterable of documents into a list."""
+        if not context:
+            return list(map(self._format, docs))
+        fmt = self._format
+        return [fmt(doc, **context) for doc in docs]
+
+    def iter(self, docs, **context):
+        """Lazily format an iterable of documents."""
+        if not context:
+            return map(self._format, docs)
+        fmt = self._format
+        return (fmt(doc, **context) for doc in docs)
+
+    @staticmethod
+    def _build_projection(fields):
+        sources = DocumentFormatter._sources(fields)
+        projection = {source: 1 for source in sources}
+        # _id is returned by MongoDB unless excluded explicitly
+        if '_id' not in projection:
+            projection['_id'] = 0
+        return projection
+
+    @staticmethod
+    def _sources(fields):
+        sources = []
+        for field in fields:
+            if isinstance(field, Nested):
+                sources.extend(DocumentFormatter._sources(field.fields))
+            elif isinstance(field, Field):
+                sources.append(field.source)
+        return sources
+
+    @staticmethod
+    def _expression(fields, locals_):
+        items = []
+        for field in fields:
+            if isinstance(field, Nested):
+                value = DocumentFormatter._expression(field.fields, locals_)
+            elif isinstance(field, Context):
+                value = field.name
+            elif field.convert in (DATETIME, DATE):
+                # Bind the value once so the type check and conversion share it
+                local = f"_v{len(locals_)}"
+                locals_.append(f"{local} = doc.get({field.source!r})")
+                converted = f"{local}.isoformat() + 'Z'" if field.convert == DATETIME else f"{local}.strftime('%Y-%m-%d')"
+                value = f"({converted} if isinstance({local}, _datetime) else {local})"
+            elif field.convert == OBJECT_ID:
+                value = f"str(doc.get({field.source!r}))"
+            else:
+                value = f"doc.get({field.source!r})"
+            items.append(f"{field.name!r}: {value}")
+        return '{' + ', '.join(items) + '}'
+
+    def _compile(self, fields):
+        params = ''.join(f", {name}=None" for name in self.context_names)
+        locals_ = []
+        expression = self._expression(fields, locals_)
+        body = ''.join(f"    {line}\n" for line in locals_)
+        source = f"def _format(doc{params}):\n{body}    return {expression}\n"
+        namespace = {'_datetime': datetime}
+        exec(compile(source, '<DocumentFormatter>', 'exec'), namespace)
+        return namespace['_format']
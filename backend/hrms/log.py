@@ -0,0 +1,146 @@
+"""
+Logging helpers used by the LOGGING config in hrms/settings.py.
+
+QueueHandler hands records to a background thread that formats and writes
+them, so a request thread only pays for the level check, the message
+interpolation and a queue put - never for formatting or a blocking write
+to stderr. JsonFormatter emits one JSON object per line; SampleFilter
+thins out high-volume debug lines per call site.
+"""
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+
+import orjson
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extras, exception."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SampleFilter(logging.Filter):
+    """
+    Let through one in `rate` records at or below `level` from each call
+    site (file and line); records above `level` always pass. Counting is
+    per process and deliberately unlocked - the rate is approximate.
+    """
+
+    def __init__(self, rate=1, level=logging.DEBUG):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self.level = logging._checkLevel(level)
+        self._seen = {}
+
+    def filter(self, record):
+        if self.rate == 1 or record.levelno > self.level:
+            return True
+        key = (record.pathname, record.lineno)
+        count = self._seen.get(key, 0)
+        self._seen[key] = count + 1
+        return count % self.rate == 0
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a QueueListener thread that writes them to `stream`
+    (stderr by default) with this handler's formatter.
+
+    The queue is bounded by `queue_size` (0 = unbounded): when the writer
+    falls behind, records are dropped rather than blocking requests, and
+    the number dropped is logged once the queue has room again. The
+    listener is restarted in forked children (pre-fork servers).
+
+    Configure it with a '()' factory, not 'class': dictConfig on Python
+    3.12+ treats a QueueHandler subclass under 'class' as a stdlib
+    QueueHandler and fails on its arguments.
+    """
+
+    def __init__(self, queue_size=10000, stream=None):
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self.listener = None
+        self.closed = False
+        super().__init__(queue.Queue(queue_size))
+        self._start_listener()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start_listener(self):
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _after_fork(self):
+        if self.closed:
+            return
+        # The parent's writer thread does not exist here and the old queue's lock may be held
+        self.queue = queue.Queue(self.queue_size)
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Resolve the message and traceback now, while args and frames are
+        current; leave formatting to the listener.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.dropped:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                'Log queue full, dropped %s records', (self.dropped,), None,
+            )
+            try:
+                self.queue.put_nowait(self.prepare(notice))
+                self.dropped = 0
+            except queue.Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # Drain what is queued before the process exits (logging.shutdown closes handlers)
+        self.closed = True
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
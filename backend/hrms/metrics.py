@@ -0,0 +1,205 @@
+"""
+Prometheus metrics for HTTP requests and MongoDB commands.
+
+Request latency is recorded per view by MetricsMiddleware; MongoDB command
+latency, documents returned and connection pool wait time are recorded by
+pymongo monitoring listeners registered on the clients in hrms.mongodb and
+hrms.mongodb_async. Everything is exposed in the Prometheus text format at
+/metrics (hrms.views.metrics).
+
+Recording is a dictionary lookup and a histogram bucket increment per
+event, cheap enough to leave on under full load. Label values are bounded:
+URL pattern names rather than paths, command and collection names.
+
+Under multi-process servers (gunicorn/uvicorn workers) set
+PROMETHEUS_MULTIPROC_DIR to an empty, writable directory so /metrics
+aggregates every worker instead of reporting only the one that answered.
+"""
+import os
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from pymongo import monitoring
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'hrms_http_request_duration_seconds',
+    'Time spent producing a response, by view',
+    ['view', 'method', 'status'],
+)
+MONGO_COMMAND_DURATION = Histogram(
+    'hrms_mongodb_command_duration_seconds',
+    'MongoDB command round-trip time as reported by the driver',
+    ['command', 'collection'],
+    buckets=MONGO_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    'hrms_mongodb_command_failures_total',
+    'MongoDB commands that returned an error',
+    ['command', 'collection'],
+)
+MONGO_DOCUMENTS_RETURNED = Counter(
+    'hrms_mongodb_documents_returned_total',
+    'Documents returned in cursor batches',
+    ['command', 'collection'],
+)
+EMPLOYEE_CACHE_REQUESTS = Counter(
+    'hrms_employee_cache_requests_total',
+    'Employee directory cache lookups by result (hit or miss)',
+    ['result'],
+)
+EMPLOYEE_CACHE_ENTRIES = Gauge(
+    'hrms_employee_cache_entries',
+    'Employees held in the directory cache, summed over live processes',
+    multiprocess_mode='livesum',
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    'hrms_response_cache_requests_total',
+    'Response cache lookups by view and result (hit or miss)',
+    ['view', 'result'],
+)
+WRITE_BEHIND_RECORDS = Counter(
+    'hrms_write_behind_records_total',
+    'Records through a write-behind buffer by result '
+    '(buffered, overflow, written, discarded, duplicate, failed)',
+    ['buffer', 'result'],
+)
+MONGO_POOL_WAIT = Histogram(
+    'hrms_mongodb_pool_wait_seconds',
+    'Time spent waiting to check a connection out of the pool',
+    buckets=MONGO_BUCKETS,
+)
+
+# View label for requests that did not resolve to a URL pattern
+UNMATCHED = '<unmatched>'
+
+
+def render():
+    """Return the current metrics in the Prometheus text format."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+class MetricsMiddleware:
+    """Record the latency of every request, labelled with the resolved view name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _observe(request, response, elapsed):
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else UNMATCHED
+        HTTP_REQUEST_DURATION.labels(view, request.method, response.status_code).observe(elapsed)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Per-command and per-collection latency, failures and documents returned."""
+
+    def __init__(self):
+        # request_id -> collection, between a command's started and finished events
+        self._collections = {}
+
+    def started(self, event):
+        if event.command_name == 'getMore':
+            collection = event.command.get('collection', '')
+        else:
+            # find/insert/update/delete/aggregate/count... name the collection in their first field
+            collection = event.command.get(event.command_name)
+            if not isinstance(collection, str):
+                collection = ''
+        self._collections[event.request_id] = collection
+
+    def succeeded(self, event):
+        collection = self._collections.pop(event.request_id, '')
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+        cursor = event.reply.get('cursor') if isinstance(event.reply, dict) else None
+        if cursor:
+            batch = cursor.get('firstBatch', cursor.get('nextBatch'))
+            if batch:
+                MONGO_DOCUMENTS_RETURNED.labels(event.command_name, collection).inc(len(batch))
+
+    def failed(self, event):
+        collection = self._collections.pop(event.request_id, '')
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Time between asking the pool for a connection and getting one."""
+
+    def __init__(self):
+        # Check-out starts and completes on the same thread
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        if started is not None:
+            MONGO_POOL_WAIT.observe(time.perf_counter() - started)
+            self._local.started = None
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+def mongo_listeners():
+    """Event listeners to pass to MongoClient / AsyncIOMotorClient (none when disabled)."""
+    if not settings.METRICS_ENABLED:
+        return []
+    return [CommandMetrics(), PoolMetrics()]
@@ -1,18 +1,26 @@
 """
 MongoDB connection utility for direct pymongo usage.
 This bypasses Django ORM and uses pymongo directly for MongoDB operations.
+
+The client is created lazily, on the first database access in each
+process: importing this module does no I/O, and a client inherited
+across fork() (e.g. a pre-forking server with --preload) is discarded in
+the child, which opens its own. warm_up() connects ahead of the first
+request; gunicorn.conf.py and the ASGI lifespan call it in each worker.
 """
 import os
 import logging
+import time
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from django.conf import settings
+from .metrics import mongo_listeners
 
 logger = logging.getLogger(__name__)
 
 
 class MongoDB:
-    """MongoDB connection singleton with proper error handling."""
+    """MongoDB connection singleton (one client per process) with proper error handling."""
     _instance = None
     _client = None
     _db = None
@@ -32,13 +40,15 @@ class MongoDB:
                 raise ValueError(error_msg)
             
             try:
-                logger.info(f"Connecting to MongoDB: {settings.MONGO_DB_NAME}")
+                logger.info("Connecting to MongoDB: %s", settings.MONGO_DB_NAME)
                 # Add serverSelectionTimeoutMS for faster failure in production
                 self._client = MongoClient(
                     mongo_uri,
                     serverSelectionTimeoutMS=5000,
                     connectTimeoutMS=10000,
                     socketTimeoutMS=10000,
+                    event_listeners=mongo_listeners(),
+                    **self._pool_options()
                 )
                 self._db = self._client[settings.MONGO_DB_NAME]
                 
@@ -59,21 +69,59 @@ class MongoDB:
                 raise ValueError(error_msg)
         return self._db
 
+    @staticmethod
+    def _pool_options():
+        """Connection pool and compression options from settings (unset = pymongo default)."""
+        options = {
+            'maxPoolSize': settings.MONGO_MAX_POOL_SIZE,
+            'minPoolSize': settings.MONGO_MIN_POOL_SIZE,
+            'maxIdleTimeMS': settings.MONGO_MAX_IDLE_TIME_MS,
+            'waitQueueTimeoutMS': settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            'compressors': settings.MONGO_COMPRESSORS,
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
     def get_db(self):
-        """Get MongoDB database instance, reconnecting if necessary."""
+        """
+        Get MongoDB database instance, connecting on first use.
+
+        Liveness of the cluster is tracked by pymongo's background server
+        monitoring, so no per-call ping is issued; failed operations are
+        retried against a re-selected server by the driver itself.
+        """
         if self._db is None:
             self.connect()
-        else:
-            # Verify connection is still alive
-            try:
-                self._client.admin.command('ping')
-            except Exception as e:
-                logger.warning(f"MongoDB connection lost, reconnecting: {str(e)}")
-                self._client = None
-                self._db = None
-                self.connect()
         return self._db
 
+    def ping(self):
+        """Round-trip a ping to the cluster and return the latency in milliseconds."""
+        db = self.get_db()
+        start = time.perf_counter()
+        db.client.admin.command('ping')
+        return (time.perf_counter() - start) * 1000
+
+    def warm_up(self):
+        """
+        Connect and ping now rather than on the first request (MONGO_WARM_UP).
+        Failures are logged, not raised: the worker still starts and
+        connects on first use once the cluster is reachable.
+        """
+        if not settings.MONGO_WARM_UP:
+            return
+        try:
+            latency = self.ping()
+            logger.info("MongoDB warm-up done in process %s (ping %.1f ms)", os.getpid(), latency)
+        except Exception as e:
+            logger.warning("MongoDB warm-up failed in process %s: %s", os.getpid(), e)
+
+    def _after_fork(self):
+        """
+        Drop a client inherited from the parent process without closing it:
+        its sockets and monitor threads belong to the parent.
+        """
+        self._client = None
+        self._db = None
+
     def get_collection(self, collection_name):
         """Get a specific collection with connection verification."""
         try:
@@ -82,7 +130,7 @@ class MongoDB:
                 raise ValueError("MongoDB database connection not available")
             return db[collection_name]
         except Exception as e:
-            logger.error(f"Error getting collection {collection_name}: {str(e)}")
+            logger.error("Error getting collection %s: %s", collection_name, e)
             raise
 
     def close(self):
@@ -92,18 +140,14 @@ class MongoDB:
                 self._client.close()
                 logger.info("MongoDB connection closed")
             except Exception as e:
-                logger.error(f"Error closing MongoDB connection: {str(e)}")
+                logger.error("Error closing MongoDB connection: %s", e)
             finally:
                 self._client = None
                 self._db = None
 
 
-# Global MongoDB instance
+# Global MongoDB instance; connects on first use
 mongodb = MongoDB()
 
-# Initialize connection at module import (important for production)
-try:
-    mongodb.connect()
-except Exception as e:
-    logger.error(f"Failed to initialize MongoDB connection: {str(e)}")
-    # Don't raise here - let it fail on first use instead
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=mongodb._after_fork)
@@ -0,0 +1,73 @@
+"""
+Async MongoDB connection for the ASGI request path, using Motor.
+Mirrors hrms.mongodb but never blocks the event loop on I/O.
+"""
+import logging
+import os
+from motor.motor_asyncio import AsyncIOMotorClient
+from django.conf import settings
+from .metrics import mongo_listeners
+from .mongodb import MongoDB
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongoDB:
+    """Motor client holder; opened and closed by the ASGI lifespan."""
+    _client = None
+    _db = None
+
+    def connect(self):
+        """Create the Motor client (no I/O happens until the first operation)."""
+        if self._client is None:
+            mongo_uri = settings.MONGO_URI
+            if not mongo_uri:
+                error_msg = "MONGO_URI not set in environment variables"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            logger.info("Connecting to MongoDB (async): %s", settings.MONGO_DB_NAME)
+            self._client = AsyncIOMotorClient(
+                mongo_uri,
+                serverSelectionTimeoutMS=5000,
+                connectTimeoutMS=10000,
+                socketTimeoutMS=10000,
+                event_listeners=mongo_listeners(),
+                **MongoDB._pool_options()
+            )
+            self._db = self._client[settings.MONGO_DB_NAME]
+        return self._db
+
+    async def startup(self):
+        """Connect and verify the cluster is reachable (ASGI lifespan startup)."""
+        db = self.connect()
+        try:
+            await db.client.admin.command('ping')
+            logger.info("MongoDB async connection successful")
+        except Exception as e:
+            # Keep serving: the driver reconnects once the cluster is back
+            logger.error("MongoDB async ping failed at startup: %s", e)
+
+    def get_collection(self, collection_name):
+        """Get a Motor collection, connecting lazily if lifespan did not run."""
+        db = self._db if self._db is not None else self.connect()
+        return db[collection_name]
+
+    def _after_fork(self):
+        """Drop a client inherited from the parent process (see MongoDB._after_fork)."""
+        self._client = None
+        self._db = None
+
+    def close(self):
+        """Close the Motor client (ASGI lifespan shutdown)."""
+        if self._client is not None:
+            self._client.close()
+            logger.info("MongoDB async connection closed")
+        self._client = None
+        self._db = None
+
+
+# Global async MongoDB instance
+async_mongodb = AsyncMongoDB()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=async_mongodb._after_fork)
@@ -0,0 +1,52 @@
+"""
+Keyset (cursor) pagination helpers for MongoDB list endpoints.
+Cursors are opaque to clients and encode the sort key of the last row served.
+"""
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def parse_limit(raw_limit):
+    """Parse the ?limit= query parameter, clamped to MAX_PAGE_SIZE."""
+    if raw_limit in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a positive integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(created_at, object_id):
+    """Encode a (created_at, _id) sort key as an opaque URL-safe token."""
+    payload = json.dumps([created_at.isoformat(), str(object_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by encode_cursor back to (created_at, ObjectId)."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, object_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+    except (TypeError, ValueError, InvalidId, UnicodeDecodeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_filter(cursor):
+    """Build the query that resumes a (created_at desc, _id desc) scan after cursor."""
+    created_at, object_id = decode_cursor(cursor)
+    return {
+        '$or': [
+            {'created_at': {'$lt': created_at}},
+            {'created_at': created_at, '_id': {'$lt': object_id}},
+        ]
+    }
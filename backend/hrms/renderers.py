@@ -0,0 +1,48 @@
+"""
+orjson-backed JSON rendering for DRF and the plain Django views.
+
+Output matches rest_framework.renderers.JSONRenderer (compact, UTF-8,
+U+2028/U+2029 escaped) so clients see the same bytes, but datetime and
+ObjectId values are serialized natively: naive datetimes (as returned by
+pymongo) are treated as UTC and written as ISO 8601 with a trailing 'Z',
+and ObjectIds as their hex string.
+"""
+import orjson
+from bson import ObjectId
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    # Decimal, UUID, lazy translation strings, querysets... as DRF does
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data, indent=False):
+    """Serialize data to JSON bytes."""
+    option = OPTIONS | orjson.OPT_INDENT_2 if indent else OPTIONS
+    ret = orjson.dumps(data, default=_default, option=option)
+    # Keep output a strict JavaScript subset, like DRF's JSONRenderer
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Renderer which serializes to JSON with orjson."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Honour ?indent / 'application/json; indent=N' like JSONRenderer (always 2 spaces)
+        indent = JSONRenderer().get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
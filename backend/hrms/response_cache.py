@@ -0,0 +1,106 @@
+"""
+Shared response cache for read endpoints, on Django's cache framework
+(the "responses" alias in settings.CACHES: local memory by default, or a
+file or Redis backend shared by every worker).
+
+Used by hrms.conditional: an entry is keyed on the view, the full request
+path with its query string and the version stamps the response depends on
+(the same inputs as its ETag). Writers bump those stamps through the
+services' _mark_changed hooks, so a write makes exactly the entries that
+depend on the collection it changed unreachable - in every process, even
+with a per-process cache - and they age out via the cache's own TTL/LRU.
+
+Only complete 200 responses up to RESPONSE_CACHE_MAX_BYTES are stored;
+streaming responses pass through. Hits and misses are counted per view in
+hrms.metrics (hrms_response_cache_requests_total).
+"""
+import logging
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from .metrics import RESPONSE_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'responses'
+
+
+def enabled():
+    return settings.RESPONSE_CACHE_ENABLED
+
+
+def view_name(view_func):
+    """Dotted name of a view; DRF's @api_view keeps the function's on .cls."""
+    view_func = getattr(view_func, 'cls', view_func)
+    return f'{view_func.__module__}.{view_func.__name__}'
+
+
+def cache_key(view, etag):
+    return f'response:{view}:{etag}'
+
+
+def _entry(response):
+    """(status, headers, body) of a response worth caching, else None."""
+    if response.status_code != 200 or response.streaming:
+        return None
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    if len(response.content) > settings.RESPONSE_CACHE_MAX_BYTES:
+        return None
+    return response.status_code, list(response.items()), response.content
+
+
+def _response(entry):
+    status, headers, body = entry
+    response = HttpResponse(body, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def _record(view, hit):
+    RESPONSE_CACHE_REQUESTS.labels(view, 'hit' if hit else 'miss').inc()
+
+
+def fetch(view, key, produce):
+    """Return the cached response for key, or produce() one and cache it."""
+    cache = caches[CACHE_ALIAS]
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.warning("Response cache read failed: %s", e)
+        return produce()
+    _record(view, entry is not None)
+    if entry is not None:
+        return _response(entry)
+
+    response = produce()
+    entry = _entry(response)
+    if entry is not None:
+        try:
+            cache.set(key, entry)
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+    return response
+
+
+async def afetch(view, key, produce):
+    """Async variant of fetch; produce is a coroutine function."""
+    cache = caches[CACHE_ALIAS]
+    try:
+        entry = await cache.aget(key)
+    except Exception as e:
+        logger.warning("Response cache read failed: %s", e)
+        return await produce()
+    _record(view, entry is not None)
+    if entry is not None:
+        return _response(entry)
+
+    response = await produce()
+    entry = _entry(response)
+    if entry is not None:
+        try:
+            await cache.aset(key, entry)
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+    return response
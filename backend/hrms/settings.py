@@ -4,7 +4,9 @@ Production ready (Render + Vercel + MongoDB Atlas)
 """
 
 import os
+import tempfile
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -29,6 +31,11 @@ for host in production_hosts:
     if host not in ALLOWED_HOSTS:
         ALLOWED_HOSTS.append(host)
 
+# API-only profile: the JSON API uses no admin, sessions, messages, CSRF,
+# auth or templates, and keeps its data in MongoDB. HRMS_API_ONLY=True drops
+# those apps and middleware and the SQLite database (no /admin/).
+API_ONLY = os.getenv("HRMS_API_ONLY", "False") == "True"
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -47,8 +54,23 @@ INSTALLED_APPS = [
     "attendance",
 ]
 
+if API_ONLY:
+    # staticfiles stays so `collectstatic` in deploy scripts keeps working
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+        "django.contrib.admin",
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+    )]
+
+# The ASGI entry point (hrms/asgi.py) sets HRMS_ASYNC_VIEWS to serve hot reads asynchronously
+ASYNC_VIEWS = os.getenv("HRMS_ASYNC_VIEWS", "False") == "True"
+
 # Middleware (CORS must be at the top)
 MIDDLEWARE = [
+    # First, so the recorded latency covers every other middleware
+    "hrms.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -60,7 +82,19 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "hrms.urls"
+if API_ONLY:
+    MIDDLEWARE = [
+        "hrms.metrics.MetricsMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.common.CommonMiddleware",
+    ]
+elif ASYNC_VIEWS:
+    # WhiteNoise is sync-only: with it in the chain Django would run every
+    # async view in a thread. Serve /static/ from the proxy or CDN instead.
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
+ROOT_URLCONF = "hrms.urls_async" if ASYNC_VIEWS else "hrms.urls"
 
 # Templates
 TEMPLATES = [
@@ -79,6 +113,9 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    TEMPLATES = []
+
 WSGI_APPLICATION = "hrms.wsgi.application"
 
 # Database (SQLite only for admin/auth)
@@ -88,11 +125,120 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+if API_ONLY:
+    DATABASES = {}
 
 # MongoDB Atlas (for app data via pymongo)
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "hrms")
 
+
+def _env_int(name, default=None):
+    """Read an optional integer environment variable."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# MongoDB connection pool (unset values fall back to pymongo defaults)
+MONGO_MAX_POOL_SIZE = _env_int("MONGO_MAX_POOL_SIZE")
+MONGO_MIN_POOL_SIZE = _env_int("MONGO_MIN_POOL_SIZE")
+MONGO_MAX_IDLE_TIME_MS = _env_int("MONGO_MAX_IDLE_TIME_MS")
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+# Wire compression, e.g. "zstd,snappy,zlib" (zstd/snappy need extra packages)
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS") or None
+
+# Connect to MongoDB when a worker starts (gunicorn.conf.py, ASGI lifespan)
+# instead of on its first request; failures are logged, not fatal
+MONGO_WARM_UP = os.getenv("MONGO_WARM_UP", "True") == "True"
+
+# In-process employee lookup cache used by attendance (size 0 disables it)
+EMPLOYEE_CACHE_SIZE = _env_int("EMPLOYEE_CACHE_SIZE", 10000)
+EMPLOYEE_CACHE_TTL_SECONDS = _env_int("EMPLOYEE_CACHE_TTL_SECONDS", 300)
+# "version": invalidations reach every worker via a MongoDB version stamp
+# "local": only the worker that made the change; others wait for the TTL
+EMPLOYEE_CACHE_CONSISTENCY = os.getenv("EMPLOYEE_CACHE_CONSISTENCY", "version")
+EMPLOYEE_CACHE_VERSION_CHECK_SECONDS = _env_int("EMPLOYEE_CACHE_VERSION_CHECK_SECONDS", 5)
+
+# Deleting an employee also removes ("delete") or moves to attendance_archive
+# ("archive") their attendance, in batches of EMPLOYEE_CASCADE_BATCH_SIZE.
+# Histories longer than EMPLOYEE_CASCADE_BACKGROUND_THRESHOLD records are
+# cleaned up by a background job after the response is sent.
+EMPLOYEE_DELETE_CASCADE = os.getenv("EMPLOYEE_DELETE_CASCADE", "delete")
+EMPLOYEE_CASCADE_BATCH_SIZE = _env_int("EMPLOYEE_CASCADE_BATCH_SIZE", 1000)
+EMPLOYEE_CASCADE_BACKGROUND_THRESHOLD = _env_int("EMPLOYEE_CASCADE_BACKGROUND_THRESHOLD", 5000)
+
+# Background jobs (hrms/background.py) are stored in MongoDB and run by
+# BACKGROUND_JOB_WORKERS threads per process. Every BACKGROUND_JOB_POLL_SECONDS
+# each process picks up jobs left behind by a restart; a failing job runs at
+# most BACKGROUND_JOB_MAX_ATTEMPTS times.
+BACKGROUND_JOB_WORKERS = _env_int("BACKGROUND_JOB_WORKERS", 1)
+BACKGROUND_JOB_POLL_SECONDS = _env_int("BACKGROUND_JOB_POLL_SECONDS", 5)
+BACKGROUND_JOB_MAX_ATTEMPTS = _env_int("BACKGROUND_JOB_MAX_ATTEMPTS", 5)
+BACKGROUND_JOB_RETENTION_DAYS = _env_int("BACKGROUND_JOB_RETENTION_DAYS", 7)
+
+# Attendance dates are stored as native BSON dates (schema version 2). While
+# documents written as 'YYYY-MM-DD' strings remain, queries match both forms;
+# set to False once `python manage.py migrate_attendance_schema` has finished.
+ATTENDANCE_LEGACY_DATES = os.getenv("ATTENDANCE_LEGACY_DATES", "True") == "True"
+
+# Write-behind attendance ingestion (hrms/write_behind.py): POST
+# /api/attendance/ commits the record to a SQLite journal on local disk and
+# returns 202; a thread in each worker writes the journal to MongoDB in
+# batches. Keep the journal on a persistent disk; workers on a host share it.
+# With ATTENDANCE_BUFFER_MAX_PENDING records waiting, requests write to
+# MongoDB directly until the flushers catch up. Requires
+# ATTENDANCE_LEGACY_DATES=False: only the unique index on native dates catches
+# a duplicate the buffered path lets through.
+ATTENDANCE_WRITE_BEHIND = os.getenv("ATTENDANCE_WRITE_BEHIND", "False") == "True"
+if ATTENDANCE_WRITE_BEHIND and ATTENDANCE_LEGACY_DATES:
+    raise ImproperlyConfigured(
+        "ATTENDANCE_WRITE_BEHIND requires ATTENDANCE_LEGACY_DATES=False; "
+        "run `python manage.py migrate_attendance_schema` first"
+    )
+ATTENDANCE_BUFFER_PATH = os.getenv("ATTENDANCE_BUFFER_PATH") or str(BASE_DIR / "attendance-buffer.sqlite3")
+ATTENDANCE_BUFFER_MAX_PENDING = _env_int("ATTENDANCE_BUFFER_MAX_PENDING", 10000)
+ATTENDANCE_BUFFER_BATCH_SIZE = _env_int("ATTENDANCE_BUFFER_BATCH_SIZE", 500)
+ATTENDANCE_BUFFER_FLUSH_INTERVAL_MS = _env_int("ATTENDANCE_BUFFER_FLUSH_INTERVAL_MS", 200)
+ATTENDANCE_BUFFER_MAX_ATTEMPTS = _env_int("ATTENDANCE_BUFFER_MAX_ATTEMPTS", 5)
+
+# Response cache for the busiest read endpoints (hrms/response_cache.py).
+# Entries are keyed on the version stamps writes bump, so they never serve
+# data older than the last write, even with the per-process locmem backend.
+# "file" and "redis" are shared by all workers on a host / everywhere;
+# redis needs the redis package and works with any Redis-compatible server.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "locmem")
+RESPONSE_CACHE_LOCATION = os.getenv("RESPONSE_CACHE_LOCATION") or {
+    "locmem": "hrms-responses",
+    "file": os.path.join(tempfile.gettempdir(), "hrms-response-cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+}.get(RESPONSE_CACHE_BACKEND)
+RESPONSE_CACHE_TTL_SECONDS = _env_int("RESPONSE_CACHE_TTL_SECONDS", 300)
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 500)
+# Larger responses (e.g. the unfiltered attendance list) are not cached
+RESPONSE_CACHE_MAX_BYTES = _env_int("RESPONSE_CACHE_MAX_BYTES", 5 * 1024 * 1024)
+
+_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": {
+        "BACKEND": _CACHE_BACKENDS[RESPONSE_CACHE_BACKEND],
+        "LOCATION": RESPONSE_CACHE_LOCATION,
+        "TIMEOUT": RESPONSE_CACHE_TTL_SECONDS,
+        "KEY_PREFIX": "hrms",
+    },
+}
+if RESPONSE_CACHE_BACKEND != "redis":
+    # Redis evicts by its own maxmemory policy
+    CACHES["responses"]["OPTIONS"] = {"MAX_ENTRIES": RESPONSE_CACHE_MAX_ENTRIES}
+
+# Request and MongoDB metrics served at /metrics (hrms/metrics.py)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -115,14 +261,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework - Disable CSRF for API endpoints
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "hrms.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "hrms.parsers.ORJSONParser",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [],  # No auth for now
     "DEFAULT_PERMISSION_CLASSES": [],  # No permissions for now
 }
+if API_ONLY:
+    # request.user would otherwise be django.contrib.auth's AnonymousUser
+    REST_FRAMEWORK["UNAUTHENTICATED_USER"] = None
 
 # CORS Configuration for Production (DO NOT rely on DEBUG)
 CORS_ALLOW_ALL_ORIGINS = False
@@ -184,6 +333,14 @@ for origin in production_origins:
 SECURE_CROSS_ORIGIN_OPENER_POLICY = None
 
 # Logging Configuration
+# Records are written by a background thread (hrms.log.QueueHandler), so
+# request threads never block on stderr. LOG_FORMAT is json (one object per
+# line) or text; debug lines are sampled to 1 in LOG_DEBUG_SAMPLE_RATE per
+# call site; LOG_QUEUE_SIZE bounds the queue (records beyond it are dropped).
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_DEBUG_SAMPLE_RATE = int(os.getenv("LOG_DEBUG_SAMPLE_RATE", "100"))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -192,11 +349,24 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'hrms.log.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sample_debug': {
+            '()': 'hrms.log.SampleFilter',
+            'rate': LOG_DEBUG_SAMPLE_RATE,
+        },
     },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            # A '()' factory: from Python 3.12, dictConfig special-cases any
+            # QueueHandler subclass given as 'class' and rejects its arguments
+            '()': 'hrms.log.QueueHandler',
+            'queue_size': LOG_QUEUE_SIZE,
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'verbose',
+            'filters': ['sample_debug'],
         },
     },
     'root': {
@@ -0,0 +1,59 @@
+"""
+Incremental JSON output for large list endpoints.
+Lets views stream a pymongo (or, from async views, Motor) cursor to the
+client without materialising it.
+"""
+from django.http import StreamingHttpResponse
+from .renderers import dumps
+
+# Number of records serialized per chunk written to the socket
+STREAM_CHUNK_SIZE = 500
+
+
+def iter_json_array(records, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield a JSON array as encoded chunks, one chunk per `chunk_size` records.
+    Output matches the API renderer (hrms.renderers).
+    """
+    buffer = [b'[']
+    first = True
+    for record in records:
+        if not first:
+            buffer.append(b',')
+        buffer.append(dumps(record))
+        first = False
+        if len(buffer) >= chunk_size * 2:
+            yield b''.join(buffer)
+            buffer = []
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+async def aiter_json_array(records, chunk_size=STREAM_CHUNK_SIZE):
+    """Async variant of iter_json_array over an async iterable of dicts."""
+    buffer = [b'[']
+    first = True
+    async for record in records:
+        if not first:
+            buffer.append(b',')
+        buffer.append(dumps(record))
+        first = False
+        if len(buffer) >= chunk_size * 2:
+            yield b''.join(buffer)
+            buffer = []
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+def streaming_json_response(records, status=200):
+    """
+    Wrap an iterable of dicts in a StreamingHttpResponse emitting a JSON array.
+    Pass an async iterable from async views: under ASGI Django would read a
+    sync iterator into memory before sending it.
+    """
+    chunks = aiter_json_array(records) if hasattr(records, '__aiter__') else iter_json_array(records)
+    return StreamingHttpResponse(
+        chunks,
+        status=status,
+        content_type='application/json',
+    )
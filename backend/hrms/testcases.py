@@ -0,0 +1,33 @@
+"""
+Base test case for code that talks to MongoDB.
+
+Each test gets a fresh in-memory mongomock database behind the shared
+mongodb singleton and an empty employee cache; the response cache is off so
+version stamps restarting at 0 in every test cannot serve another test's
+response. Needs mongomock (requirements-dev.txt).
+"""
+import mongomock
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from .mongodb import mongodb
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class MongoTestCase(SimpleTestCase):
+    """SimpleTestCase with self.db, a fresh mongomock database used by every service."""
+
+    def setUp(self):
+        super().setUp()
+        # Local import: the services import this package
+        from employees.services import employee_directory
+        saved = (mongodb._client, mongodb._db)
+        client = mongomock.MongoClient()
+        mongodb._client, mongodb._db = client, client[settings.MONGO_DB_NAME]
+        self.addCleanup(self._restore, saved)
+        employee_directory.clear()
+        employee_directory._version = None
+        self.db = mongodb._db
+
+    @staticmethod
+    def _restore(saved):
+        mongodb._client, mongodb._db = saved
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import override_settings
+
+from . import background
+from .testcases import MongoTestCase
+
+calls = []
+
+
+def record_call(*args, **kwargs):
+    calls.append((args, kwargs))
+    return len(calls)
+
+
+def always_fail():
+    raise RuntimeError('boom')
+
+
+@override_settings(BACKGROUND_JOB_MAX_ATTEMPTS=2)
+class BackgroundJobTests(MongoTestCase):
+    """Stored jobs run by hand: run_due() and _claim() stand in for the poller."""
+
+    def setUp(self):
+        super().setUp()
+        calls.clear()
+        # No poller thread or pool: tests claim and run jobs themselves
+        for name in ('start', '_dispatch'):
+            patcher = mock.patch.object(background, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.jobs = self.db[background.COLLECTION_NAME]
+
+    def job(self, job_id):
+        return self.jobs.find_one({'_id': job_id})
+
+    def test_pending_job_is_run_after_a_restart(self):
+        job_id = background.submit('record', record_call, 1, flag=True)
+        self.assertEqual(self.job(job_id)['status'], 'pending')  # its process died before running it
+
+        self.assertEqual(background.run_due(), (1, 0))
+
+        self.assertEqual(calls, [((1,), {'flag': True})])
+        job = self.job(job_id)
+        self.assertEqual((job['status'], job['result'], job['attempts']), ('done', 1, 1))
+        self.assertIsNotNone(job['finished_at'])
+
+    def test_delayed_job_waits_until_it_is_due(self):
+        job_id = background.submit_later('record', 60, record_call)
+        background._dispatch.assert_not_called()
+
+        self.assertEqual(background.run_due(), (0, 0))
+        self.jobs.update_one({'_id': job_id}, {'$set': {'run_at': datetime.utcnow()}})
+        self.assertEqual(background.run_due(), (1, 0))
+        self.assertEqual(len(calls), 1)
+
+    def test_running_job_is_taken_over_only_after_its_lease_expires(self):
+        job_id = background.submit('record', record_call)
+        self.jobs.update_one({'_id': job_id}, {'$set': {
+            'status': 'running', 'owner': 'dead-host:1', 'attempts': 1,
+            'lease_until': datetime.utcnow() + timedelta(seconds=background.LEASE_SECONDS),
+        }})
+        self.assertIsNone(background._claim())
+
+        self.jobs.update_one({'_id': job_id}, {'$set': {'lease_until': datetime.utcnow() - timedelta(seconds=1)}})
+        job = background._claim()
+        self.assertEqual((job['_id'], job['owner'], job['attempts']), (job_id, background._owner(), 2))
+        self.assertTrue(background._execute(job))
+        self.assertEqual(self.job(job_id)['status'], 'done')
+
+    def test_job_abandoned_too_often_is_failed_without_running(self):
+        job_id = background.submit('record', record_call)
+        self.jobs.update_one({'_id': job_id}, {'$set': {
+            'status': 'running', 'owner': 'dead-host:1', 'attempts': 2,
+            'lease_until': datetime.utcnow() - timedelta(seconds=1),
+        }})
+
+        self.assertEqual(background.run_due(), (0, 1))
+
+        self.assertEqual(calls, [])
+        job = self.job(job_id)
+        self.assertEqual((job['status'], job['error']), ('failed', 'abandoned 2 times'))
+
+    def test_failing_job_is_retried_later_then_kept_as_failed(self):
+        job_id = background.submit('fail', always_fail)
+
+        self.assertEqual(background.run_due(), (0, 1))
+        job = self.job(job_id)
+        self.assertEqual((job['status'], job['attempts'], job['error']), ('pending', 1, 'boom'))
+        self.assertGreater(job['run_at'], datetime.utcnow())
+        self.assertIsNone(job['lease_until'])
+
+        self.assertEqual(background.run_due(), (0, 0))  # not due yet
+        self.jobs.update_one({'_id': job_id}, {'$set': {'run_at': datetime.utcnow()}})
+        self.assertEqual(background.run_due(), (0, 1))
+        self.assertEqual(self.job(job_id)['status'], 'failed')
+        self.assertEqual(background.stats(), {'pending': 0, 'running': 0, 'failed': 1})
+
+        self.assertEqual(background.retry_failed(), 1)
+        job = self.job(job_id)
+        self.assertEqual((job['status'], job['attempts']), ('pending', 0))
+        self.assertNotIn('finished_at', job)
+
+    def test_function_must_be_importable_by_name(self):
+        with self.assertRaisesMessage(ValueError, 'not importable by name'):
+            background.submit('lambda', lambda: None)
+        self.assertEqual(self.jobs.count_documents({}), 0)
@@ -1,13 +1,20 @@
 """
 URL configuration for HRMS project.
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 from attendance.views import dashboard_stats
+from .views import health_live, health_ready, metrics
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/employees/', include('employees.urls')),
     path('api/attendance/', include('attendance.urls')),
     path('api/dashboard/', dashboard_stats, name='dashboard_stats'),
+    path('api/health/live/', health_live, name='health_live'),
+    path('api/health/ready/', health_ready, name='health_ready'),
+    path('metrics', metrics, name='metrics'),
 ]
+
+if not settings.API_ONLY:
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -0,0 +1,40 @@
+"""
+URL configuration for the ASGI application.
+
+Same routes as hrms.urls, with the hot read endpoints swapped for async
+views (matched by URL name) so they await MongoDB instead of holding a
+worker thread. Every other route keeps its synchronous DRF view.
+"""
+from django.urls import URLPattern, URLResolver
+from attendance import async_views as attendance_async_views
+from employees import async_views as employee_async_views
+from . import urls
+
+ASYNC_VIEWS = {
+    'employee_list_create': employee_async_views.employee_list_create,
+    'list_all_attendance': attendance_async_views.list_all_attendance,
+    'get_employee_attendance': attendance_async_views.get_employee_attendance,
+    'dashboard_stats': attendance_async_views.dashboard_stats,
+}
+
+
+def _swap_views(patterns):
+    """Copy a URL pattern tree, replacing callbacks whose name is in ASYNC_VIEWS."""
+    swapped = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            swapped.append(URLResolver(
+                pattern.pattern,
+                _swap_views(pattern.url_patterns),
+                pattern.default_kwargs,
+                pattern.app_name,
+                pattern.namespace,
+            ))
+        elif isinstance(pattern, URLPattern) and pattern.name in ASYNC_VIEWS:
+            swapped.append(URLPattern(pattern.pattern, ASYNC_VIEWS[pattern.name], pattern.default_args, pattern.name))
+        else:
+            swapped.append(pattern)
+    return swapped
+
+
+urlpatterns = _swap_views(urls.urlpatterns)
@@ -0,0 +1,43 @@
+"""
+Monotonic version stamps stored in MongoDB.
+Writers bump a named stamp; other processes compare it to detect changes.
+"""
+from datetime import datetime
+from pymongo import ReturnDocument
+from .mongodb import mongodb
+
+COLLECTION_NAME = 'collection_versions'
+
+
+def get_version(name):
+    """Return the current version of a named stamp (0 if never bumped)."""
+    doc = mongodb.get_collection(COLLECTION_NAME).find_one({'_id': name})
+    return doc['version'] if doc else 0
+
+
+def get_versions(names):
+    """Return {name: (version, updated_at)} for several stamps in one query."""
+    found = {name: (0, None) for name in names}
+    for doc in mongodb.get_collection(COLLECTION_NAME).find({'_id': {'$in': list(names)}}):
+        found[doc['_id']] = (doc['version'], doc.get('updated_at'))
+    return found
+
+
+async def aget_versions(names):
+    """Async variant of get_versions for the ASGI views."""
+    from .mongodb_async import async_mongodb
+    found = {name: (0, None) for name in names}
+    async for doc in async_mongodb.get_collection(COLLECTION_NAME).find({'_id': {'$in': list(names)}}):
+        found[doc['_id']] = (doc['version'], doc.get('updated_at'))
+    return found
+
+
+def bump_version(name):
+    """Atomically increment a named stamp and return the new version."""
+    doc = mongodb.get_collection(COLLECTION_NAME).find_one_and_update(
+        {'_id': name},
+        {'$inc': {'version': 1}, '$set': {'updated_at': datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc['version']
@@ -0,0 +1,65 @@
+"""
+Project-level views: liveness and readiness probes, Prometheus metrics.
+"""
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from django.views.decorators.csrf import csrf_exempt
+from .mongodb import mongodb
+from . import metrics as app_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def health_live(request):
+    """
+    Liveness probe - the process is up and serving requests.
+    
+    GET /api/health/live/
+    Does not touch MongoDB.
+    """
+    return Response({"status": "ok"}, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([AllowAny])  # Disable authentication for this endpoint
+def health_ready(request):
+    """
+    Readiness probe - MongoDB is reachable.
+    
+    GET /api/health/ready/
+    Returns: {"status": "ok", "mongodb_ping_ms": float} or 503 when unreachable.
+    """
+    try:
+        latency_ms = mongodb.ping()
+        return Response(
+            {"status": "ok", "mongodb_ping_ms": round(latency_ms, 2)},
+            status=status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        return Response(
+            {"status": "unavailable", "error": str(e)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint.
+    
+    GET /metrics
+    Request latency per view and MongoDB command/pool metrics, in the
+    Prometheus text exposition format (see hrms/metrics.py).
+    """
+    return HttpResponse(app_metrics.render(), content_type=CONTENT_TYPE_LATEST)
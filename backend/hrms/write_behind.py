@@ -0,0 +1,359 @@
+"""
+Write-behind buffer: a durable local journal in front of a MongoDB collection.
+
+append() commits a finished document to a SQLite journal on local disk and
+returns; a background thread in each process writes journal entries to
+MongoDB in unordered bulk_write batches and deletes them once MongoDB has
+acknowledged them. A burst of writes is absorbed at local disk speed and
+reaches MongoDB as a few large batches instead of one round trip each.
+
+- Durability: an entry is committed (WAL, synchronous=FULL) before append()
+  returns, and only removed after its batch was written.
+- Duplicates: every entry has a key (e.g. employee_id and date) that is
+  unique in the journal, so a repeat of an entry still waiting raises
+  DuplicateKeyError at once, like MongoDB's unique index would. An entry
+  duplicating a document already in MongoDB is dropped at flush, logged
+  and counted: append() never waits on MongoDB.
+- Crash recovery: flushers claim entries with a lease. Entries claimed by a
+  process that died are picked up by any process sharing the journal once
+  the lease expires. Documents get their _id at append(), so a batch
+  written just before a crash is recognised as already stored, not as
+  duplicates, and on_written is called for it again: it must be idempotent.
+- Backpressure: with max_pending entries waiting, append() returns False
+  and the caller writes to MongoDB itself, so producers slow down to
+  MongoDB's pace instead of growing the journal without bound. While
+  MongoDB is unreachable flushers back off exponentially.
+
+Entries that fail max_attempts times with any other write error move to
+the journal's `failed` table; retry_failed() puts them back.
+
+Every process on a host can share one journal file. Documents become
+visible to readers when they are flushed, not when append() returns.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import bson
+from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, PyMongoError
+from .metrics import WRITE_BEHIND_RECORDS
+from .mongodb import mongodb
+
+logger = logging.getLogger(__name__)
+
+# A claimed batch is retried by another flusher after this long; must
+# comfortably exceed one bulk_write (socketTimeoutMS is 10 s)
+LEASE_SECONDS = 60
+
+# Upper bound on the wait between flush attempts while MongoDB is failing
+MAX_BACKOFF_SECONDS = 30
+
+# Seconds a writer waits for another process's journal transaction
+JOURNAL_TIMEOUT_SECONDS = 30
+
+# MongoDB could not be reached: mongodb.get_collection raises ValueError
+# when it cannot connect, pymongo a ConnectionFailure (including timeouts)
+UNREACHABLE_ERRORS = (ConnectionFailure, ValueError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    document BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS failed (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    document BLOB NOT NULL,
+    error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+_buffers = []
+
+
+class WriteBehindBuffer:
+    """Journal-backed write-behind buffer for one MongoDB collection."""
+
+    def __init__(self, name, collection_name, path, on_written=None, enabled=True,
+                 max_pending=10000, batch_size=500, flush_interval=0.2, max_attempts=5):
+        self.name = name
+        self.collection_name = collection_name
+        self.path = path
+        self.on_written = on_written
+        self.enabled = enabled
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Threads of one process queue here rather than in SQLite's busy
+        # handler, which sleeps in steps of up to 100 ms between retries
+        self._journal_lock = threading.Lock()
+        self._reset()
+        _buffers.append(self)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def _connection(self):
+        """This thread's journal connection (autocommit; transactions are explicit)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=JOURNAL_TIMEOUT_SECONDS,
+                                         isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self, work):
+        """Run work(connection) in an IMMEDIATE transaction and return its result."""
+        connection = self._connection()
+        with self._journal_lock:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                result = work(connection)
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        return result
+
+    def append(self, key, document):
+        """
+        Journal document (assigning its _id) for a later bulk write. Returns
+        False when the buffer is disabled or full: the caller writes it itself.
+        Raises DuplicateKeyError if an entry with the same key is waiting.
+        """
+        if not self.enabled:
+            return False
+        document.setdefault('_id', ObjectId())
+
+        def insert(connection):
+            if connection.execute('SELECT 1 FROM pending WHERE key = ?', (key,)).fetchone():
+                raise DuplicateKeyError(f"{self.name} entry {key} is already buffered", 11000)
+            (pending,) = connection.execute('SELECT count(*) FROM pending').fetchone()
+            if pending >= self.max_pending:
+                return None
+            connection.execute('INSERT INTO pending (key, document) VALUES (?, ?)', (key, bson.encode(document)))
+            return pending + 1
+
+        pending = self._transaction(insert)
+        if pending is None:
+            WRITE_BEHIND_RECORDS.labels(self.name, 'overflow').inc()
+            return False
+        WRITE_BEHIND_RECORDS.labels(self.name, 'buffered').inc()
+        self.start()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def discard(self, key_prefixes):
+        """Remove waiting entries whose key starts with any of key_prefixes; returns how many."""
+        prefixes = list(key_prefixes)
+
+        def delete(connection):
+            return sum(
+                connection.execute('DELETE FROM pending WHERE substr(key, 1, ?) = ?', (len(prefix), prefix)).rowcount
+                for prefix in prefixes
+            )
+        removed = self._transaction(delete) if prefixes else 0
+        if removed:
+            WRITE_BEHIND_RECORDS.labels(self.name, 'discarded').inc(removed)
+        return removed
+
+    def start(self):
+        """Start this process's flusher thread, if the buffer is enabled and it is not running."""
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name=f'hrms-{self.name}-flush', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=10):
+        """Stop the flusher, then flush what is left for up to timeout seconds."""
+        thread = self._thread
+        if thread is None:
+            return 0
+        self._stopping.set()
+        self._wakeup.set()
+        thread.join(timeout)
+        return self.drain(timeout)
+
+    def _run(self):
+        backoff = self.flush_interval
+        while not self._stopping.is_set():
+            try:
+                claimed = self.flush()
+                backoff = self.flush_interval
+            except Exception as e:
+                logger.warning("%s flush failed, retrying in %.1f s: %s", self.name, backoff, e)
+                self._stopping.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                continue
+            if claimed < self.batch_size:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+
+    def _claim(self):
+        """Lease up to batch_size entries nobody is working on: [(id, key, document, attempts)]."""
+        def claim(connection):
+            now = time.time()
+            rows = connection.execute(
+                'SELECT id, key, document, attempts FROM pending WHERE lease_until <= ? ORDER BY id LIMIT ?',
+                (now, self.batch_size)
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    "UPDATE pending SET lease_until = ?, attempts = attempts + 1 "
+                    f"WHERE id IN ({','.join('?' * len(rows))})",
+                    [now + LEASE_SECONDS] + [row[0] for row in rows]
+                )
+            return rows
+        return [(row_id, key, bson.decode(document), attempts + 1)
+                for row_id, key, document, attempts in self._transaction(claim)]
+
+    def flush(self):
+        """
+        Write one batch of journal entries to MongoDB. Returns the number of
+        entries claimed; raises if MongoDB could not be reached (the entries
+        are released for the next attempt without counting this one).
+        """
+        rows = self._claim()
+        if not rows:
+            return 0
+        row_ids = [row_id for row_id, _, _, _ in rows]
+        documents = [document for _, _, document, _ in rows]
+        try:
+            collection = mongodb.get_collection(self.collection_name)
+            collection.bulk_write([InsertOne(document) for document in documents], ordered=False)
+            errors = []
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+        except UNREACHABLE_ERRORS:
+            # Not the entries' fault: the outage does not use up their attempts
+            self._release(row_ids, refund=True)
+            raise
+        except PyMongoError:
+            self._release(row_ids)
+            raise
+
+        duplicates = {error['index'] for error in errors if error.get('code') == 11000}
+        if duplicates:
+            # Our own _id already stored: written by an earlier attempt that
+            # died before settling the journal. It counts as written, so
+            # on_written runs for it (that attempt may never have called it)
+            try:
+                stored = {doc['_id'] for doc in collection.find(
+                    {'_id': {'$in': [documents[index]['_id'] for index in duplicates]}}, {'_id': 1}
+                )}
+            except UNREACHABLE_ERRORS:
+                self._release(row_ids, refund=True)
+                raise
+            recovered = {index for index in duplicates if documents[index]['_id'] in stored}
+            if recovered:
+                logger.info("%s: %d entries were already written by an earlier attempt", self.name, len(recovered))
+            duplicates -= recovered
+        failures = {error['index']: error.get('errmsg', '') for error in errors if error.get('code') != 11000}
+
+        written, done, retry, failed = [], [], [], []
+        for index, (row_id, key, document, attempts) in enumerate(rows):
+            if index in failures:
+                if attempts >= self.max_attempts:
+                    failed.append((row_id, failures[index]))
+                else:
+                    retry.append(row_id)
+                continue
+            done.append(row_id)
+            if index in duplicates:
+                logger.warning("%s entry %s duplicates a stored document; dropped", self.name, key)
+            else:
+                written.append(document)
+
+        # Before settling: a crash in between makes the next attempt find the
+        # documents stored and call on_written again, rather than never
+        if written and self.on_written is not None:
+            self.on_written(written)
+
+        def settle(connection):
+            if failed:
+                connection.executemany(
+                    'INSERT INTO failed (id, key, document, error, failed_at) '
+                    'SELECT id, key, document, ?, ? FROM pending WHERE id = ?',
+                    [(error, time.time(), row_id) for row_id, error in failed]
+                )
+            removed = done + [row_id for row_id, _ in failed]
+            if removed:
+                connection.executemany('DELETE FROM pending WHERE id = ?', [(row_id,) for row_id in removed])
+            if retry:
+                connection.executemany('UPDATE pending SET lease_until = 0 WHERE id = ?', [(row_id,) for row_id in retry])
+        self._transaction(settle)
+
+        for result, count in (('written', len(written)), ('duplicate', len(duplicates)), ('failed', len(failed))):
+            if count:
+                WRITE_BEHIND_RECORDS.labels(self.name, result).inc(count)
+        if failed:
+            logger.error("%s: %d entries failed %d times and were moved to the failed table: %s",
+                         self.name, len(failed), self.max_attempts, failed[0][1])
+        return len(rows)
+
+    def _release(self, row_ids, refund=False):
+        """Make claimed entries available again; refund=True takes back the attempt the claim counted."""
+        self._transaction(lambda connection: connection.executemany(
+            'UPDATE pending SET lease_until = 0, attempts = attempts - ? WHERE id = ?',
+            [(int(refund), row_id) for row_id in row_ids]
+        ))
+
+    def drain(self, timeout=None):
+        """Flush until no entry is left to claim (or timeout seconds pass). Returns entries claimed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        total = 0
+        while deadline is None or time.monotonic() < deadline:
+            claimed = self.flush()
+            if not claimed:
+                break
+            total += claimed
+        return total
+
+    def retry_failed(self):
+        """Move failed entries back to pending; returns how many were moved."""
+        def move(connection):
+            moved = connection.execute(
+                'INSERT OR IGNORE INTO pending (key, document) SELECT key, document FROM failed ORDER BY id'
+            ).rowcount
+            connection.execute('DELETE FROM failed')
+            return moved
+        return self._transaction(move)
+
+    def stats(self):
+        """Entry counts: pending (including leased) and failed."""
+        connection = self._connection()
+        (pending,) = connection.execute('SELECT count(*) FROM pending').fetchone()
+        (failed,) = connection.execute('SELECT count(*) FROM failed').fetchone()
+        return {'pending': pending, 'failed': failed}
+
+
+def _after_fork():
+    # Neither the parent's flusher thread nor its SQLite connections survive fork()
+    for buffer in _buffers:
+        buffer._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -72,4 +72,9 @@ export const attendanceAPI = {
         api.get(`/api/attendance/${employeeId}/`),
 };
 
+// ================= DASHBOARD API =================
+export const dashboardAPI = {
+    getStats: () => api.get("/api/dashboard/"),
+};
+
 export default api;
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { employeeAPI, attendanceAPI } from '../api/api';
+import { dashboardAPI } from '../api/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 
@@ -18,32 +18,14 @@ const Dashboard = () => {
         setError(null);
 
         try {
-            // Get today's date in YYYY-MM-DD format
-            const today = new Date().toISOString().split('T')[0];
-
-            // Fetch employees and today's attendance
-            const [employeesRes, attendanceRes] = await Promise.all([
-                employeeAPI.getAll(),
-                attendanceAPI.getAll(today),
-            ]);
-
-            const totalEmployees = employeesRes.data.length;
-            const presentToday = attendanceRes.data.filter(
-                (record) => record.status === 'Present'
-            ).length;
-            const absentToday = attendanceRes.data.filter(
-                (record) => record.status === 'Absent'
-            ).length;
-
-            const attendanceRate = totalEmployees > 0
-                ? ((presentToday / totalEmployees) * 100).toFixed(1)
-                : 0;
+            // Counts are aggregated server-side
+            const { data } = await dashboardAPI.getStats();
 
             setStats({
-                totalEmployees,
-                presentToday,
-                absentToday,
-                attendanceRate,
+                totalEmployees: data.total_employees,
+                presentToday: data.present_today,
+                absentToday: data.absent_today,
+                attendanceRate: data.attendance_rate,
             });
         } catch (err) {
             console.error('Error fetching dashboard data:', err);